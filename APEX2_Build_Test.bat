@@ -4,8 +4,20 @@ set VIEW_PATH=%1
 
 SET MAKE_OPT = %2
 
+rem Run the compiler through the fault injection compiler cache, if enabled
+IF DEFINED FIT_COMPILER_CACHE_SHIMS SET PATH=%FIT_COMPILER_CACHE_SHIMS%;%PATH%
+
+rem Run as many make jobs as the fault injection job server allows, if set
+SET MAKE_JOBS=
+IF DEFINED FIT_MAKE_JOBS SET MAKE_JOBS=-j%FIT_MAKE_JOBS%
+
+rem Define FIT_ID for a fault injection variant build, for the makefiles
+rem that add $(FIT_DEFINES) to the compiler flags
+SET FIT_DEFINES=
+IF DEFINED FIT_VARIANT_ID SET FIT_DEFINES=FIT_DEFINES=-DFIT_ID=%FIT_VARIANT_ID%
+
 pushd %VIEW_PATH%\Analog\NextGen\apex\Release
 
-"C:\Program Files\ARM\bin\win_32-pentium\make" %2
+"C:\Program Files\ARM\bin\win_32-pentium\make" %MAKE_JOBS% %FIT_DEFINES% %2
 
 popd
@@ -19,6 +19,11 @@
 
 import faultInjectionUtils
 
+#------------------------------------------------------------------------------
+# Build target that this script is run for (FaultInjectionBatchRunner.py, or
+# the command line parameter when the script is run on its own).
+targetMode = "ApexDiag"
+
 #------------------------------------------------------------------------------
 # Here is the list of files to be modified by this script, along with
 # blocks of new code (first two lines of block are start and end text to
@@ -37,5 +42,7 @@ fileModificationsDictionary = { \
 }
 
 # Call the procedure to modify and build the test firmware code with the
-# above modifications.
-faultInjectionUtils.FaultInjectionUtils().ModifyAndBuildFaultInjectionFile(fileModificationsDictionary, __file__)
\ No newline at end of file
+# above modifications when this script is run (not when it is imported,
+# for example by FaultInjectionTestDiscovery.py).
+if __name__ == "__main__":
+    faultInjectionUtils.FaultInjectionUtils().ModifyAndBuildFaultInjectionFile(fileModificationsDictionary, __file__)
\ No newline at end of file
@@ -1,43 +1,18 @@
     @echo off
     rem
-    @echo.
-    call python ApexArmDataCacheDiagnosticFaultInjectionTest1.py ApexDiag
-    call python ApexArmInstructionCacheDiagnosticFaultInjectionTest1.py ApexDiag
-    call python ApexArmInstructionDiagnosticFaultInjectionTest1.py ApexDiag
-    call python ApexArmInstructionDiagnosticFaultInjectionTest2.py ApexDiag
-    call python ApexArmRegisterDiagnosticFaultInjectionTest1.py ApexDiag
-    rem
-    call python ApexArmRegisterDiagnosticFaultInjectionTest2.py ApexDiag
-    call python ApexCompletionTimeDiagnosticFaultInjectionTest1.py ApexDiag
-    call python ApexFirmwareBinaryCrcDiagnosticFaultInjectionTest1.py ApexDiag
-    call python ApexFirmwareBinaryCrcDiagnosticFaultInjectionTest2.py ApexDiag
-    call python ApexInteractiveWatchdogFaultInjectionTest1.py ApexDiag
-    rem
-    call python ApexInternalRamAddressLineDiagnosticFaultInjectionTest1.py ApexDiag
-    call python ApexInternalRamAddressLineDiagnosticFaultInjectionTest2.py ApexDiag
-    call python ApexInternalRamEccCircuitDiagnosticFaultInjectionTest1.py ApexDiag
-    call python ApexInternalRamEccCircuitDiagnosticFaultInjectionTest2.py ApexDiag
-    call python ApexInternalRamScrubberDiagnosticFaultInjectionTest1.py ApexDiag
-    rem
-    call python ApexInternalRamShadowFaultInjectionTest1.py ApexDiag
-    call python ApexInternalRamShadowFaultInjectionTest2.py ApexDiag
-    call python ApexInternalSafeRamDiagnosticFaultInjectionTest1.py ApexDiag
-    call python ApexStackDiagnosticFaultInjectionTest1.py ApexOS
-    call python BlackfinDataRamAsmFaultInjectionTest1.py BlackfinDiag
-    rem
-    call python BlackfinInstructionAsmFaultInjectionTest1.py BlackfinDiag
-    call python BlackfinInstructionRamFaultInjectionTest1.py BlackfinDiag
-    call python BlackfinRegisterAsmFaultInjectionTest1.py BlackfinDiag
-    call python BlackfinTimerFaultInjectionTest1.py BlackfinDiag
-    call python BlackfinSchedulerFaultInjectionTest1.py BlackfinDiag
-    rem
-    call python DspStackDiagnosticFaultInjectionTest1.py BlackfinOS
-    call python DSPInteractiveWatchdogFaultInjectionTest1.py BlackfinToolkit
-    call python If8iAdcCrcDiagnosticFaultInjectionTest1.py BlackfinProjectIF8I
-    call python If8iAdcCrcDiagnosticFaultInjectionTest2.py BlackfinProjectIF8I
-    call python If8iAdcWriteDiagnosticFaultInjectionTest1.py BlackfinProjectIF8I
-    rem
-    call python Irt8iAdcCrcDiagnosticFaultInjectionTest1.py BlackfinProjectIRT8I
-    call python Irt8iAdcCrcDiagnosticFaultInjectionTest2.py BlackfinProjectIRT8I
-    call python Irt8iAdcWriteDiagnosticFaultInjectionTest1.py BlackfinProjectIRT8I
-
+    rem Run every fault injection script in one process (see
+    rem FaultInjectionBatchRunner.py). The build target of each script is read
+    rem from its targetMode. Every script is validated against the view before
+    rem any build is started. By default the campaign does not start if any
+    rem script has a problem. With "skipbroken" as the first parameter, only
+    rem the scripts that passed validation are built.
+    rem Set FIT_JOBS to the number of scripts to build at once (each one in
+    rem its own worktree).
+    rem The builds share FIT_JOB_SLOTS make jobs (the number of processors by
+    rem default) between them.
+    if /I "%1"=="skipbroken" (
+        call python FaultInjectionBatchRunner.py --skip-broken
+    ) else (
+        call python FaultInjectionBatchRunner.py
+    )
+    exit /b %errorlevel%
@@ -0,0 +1,231 @@
+#/////////////////////////////////////////////////////////////////////////////
+#/// @file FaultInjectionBaseline.py
+#///
+#/// This script file contains the baseline snapshots of the fault injection
+#/// builds. Without them, every fault injection build starts with the clean
+#/// target, and the view is left with the objects of the last fault
+#/// injection build, so the next developer build must be a clean build too.
+#///
+#/// A baseline snapshot is a copy of the Apex Release folder and of the
+#/// Release folder of a Blackfin project as built from the unmodified files.
+#/// It is keyed by the fingerprint of the view's source files (see
+#/// FaultInjectionCatalog), the build scripts, the make targets and the
+#/// toolchains, so it is built once per change of the view. A fault
+#/// injection build then starts by restoring the snapshot to the output
+#/// folder instead of running the clean target: the objects keep the time
+#/// of the baseline build, so make only compiles the translation units of
+#/// the modified files (which are newer) and the ones that include them.
+#/// When the checkouts of a fault injection script file are undone, the
+#/// view's output folders are restored from the snapshot too.
+#///
+#/// Restoring a snapshot only copies the files whose size or time differ
+#/// and deletes the output files that are not in the snapshot, so it takes
+#/// seconds. The makefiles of the output folders (makefile and *.mk) are in
+#/// version control rather than build outputs, so they are neither saved
+#/// nor restored.
+#///
+#/// The snapshots are saved in Build_Cache\Baselines (FIT_BASELINE_FOLDER),
+#/// and only the FIT_BASELINE_COUNT (2 by default) most recently used keys
+#/// are kept. Setting FIT_BASELINE_COUNT to 0 disables the baseline
+#/// snapshots.
+#///
+#/// The worker processes of a parallel campaign share the snapshots: the
+#/// snapshots are built, saved and evicted under a lock folder
+#/// (Build_Cache\Baselines\baseline.lock), so the first worker builds them
+#/// while the others wait, and a key is marked used under the lock before
+#/// it is restored, so it is not evicted while it is restored.
+#///
+#/// @if REVISION_HISTORY_INCLUDED
+#/// @par Edit History
+#/// agent    18-OCT-2026 Created.
+#/// agent    18-OCT-2026 Locked the snapshots against the other worker processes.
+#/// @endif
+#///
+#/// @par Copyright (c) 2026 Rockwell Automation Technologies, Inc.  All rights reserved.
+#///
+#/////////////////////////////////////////////////////////////////////////////
+
+#-----------------------------------------------------------------------------
+import os         # For path, walk, environ, getpid, utime, mkdir, rmdir
+import time       # For time, sleep
+import shutil     # For copy2, rmtree
+
+# Define constants that should not change.
+BASELINE_FOLDER_NAME                    = "Build_Cache\\Baselines"
+
+BASELINE_DEFAULT_COUNT                  = 2
+
+BASELINE_FOLDER_ENVIRONMENT_VARIABLE    = "FIT_BASELINE_FOLDER"
+
+BASELINE_COUNT_ENVIRONMENT_VARIABLE     = "FIT_BASELINE_COUNT"
+
+BASELINE_LOCK_FOLDER_NAME               = "baseline.lock"
+
+# Building the baselines of both products can take much longer than a
+# build cache index update.
+BASELINE_LOCK_TIMEOUT                   = 3600
+
+# The files of the output folders that are in version control.
+BASELINE_KEPT_FILE_NAMES                = ["makefile"]
+
+BASELINE_KEPT_FILE_EXTENSIONS           = [".mk"]
+
+#-----------------------------------------------------------------------------
+# Return True if a file of an output folder is a build output.
+def IsOutputFile(fileName):
+    fileName = os.path.basename(fileName).lower()
+    return fileName not in BASELINE_KEPT_FILE_NAMES and os.path.splitext(fileName)[1] not in BASELINE_KEPT_FILE_EXTENSIONS
+
+#-----------------------------------------------------------------------------
+# Return the size and time of each build output of a folder, by path
+# relative to the folder.
+def GetOutputFiles(folder):
+    outputFiles = {}
+    for path, folderNames, fileNames in os.walk(folder):
+        for fileName in fileNames:
+            if IsOutputFile(fileName):
+                fileStat = os.stat(os.path.join(path, fileName))
+                outputFiles[os.path.relpath(os.path.join(path, fileName), folder)] = (fileStat.st_size, fileStat.st_mtime)
+    return outputFiles
+
+# FaultInjectionBaseline class
+# This class is used to save and restore the baseline snapshots of the
+# output folders.
+class FaultInjectionBaseline:
+
+    def __init__(self, BaselineFolder = None, SnapshotCount = None):
+        if BaselineFolder is None:
+            BaselineFolder = os.environ.get(BASELINE_FOLDER_ENVIRONMENT_VARIABLE, BASELINE_FOLDER_NAME)
+        if SnapshotCount is None:
+            SnapshotCount = int(os.environ.get(BASELINE_COUNT_ENVIRONMENT_VARIABLE, BASELINE_DEFAULT_COUNT))
+        self.BaselineFolder = BaselineFolder
+        self.SnapshotCount = SnapshotCount
+
+    #-------------------------------------------------------------------------
+    # Return True if the baseline snapshots are enabled.
+    def IsEnabled(self):
+        return self.SnapshotCount > 0
+
+    #-------------------------------------------------------------------------
+    # Lock the snapshots against the other processes of a parallel campaign
+    # (see FaultInjectionBatchRunner.py). A lock older than
+    # BASELINE_LOCK_TIMEOUT seconds was left by a process that died and is
+    # removed.
+    def Lock(self):
+        lockFolder = os.path.join(self.BaselineFolder, BASELINE_LOCK_FOLDER_NAME)
+        while True:
+            try:
+                if not os.path.exists(self.BaselineFolder):
+                    os.makedirs(self.BaselineFolder)
+                os.mkdir(lockFolder)
+                return
+            except OSError:
+                try:
+                    if time.time() - os.path.getmtime(lockFolder) > BASELINE_LOCK_TIMEOUT:
+                        os.rmdir(lockFolder)
+                except OSError:
+                    pass
+                time.sleep(0.1)
+
+    #-------------------------------------------------------------------------
+    # Unlock the snapshots.
+    def Unlock(self):
+        os.rmdir(os.path.join(self.BaselineFolder, BASELINE_LOCK_FOLDER_NAME))
+
+    #-------------------------------------------------------------------------
+    # Mark the snapshots of a key as used, so that Evict() keeps them.
+    # Returns False if the key has no snapshots.
+    def Touch(self, key):
+        self.Lock()
+        try:
+            keyFolder = os.path.join(self.BaselineFolder, key)
+            if not os.path.isdir(keyFolder):
+                return False
+            # The modification time of the key's folder is its last use time.
+            os.utime(keyFolder, None)
+            return True
+        finally:
+            self.Unlock()
+
+    #-------------------------------------------------------------------------
+    # Return the folder of the snapshot of an output folder (by its name
+    # relative to the view path) for a key.
+    def GetSnapshotFolder(self, key, outputFolderName):
+        return os.path.join(self.BaselineFolder, key, outputFolderName.strip("\\"))
+
+    #-------------------------------------------------------------------------
+    # Return True if the key has a snapshot of the output folder.
+    def HasSnapshot(self, key, outputFolderName):
+        return os.path.isdir(self.GetSnapshotFolder(key, outputFolderName))
+
+    #-------------------------------------------------------------------------
+    # Save the build outputs of an output folder as its snapshot for a key.
+    # Returns the number of files saved. The snapshots must be locked.
+    def Save(self, key, outputFolder, outputFolderName):
+        snapshotFolder = self.GetSnapshotFolder(key, outputFolderName)
+        temporaryFolder = snapshotFolder + ".%d.tmp" % os.getpid()
+        if os.path.exists(temporaryFolder):
+            shutil.rmtree(temporaryFolder)
+        outputFiles = GetOutputFiles(outputFolder)
+        for relativeFileName in outputFiles.keys():
+            destinationFileName = os.path.join(temporaryFolder, relativeFileName)
+            if not os.path.exists(os.path.dirname(destinationFileName)):
+                os.makedirs(os.path.dirname(destinationFileName))
+            shutil.copy2(os.path.join(outputFolder, relativeFileName), destinationFileName)
+        if not os.path.exists(temporaryFolder):
+            os.makedirs(temporaryFolder)
+
+        # Another process of the campaign may have saved it first.
+        try:
+            os.rename(temporaryFolder, snapshotFolder)
+        except OSError:
+            shutil.rmtree(temporaryFolder, True)
+        return len(outputFiles)
+
+    #-------------------------------------------------------------------------
+    # Make an output folder match its snapshot for a key: copy the files of
+    # the snapshot whose size or time differ and delete the build outputs
+    # that are not in the snapshot. Returns the number of files copied and
+    # deleted, or None if the key has no snapshot of the folder. The key
+    # must be locked or marked used (see Touch()) first.
+    def Restore(self, key, outputFolder, outputFolderName):
+        snapshotFolder = self.GetSnapshotFolder(key, outputFolderName)
+        if not os.path.isdir(snapshotFolder):
+            return None
+
+        snapshotFiles = GetOutputFiles(snapshotFolder)
+        outputFiles = GetOutputFiles(outputFolder)
+        deletedCount = 0
+        for relativeFileName in outputFiles.keys():
+            if relativeFileName not in snapshotFiles:
+                os.remove(os.path.join(outputFolder, relativeFileName))
+                deletedCount += 1
+
+        copiedCount = 0
+        for relativeFileName, (size, mtime) in snapshotFiles.items():
+            outputFile = outputFiles.get(relativeFileName)
+            if outputFile is not None and outputFile[0] == size and int(outputFile[1]) == int(mtime):
+                continue
+            destinationFileName = os.path.join(outputFolder, relativeFileName)
+            if not os.path.exists(os.path.dirname(destinationFileName)):
+                os.makedirs(os.path.dirname(destinationFileName))
+            shutil.copy2(os.path.join(snapshotFolder, relativeFileName), destinationFileName)
+            copiedCount += 1
+        return (copiedCount, deletedCount)
+
+    #-------------------------------------------------------------------------
+    # Remove the snapshots of all but the most recently used keys. Returns
+    # the number of keys removed. The snapshots must be locked.
+    def Evict(self):
+        if not os.path.isdir(self.BaselineFolder):
+            return 0
+        keys = []
+        for key in os.listdir(self.BaselineFolder):
+            keyFolder = os.path.join(self.BaselineFolder, key)
+            if os.path.isdir(keyFolder) and key != BASELINE_LOCK_FOLDER_NAME:
+                keys.append((os.path.getmtime(keyFolder), keyFolder))
+        evictedCount = 0
+        for lastUsed, keyFolder in sorted(keys, reverse = True)[self.SnapshotCount:]:
+            shutil.rmtree(keyFolder, True)
+            evictedCount += 1
+        return evictedCount
@@ -0,0 +1,672 @@
+#/////////////////////////////////////////////////////////////////////////////
+#/// @file FaultInjectionBatchRunner.py
+#///
+#/// This script file runs a campaign of fault injection script files in one
+#/// process. The fault injection script and manifest files are found in the
+#/// current folder and the build target (targetMode) and patch plan of each
+#/// one are read through FaultInjectionTestDiscovery.
+#///
+#/// The view paths, the fault injection point catalog and the source cache
+#/// are determined once and shared by every script through a
+#/// FaultInjectionSession. A script that fails does not stop the campaign:
+#/// its checkouts are undone, the failure is recorded and the next script
+#/// is run. A summary of every script's result and build time is printed
+#/// and saved to the build results folder at the end.
+#///
+#/// Usage (from the FIT folder of the view):
+#///     python FaultInjectionBatchRunner.py [--skip-broken] [--multi-fault | --variants] [--jobs n | --pipeline | --delta] [script files]
+#/// All of the scripts are validated first (see FaultInjectionValidator.py).
+#/// If any script has a problem, nothing is built unless --skip-broken is
+#/// given, in which case only the scripts that passed validation are built.
+#/// The exit code is 1 if any script failed validation or failed to build.
+#///
+#/// With --jobs n (or FIT_JOBS=n) the scripts are run by a pool of n worker
+#/// processes. Each script is then modified and built in its own worktree
+#/// (see FaultInjectionWorktree.py) instead of in the view, so nothing is
+#/// checked out and the scripts do not share any build folder. The output
+#/// folders of a worktree are moved (renamed) to the build results folder
+#/// when the script is built, rather than copied.
+#///
+#/// With --pipeline the scripts are run in one process, each in its own
+#/// worktree, by a pipeline of three stages with a thread each: modifying
+#/// (creating the worktree and patching the files), building, and saving
+#/// the build (moving the binary files to the build results folder, saving
+#/// them to the build cache, and removing the worktree). So the next
+#/// scripts are modified while one is built and the previous ones are
+#/// saved, and the build stage does not wait for disk work. The stages are connected by
+#/// queues of at most FIT_PIPELINE_DEPTH (2 by default) scripts.
+#///
+#/// With --multi-fault the scripts of a build target that can be merged are
+#/// built as one multi-fault image, in which the fault of each script is
+#/// selected by the value of FaultSelectId when the image is run (see
+#/// FaultInjectionMultiFault.py). The other scripts are built on their own.
+#///
+#/// With --variants the scripts of a build target that can be merged are
+#/// built as a compile-time variant image instead: its files are checked out
+#/// and modified once, and it is built once per script with FIT_ID set to
+#/// the script's variant ID, so that each build holds exactly one fault and
+#/// the compiler cache only compiles the translation units that use FIT_ID
+#/// again. The build of each script is saved to a subfolder of the image's
+#/// build results folder. The variant images are not pipelined.
+#///
+#/// With --delta the scripts are run in one process in the view, ordered so
+#/// that consecutive scripts modify as few different files as possible (see
+#/// FaultInjectionTransition.py), and the checkouts of each script are kept
+#/// for the next one: only the files whose blocks differ are modified again,
+#/// and only the checkouts of the files the next script does not modify are
+#/// undone. The last script undoes every checkout. --delta is ignored with
+#/// --jobs and --pipeline, whose scripts are run in worktrees.
+#///
+#/// @if REVISION_HISTORY_INCLUDED
+#/// @par Edit History
+#/// agent    18-OCT-2026 Created.
+#/// agent    18-OCT-2026 The fault injection script files are now read
+#///                      through FaultInjectionTestDiscovery.
+#/// agent    18-OCT-2026 Fault injection manifest files are now run too.
+#/// agent    18-OCT-2026 The build cache statistics are now part of the
+#///                      summary.
+#/// agent    18-OCT-2026 Added --jobs to run the scripts in parallel in
+#///                      worktrees.
+#/// agent    18-OCT-2026 The worktree baseline is brought up to date before
+#///                      the worker processes start.
+#/// agent    18-OCT-2026 The worker processes share the job slots of one job
+#///                      server.
+#/// agent    18-OCT-2026 The worker processes share the seats of the resource
+#///                      pools in FIT_RESOURCE_POOLS.
+#/// agent    18-OCT-2026 Added --pipeline, which runs the modify, build and
+#///                      save stages of the scripts in a pipeline.
+#/// agent    18-OCT-2026 Added --multi-fault, which builds the scripts that
+#///                      can be merged as multi-fault images.
+#/// agent    18-OCT-2026 Added --variants, which builds the scripts that can
+#///                      be merged as compile-time variant images.
+#/// agent    18-OCT-2026 Added --delta, which orders the scripts and keeps
+#///                      their checkouts for the next script.
+#/// agent    18-OCT-2026 The output folders of the worktrees are now moved to
+#///                      the build results folder.
+#/// agent    18-OCT-2026 UndoLeftoverCheckouts() no longer depends on the
+#///                      Apex makefile.
+#/// @endif
+#///
+#/// @par Copyright (c) 2026 Rockwell Automation Technologies, Inc.  All rights reserved.
+#///
+#/////////////////////////////////////////////////////////////////////////////
+
+#-----------------------------------------------------------------------------
+import os         # For path, getcwd
+import sys        # For argv, exit
+import time       # For timing each script
+import datetime   # For date
+import traceback  # For logging the failure of a script
+import threading  # For the pipeline stages
+import Queue      # For the queues between the pipeline stages
+import multiprocessing # For Pool, current_process
+import FaultInjectionValidator   # For FaultInjectionValidator, SaveReport
+import NextGenFaultInjectionUtils # For FaultInjectionUtils, FaultInjectionSession
+import FaultInjectionCompilerCache # For FaultInjectionCompilerCache
+import FaultInjectionJobServer   # For FaultInjectionJobServer
+import FaultInjectionResourcePool # For FaultInjectionResourcePoolManager
+import FaultInjectionBuildExecutor # For StopEvent
+import FaultInjectionMultiFault  # For FaultInjectionMultiFaultPlanner
+import FaultInjectionTransition  # For FaultInjectionTransitionPlanner
+
+# Define constants that should not change.
+BATCH_SUMMARY_FILE_NAME                 = "FaultInjectionBatch.log"
+
+SKIP_BROKEN_TESTS_OPTION                = "--skip-broken"
+
+JOBS_OPTION                             = "--jobs"
+
+JOBS_ENVIRONMENT_VARIABLE               = "FIT_JOBS"
+
+PIPELINE_OPTION                         = "--pipeline"
+
+PIPELINE_DEPTH_ENVIRONMENT_VARIABLE     = "FIT_PIPELINE_DEPTH"
+
+PIPELINE_DEFAULT_DEPTH                  = 2
+
+MULTI_FAULT_OPTION                      = "--multi-fault"
+
+VARIANTS_OPTION                         = "--variants"
+
+DELTA_OPTION                            = "--delta"
+
+# Seconds to wait for a worker's result (Python 2 only lets Ctrl-C interrupt
+# a wait that has a timeout).
+WORKER_RESULT_TIMEOUT                   = 7 * 24 * 3600
+
+TEST_STATUS_PASSED                      = "PASSED"
+
+TEST_STATUS_FAILED                      = "FAILED"
+
+TEST_STATUS_SKIPPED                     = "SKIPPED"
+
+TEST_STATUS_NOT_RUN                     = "NOT RUN"
+
+# FaultInjectionTestResult class
+# This class holds the result of one fault injection script file of a campaign.
+class FaultInjectionTestResult:
+
+    def __init__(self, TestName, TargetMode):
+        self.TestName = TestName
+        self.TargetMode = TargetMode
+        self.FileModificationsDictionary = None
+        self.PatchPlan = None
+        self.Status = TEST_STATUS_NOT_RUN
+        self.Duration = 0.0
+        self.Problems = []
+
+        # The selector value and name of each script merged into the
+        # multi-fault image (or the variant ID and name of each script of the
+        # compile-time variant image) this result is for, and the name of the
+        # selector.
+        self.MergedTests = []
+        self.SelectorName = None
+        self.IsVariantImage = False
+
+# FaultInjectionPipelineItem class
+# This class holds a fault injection script file going through the stages
+# of a pipelined campaign.
+class FaultInjectionPipelineItem:
+
+    def __init__(self, ResultIndex, Result):
+        self.ResultIndex = ResultIndex
+        self.Result = Result
+        self.Worktree = None
+        self.Session = None
+        self.Utils = None
+        self.StartTime = time.time()
+
+# FaultInjectionBatchRunner class
+# This class is used to run a campaign of fault injection script files.
+class FaultInjectionBatchRunner:
+
+    def __init__(self, TestFileNames = None, SkipBrokenTests = False, WorkerCount = 1, IsPipelined = False, IsMultiFault = False, IsVariantBuild = False, IsDeltaTransition = False):
+        self.TestFileNames = TestFileNames
+        self.SkipBrokenTests = SkipBrokenTests
+        self.WorkerCount = WorkerCount
+        self.IsPipelined = IsPipelined
+        self.IsMultiFault = IsMultiFault
+        self.IsVariantBuild = IsVariantBuild
+        self.IsDeltaTransition = IsDeltaTransition
+        self.WorktreeFactory = None
+        self.Session = NextGenFaultInjectionUtils.FaultInjectionSession()
+        self.Discovery = None
+        self.Results = []
+
+    #-------------------------------------------------------------------------
+    # Determine the view paths and load the fault injection point catalog
+    # once for the whole campaign.
+    def InitSession(self):
+        utils = NextGenFaultInjectionUtils.FaultInjectionUtils(self.Session)
+        self.Session.ViewPath, self.Session.BranchPath = utils.FindViewPath(os.getcwd())
+        self.Session.Catalog = utils.CreateCatalog(self.Session.ViewPath)
+        self.Session.Catalog.Load()
+        self.Discovery = utils.CreateTestDiscovery()
+        print "Fault injection point catalog loaded (%d files, %d rescanned)" % (len(self.Session.Catalog.Files), self.Session.Catalog.ScannedFileCount)
+
+    #-------------------------------------------------------------------------
+    # Check that the build scripts used by every fault injection script file
+    # are present before any file is checked out.
+    def CheckToolchain(self):
+        for buildScript in [NextGenFaultInjectionUtils.APEX_BUILD_SCRIPT, NextGenFaultInjectionUtils.BLACKFIN_BUILD_SCRIPT]:
+            if not os.path.isfile(buildScript):
+                UnexpectedError = "Build script %s not found in %s" % (buildScript, os.getcwd())
+                raise RuntimeError, UnexpectedError
+
+    #-------------------------------------------------------------------------
+    # Validate every fault injection script file of the campaign and create
+    # its result. Returns the number of scripts with problems.
+    def ValidateTests(self):
+        validator = FaultInjectionValidator.FaultInjectionValidator(self.Session.ViewPath, self.Session.Catalog, self.Session.SourceCache)
+        report = {}
+        brokenTestCount = 0
+        for spec in self.Discovery.Discover(self.TestFileNames):
+            result = FaultInjectionTestResult(spec.TestName, spec.TargetMode)
+            result.FileModificationsDictionary = spec.FileModificationsDictionary
+            result.PatchPlan = spec.PatchPlan
+            result.Problems = validator.ValidateSpec(spec)
+            report[result.TestName] = result.Problems
+            if len(result.Problems) != 0:
+                brokenTestCount += 1
+                result.Status = TEST_STATUS_SKIPPED
+                print "FAILED validation %s" % result.TestName
+                for problem in result.Problems:
+                    print "           %s" % problem
+            self.Results.append(result)
+        FaultInjectionValidator.SaveReport(report)
+        return brokenTestCount
+
+    #-------------------------------------------------------------------------
+    # Replace the results of the fault injection script files that can be
+    # merged into multi-fault images (or into compile-time variant images if
+    # IsVariant is set) by one result per image.
+    def MergeMultiFaultTests(self, IsVariant = False):
+        planner = FaultInjectionMultiFault.FaultInjectionMultiFaultPlanner(self.Session.ViewPath, self.Session.Catalog, self.Session.SourceCache, IsVariant)
+        mergedResults = {}
+        for result in self.Results:
+            if result.Status != TEST_STATUS_SKIPPED:
+                image = planner.AddTest(result.TestName, result.TargetMode, result.PatchPlan)
+                if image is not None:
+                    mergedResults[result.TestName] = result
+
+        images = planner.GetImages()
+        for testName, reason in planner.StandaloneTests:
+            mergedResults.pop(testName, None)
+            print "Not merged %s: %s" % (testName, reason)
+        self.Results = [result for result in self.Results if result.TestName not in mergedResults]
+        for image in images:
+            result = FaultInjectionTestResult(image.Name, image.TargetMode)
+            result.FileModificationsDictionary = {}
+            result.PatchPlan = image.GetPatchPlan()
+            result.MergedTests = image.Tests
+            result.SelectorName = image.SelectorName
+            result.IsVariantImage = image.IsVariant
+            print "Merged %d fault injection script files into %s" % (len(image.Tests), image.Name)
+            self.Results.append(result)
+        if IsVariant:
+            FaultInjectionMultiFault.SaveImageReport(images, FaultInjectionMultiFault.VARIANT_REPORT_FILE_NAME)
+        else:
+            FaultInjectionMultiFault.SaveImageReport(images)
+
+    #-------------------------------------------------------------------------
+    # Order the fault injection script files that passed validation so that
+    # consecutive scripts modify as few different files as possible. The
+    # scripts that failed validation are put last.
+    def OrderTestsByTransition(self):
+        planner = FaultInjectionTransition.FaultInjectionTransitionPlanner()
+        for result in self.Results:
+            if result.Status != TEST_STATUS_SKIPPED:
+                planner.AddTest(result.TestName, result.TargetMode, result.PatchPlan)
+        order, originalChangedFileCount, orderedChangedFileCount = planner.GetOrder()
+        resultsByName = dict([(result.TestName, result) for result in self.Results])
+        self.Results = [resultsByName[testName] for testName in order] + [result for result in self.Results if result.Status == TEST_STATUS_SKIPPED]
+        print "Ordered the fault injection script files for delta transitions: %d file changes instead of %d" % (orderedChangedFileCount, originalChangedFileCount)
+
+    #-------------------------------------------------------------------------
+    # Run one fault injection script file. Any failure is recorded in its
+    # result instead of stopping the campaign.
+    def RunTest(self, result):
+        utils = NextGenFaultInjectionUtils.FaultInjectionUtils(self.Session)
+        startTime = time.time()
+        try:
+            if result.IsVariantImage:
+                self.RunVariantImage(utils, result)
+            else:
+                utils.ModifyAndBuildFaultInjectionFile(result.FileModificationsDictionary, result.TestName, result.TargetMode, result.PatchPlan)
+                result.Status = TEST_STATUS_PASSED
+        except Exception:
+            result.Status = TEST_STATUS_FAILED
+            result.Problems = traceback.format_exc().splitlines()
+            self.UndoLeftoverCheckouts(utils, result)
+        result.Duration = time.time() - startTime
+        utils.CloseLogFile()
+
+    #-------------------------------------------------------------------------
+    # Build every variant of a compile-time variant image. The image fails if
+    # any of its variants failed to build.
+    def RunVariantImage(self, utils, result):
+        variantErrors = utils.ModifyAndBuildFaultInjectionVariants(result.PatchPlan, result.TestName, result.TargetMode, result.MergedTests)
+        for (variantId, testName), variantError in zip(result.MergedTests, variantErrors):
+            if variantError is not None:
+                result.Problems.append("%s = %d (%s) failed: %s" % (result.SelectorName, variantId, testName, variantError))
+        if len(result.Problems) != 0:
+            result.Status = TEST_STATUS_FAILED
+        else:
+            result.Status = TEST_STATUS_PASSED
+
+    #-------------------------------------------------------------------------
+    # Undo any checkout left by a fault injection script file that failed
+    # before its own checkouts were undone (or by the previous script of a
+    # delta campaign), so that the next script starts from an unmodified
+    # view.
+    def UndoLeftoverCheckouts(self, utils, result):
+        if not hasattr(utils, "ApexResultsOfBuildFolder"):
+            # The script failed before anything was checked out.
+            return
+        if not hasattr(utils, "FileToEditIndex"):
+            utils.FileToEditIndex = -1
+        try:
+            utils.UndoCheckouts()
+        except Exception:
+            result.Problems.extend(traceback.format_exc().splitlines())
+
+    #-------------------------------------------------------------------------
+    # Run every fault injection script file of the campaign that passed
+    # validation. In a delta campaign, the last one undoes every checkout.
+    def RunTests(self):
+        testIndexes = [resultIndex for resultIndex in range(len(self.Results)) if self.Results[resultIndex].Status != TEST_STATUS_SKIPPED]
+        for resultIndex in range(len(self.Results)):
+            result = self.Results[resultIndex]
+            if result.Status == TEST_STATUS_SKIPPED:
+                continue
+            if resultIndex == testIndexes[-1]:
+                self.Session.IsDeltaTransition = False
+            print "Running %s (%s), %d of %d" % (result.TestName, result.TargetMode, resultIndex + 1, len(self.Results))
+            try:
+                self.RunTest(result)
+            except KeyboardInterrupt:
+                # Stop the campaign but still report what was run.
+                result.Status = TEST_STATUS_FAILED
+                result.Problems = ["Interrupted"]
+                print "Campaign interrupted."
+                return
+            print "%s %s (%.1f seconds)" % (result.Status, result.TestName, result.Duration)
+
+    #-------------------------------------------------------------------------
+    # Run every fault injection script file of the campaign that passed
+    # validation in a pool of worker processes, each script in its own
+    # worktree. The results are reported in the order the scripts finish.
+    def RunTestsInParallel(self):
+        # Create what the workers share before any of them starts.
+        if not os.path.exists(NextGenFaultInjectionUtils.BUILD_RESULTS_FOLDER_NAME):
+            os.makedirs(NextGenFaultInjectionUtils.BUILD_RESULTS_FOLDER_NAME)
+        utils = NextGenFaultInjectionUtils.FaultInjectionUtils(self.Session)
+        if FaultInjectionCompilerCache.FaultInjectionCompilerCache().IsEnabled():
+            utils.InstallCompilerCache()
+        startTime = time.time()
+        copiedFileCount = utils.CreateWorktreeFactory(self.Session.ViewPath, self.Session.BranchPath).UpdateBaseline()
+        print "Worktree baseline updated, %d files copied (%.1f seconds)" % (copiedFileCount, time.time() - startTime)
+
+        tasks = [(resultIndex, self.Results[resultIndex]) for resultIndex in range(len(self.Results)) if self.Results[resultIndex].Status != TEST_STATUS_SKIPPED]
+        print "Running %d fault injection script files in %d worker processes" % (len(tasks), self.WorkerCount)
+        # The workers share the machine's job slots between their builds.
+        jobServer = FaultInjectionJobServer.FaultInjectionJobServer(None, self.WorkerCount)
+        print "Sharing %d job slots between the worker processes" % jobServer.SlotCount
+
+        # The workers share the license seats through a resource pool server,
+        # if any pool is limited.
+        resourcePoolManager = None
+        resourcePools = None
+        if len(FaultInjectionResourcePool.FaultInjectionResourcePools().GetPools()) != 0:
+            resourcePoolManager = FaultInjectionResourcePool.FaultInjectionResourcePoolManager()
+            resourcePoolManager.start()
+            resourcePools = resourcePoolManager.FaultInjectionResourcePools()
+            print "Sharing resource pools %s between the worker processes" % resourcePools.GetPools()
+
+        pool = multiprocessing.Pool(self.WorkerCount, InitWorker, (self.Session.ViewPath, self.Session.BranchPath, self.Session.Catalog, self.Session.IsCompilerCacheInstalled, jobServer, resourcePools))
+        try:
+            results = pool.imap_unordered(RunTestInWorktree, tasks)
+            for taskIndex in range(len(tasks)):
+                resultIndex, result = results.next(WORKER_RESULT_TIMEOUT)
+                self.Results[resultIndex] = result
+                print "%s %s (%.1f seconds), %d of %d done" % (result.Status, result.TestName, result.Duration, taskIndex + 1, len(tasks))
+            pool.close()
+        except KeyboardInterrupt:
+            # Stop the campaign but still report what was run.
+            pool.terminate()
+            print "Campaign interrupted."
+        pool.join()
+        if resourcePoolManager is not None:
+            resourcePoolManager.shutdown()
+
+    #-------------------------------------------------------------------------
+    # Run every fault injection script file of the campaign that passed
+    # validation through the modify, build and save stages of a pipeline,
+    # each script in its own worktree. The results are reported in the order
+    # the scripts finish.
+    def RunTestsInPipeline(self):
+        # Create what the stages share before any of them starts.
+        if not os.path.exists(NextGenFaultInjectionUtils.BUILD_RESULTS_FOLDER_NAME):
+            os.makedirs(NextGenFaultInjectionUtils.BUILD_RESULTS_FOLDER_NAME)
+        utils = NextGenFaultInjectionUtils.FaultInjectionUtils(self.Session)
+        if FaultInjectionCompilerCache.FaultInjectionCompilerCache().IsEnabled():
+            utils.InstallCompilerCache()
+        utils.LoadBuildCache()
+        utils.LoadJobServer()
+        utils.LoadResourcePools()
+        self.WorktreeFactory = utils.CreateWorktreeFactory(self.Session.ViewPath, self.Session.BranchPath)
+        startTime = time.time()
+        copiedFileCount = self.WorktreeFactory.UpdateBaseline()
+        print "Worktree baseline updated, %d files copied (%.1f seconds)" % (copiedFileCount, time.time() - startTime)
+
+        tasks = [(resultIndex, self.Results[resultIndex]) for resultIndex in range(len(self.Results)) if self.Results[resultIndex].Status != TEST_STATUS_SKIPPED]
+        depth = int(os.environ.get(PIPELINE_DEPTH_ENVIRONMENT_VARIABLE, PIPELINE_DEFAULT_DEPTH))
+        print "Running %d fault injection script files in a pipeline (depth %d)" % (len(tasks), depth)
+        buildQueue = Queue.Queue(depth)
+        saveQueue = Queue.Queue(depth)
+        doneQueue = Queue.Queue()
+        FaultInjectionBuildExecutor.StopEvent.clear()
+        stages = [threading.Thread(target = self.RunModifyStage, args = (tasks, buildQueue)),
+                  threading.Thread(target = self.RunBuildStage, args = (buildQueue, saveQueue)),
+                  threading.Thread(target = self.RunSaveStage, args = (saveQueue, doneQueue))]
+        for stage in stages:
+            stage.daemon = True
+            stage.start()
+        try:
+            for taskIndex in range(len(tasks)):
+                item = doneQueue.get(True, WORKER_RESULT_TIMEOUT)
+                print "%s %s (%.1f seconds), %d of %d done" % (item.Result.Status, item.Result.TestName, item.Result.Duration, taskIndex + 1, len(tasks))
+        except KeyboardInterrupt:
+            # Stop the running build and the scripts not started yet, but
+            # still let the stages remove the worktrees.
+            FaultInjectionBuildExecutor.StopEvent.set()
+            print "Campaign interrupted."
+        for stage in stages:
+            stage.join()
+
+    #-------------------------------------------------------------------------
+    # Run a stage of the pipeline for a fault injection script file, unless
+    # an earlier stage failed. Any failure is recorded in its result.
+    def RunPipelineStage(self, item, stage):
+        if item.Result.Status == TEST_STATUS_FAILED:
+            return
+        if FaultInjectionBuildExecutor.StopEvent.is_set():
+            item.Result.Status = TEST_STATUS_FAILED
+            item.Result.Problems = ["Interrupted"]
+            return
+        try:
+            stage(item)
+        except Exception:
+            item.Result.Status = TEST_STATUS_FAILED
+            item.Result.Problems = traceback.format_exc().splitlines()
+
+    #-------------------------------------------------------------------------
+    # Modify stage of the pipeline: create the worktree of each script and
+    # modify its files.
+    def RunModifyStage(self, tasks, buildQueue):
+        for resultIndex, result in tasks:
+            if FaultInjectionBuildExecutor.StopEvent.is_set():
+                break
+            item = FaultInjectionPipelineItem(resultIndex, result)
+            self.RunPipelineStage(item, self.ModifyPipelineItem)
+            buildQueue.put(item)
+        buildQueue.put(None)
+
+    #-------------------------------------------------------------------------
+    # Create the worktree of a script and modify its files.
+    def ModifyPipelineItem(self, item):
+        item.Worktree = self.WorktreeFactory.Create(item.Result.TestName.replace(".", "_"))
+        item.Session = self.Session.CreateWorktreeSession(item.Worktree, item.ResultIndex)
+        item.Utils = NextGenFaultInjectionUtils.FaultInjectionUtils(item.Session)
+        patchPlan = item.Utils.InitFaultInjectionFile(item.Result.FileModificationsDictionary, item.Result.TestName, item.Result.TargetMode, item.Result.PatchPlan)
+        item.Utils.ModifyFaultInjectionFiles(patchPlan)
+
+    #-------------------------------------------------------------------------
+    # Build stage of the pipeline: build the modified code of each script.
+    def RunBuildStage(self, buildQueue, saveQueue):
+        for item in iter(buildQueue.get, None):
+            self.RunPipelineStage(item, self.BuildPipelineItem)
+            saveQueue.put(item)
+        saveQueue.put(None)
+
+    #-------------------------------------------------------------------------
+    # Build the modified code of a script. Only the build stage uses the
+    # pristine Apex build, which is kept for the next scripts.
+    def BuildPipelineItem(self, item):
+        item.Session.PristineApexFolder = self.Session.PristineApexFolder
+        item.Utils.BuildOrRestoreModifiedCode()
+        self.Session.PristineApexFolder = item.Session.PristineApexFolder
+
+    #-------------------------------------------------------------------------
+    # Save stage of the pipeline: save the build of each script and remove
+    # its worktree.
+    def RunSaveStage(self, saveQueue, doneQueue):
+        for item in iter(saveQueue.get, None):
+            self.RunPipelineStage(item, lambda item: item.Utils.SaveModifiedCodeBuild())
+            if item.Result.Status != TEST_STATUS_FAILED:
+                item.Result.Status = TEST_STATUS_PASSED
+            if item.Utils is not None:
+                item.Utils.CloseLogFile()
+            if item.Worktree is not None:
+                try:
+                    self.WorktreeFactory.Remove(item.Worktree)
+                except Exception:
+                    item.Result.Problems.append("Worktree %s could not be removed: %s" % (item.Worktree.Folder, sys.exc_info()[1]))
+            item.Result.Duration = time.time() - item.StartTime
+            doneQueue.put(item)
+
+    #-------------------------------------------------------------------------
+    # Print the summary of the campaign and save it to the build results folder.
+    def PrintSummary(self):
+        lines = []
+        lines.append("Fault injection campaign summary (%s)" % datetime.datetime.now())
+        totalDuration = 0.0
+        for result in self.Results:
+            totalDuration += result.Duration
+            lines.append("%-8s %-21s %8.1f  %s" % (result.Status, result.TargetMode, result.Duration, result.TestName))
+            for selectorValue, testName in result.MergedTests:
+                lines.append("           %s = %d: %s" % (result.SelectorName, selectorValue, testName))
+            for problem in result.Problems:
+                lines.append("           %s" % problem)
+        for status in [TEST_STATUS_PASSED, TEST_STATUS_FAILED, TEST_STATUS_SKIPPED, TEST_STATUS_NOT_RUN]:
+            lines.append("%-8s %d" % (status, len([result for result in self.Results if result.Status == status])))
+        lines.append("Total build time %.1f seconds" % totalDuration)
+        if self.Session.BuildCache is not None:
+            lines.append(self.Session.BuildCache.GetStatistics())
+
+        for line in lines:
+            print line
+
+        if not os.path.exists(NextGenFaultInjectionUtils.BUILD_RESULTS_FOLDER_NAME):
+            os.makedirs(NextGenFaultInjectionUtils.BUILD_RESULTS_FOLDER_NAME)
+        summaryFileName = NextGenFaultInjectionUtils.BUILD_RESULTS_FOLDER_NAME + "\\" + str(datetime.date.today()).replace("-", "_") + "_" + BATCH_SUMMARY_FILE_NAME
+        summaryFile = open(summaryFileName, 'w')
+        summaryFile.write("\n".join(lines) + "\n")
+        summaryFile.close()
+
+    #-------------------------------------------------------------------------
+    # Run the campaign. Returns True if every script was built successfully.
+    def Run(self):
+        self.InitSession()
+        self.CheckToolchain()
+
+        brokenTestCount = self.ValidateTests()
+        if brokenTestCount and not self.SkipBrokenTests:
+            print "%d of %d fault injection script files have problems, nothing was built (use %s to build the others)." % \
+                  (brokenTestCount, len(self.Results), SKIP_BROKEN_TESTS_OPTION)
+            return False
+
+        if self.IsVariantBuild:
+            self.MergeMultiFaultTests(True)
+        elif self.IsMultiFault:
+            self.MergeMultiFaultTests()
+
+        if self.IsVariantBuild and self.IsPipelined and self.WorkerCount <= 1:
+            # A variant image is modified once and built many times, which
+            # does not fit the stages of the pipeline.
+            print "The variant images are not pipelined, %s is ignored." % PIPELINE_OPTION
+            self.IsPipelined = False
+
+        if self.IsDeltaTransition and (self.WorkerCount > 1 or self.IsPipelined):
+            # The scripts run in worktrees have no checkouts to keep.
+            print "The scripts are run in worktrees, %s is ignored." % DELTA_OPTION
+            self.IsDeltaTransition = False
+        if self.IsDeltaTransition:
+            self.OrderTestsByTransition()
+            self.Session.IsDeltaTransition = True
+
+        if self.WorkerCount > 1:
+            self.RunTestsInParallel()
+        elif self.IsPipelined:
+            self.RunTestsInPipeline()
+        else:
+            self.RunTests()
+        self.PrintSummary()
+        return len([result for result in self.Results if result.Status != TEST_STATUS_PASSED]) == 0
+
+# The session and worktree factory of a worker process of a parallel campaign.
+WorkerSession = None
+
+WorkerWorktreeFactory = None
+
+#-----------------------------------------------------------------------------
+# Initialize a worker process of a parallel campaign with the view paths and
+# catalog determined by the main process and the job server and resource
+# pools (None if no pool is limited) it shares.
+def InitWorker(ViewPath, BranchPath, Catalog, IsCompilerCacheInstalled, JobServer, ResourcePools):
+    global WorkerSession, WorkerWorktreeFactory
+    WorkerSession = NextGenFaultInjectionUtils.FaultInjectionSession()
+    WorkerSession.ViewPath = ViewPath
+    WorkerSession.BranchPath = BranchPath
+    WorkerSession.Catalog = Catalog
+    WorkerSession.IsCompilerCacheInstalled = IsCompilerCacheInstalled
+    WorkerSession.JobServer = JobServer
+    WorkerSession.ResourcePools = ResourcePools
+    WorkerSession.PristineApexFolderName = NextGenFaultInjectionUtils.PRISTINE_APEX_FOLDER_NAME + "_" + multiprocessing.current_process().name
+    utils = NextGenFaultInjectionUtils.FaultInjectionUtils(WorkerSession)
+    utils.LoadBuildCache()
+    WorkerWorktreeFactory = utils.CreateWorktreeFactory(ViewPath, BranchPath)
+
+#-----------------------------------------------------------------------------
+# Run one fault injection script file of a parallel campaign in a new
+# worktree, which is removed afterwards. Returns the result's index and the
+# result.
+def RunTestInWorktree(task):
+    resultIndex, result = task
+    runner = FaultInjectionBatchRunner()
+    runner.Session = WorkerSession
+    try:
+        startTime = time.time()
+        worktree = WorkerWorktreeFactory.Create(result.TestName.replace(".", "_"))
+        print "Created worktree %s, %d files linked, %d copied (%.1f seconds)" % (worktree.Folder, worktree.LinkedFileCount, worktree.CopiedFileCount, time.time() - startTime)
+    except Exception:
+        result.Status = TEST_STATUS_FAILED
+        result.Problems = traceback.format_exc().splitlines()
+        return (resultIndex, result)
+
+    # The build steps of the scripts that come first in the campaign are
+    # admitted to the resource pools first.
+    runner.Session = WorkerSession.CreateWorktreeSession(worktree, resultIndex)
+    try:
+        runner.RunTest(result)
+    finally:
+        # The pristine Apex build is kept for the worker's next scripts.
+        WorkerSession.PristineApexFolder = runner.Session.PristineApexFolder
+        WorkerWorktreeFactory.Remove(worktree)
+    return (resultIndex, result)
+
+#-----------------------------------------------------------------------------
+if __name__ == "__main__":
+    arguments = sys.argv[1:]
+    skipBrokenTests = SKIP_BROKEN_TESTS_OPTION in arguments
+    if skipBrokenTests:
+        arguments.remove(SKIP_BROKEN_TESTS_OPTION)
+
+    workerCount = int(os.environ.get(JOBS_ENVIRONMENT_VARIABLE, 1))
+    if JOBS_OPTION in arguments:
+        optionIndex = arguments.index(JOBS_OPTION)
+        workerCount = int(arguments[optionIndex + 1])
+        del arguments[optionIndex:optionIndex + 2]
+
+    isPipelined = PIPELINE_OPTION in arguments
+    if isPipelined:
+        arguments.remove(PIPELINE_OPTION)
+
+    isMultiFault = MULTI_FAULT_OPTION in arguments
+    if isMultiFault:
+        arguments.remove(MULTI_FAULT_OPTION)
+
+    isVariantBuild = VARIANTS_OPTION in arguments
+    if isVariantBuild:
+        arguments.remove(VARIANTS_OPTION)
+
+    isDeltaTransition = DELTA_OPTION in arguments
+    if isDeltaTransition:
+        arguments.remove(DELTA_OPTION)
+
+    if isMultiFault and isVariantBuild:
+        print "%s and %s cannot be used together." % (MULTI_FAULT_OPTION, VARIANTS_OPTION)
+        sys.exit(1)
+
+    if not FaultInjectionBatchRunner(arguments, skipBrokenTests, workerCount, isPipelined, isMultiFault, isVariantBuild, isDeltaTransition).Run():
+        sys.exit(1)
@@ -0,0 +1,273 @@
+#/////////////////////////////////////////////////////////////////////////////
+#/// @file FaultInjectionBuildCache.py
+#///
+#/// This script file contains the build cache used by the fault injection
+#/// utilities to skip the Apex and Blackfin builds of a fault injection
+#/// script file whose build inputs were already built.
+#///
+#/// The key of a build is the SHA-1 of all of its inputs: the contents of
+#/// the patched source files, the fingerprint of the pristine source files
+#/// (see FaultInjectionCatalog), the build scripts, the make targets and the
+#/// identity of the toolchain executables. The build outputs copied to the
+#/// build results folder are saved in the cache folder under that key, and
+#/// are copied back to the build results folder the next time the same key
+#/// is built. When the cache folder grows beyond its size budget, the least
+#/// recently used builds are removed.
+#///
+#/// The cache folder and its size budget (in MB) can be changed with the
+#/// FIT_BUILD_CACHE_FOLDER and FIT_BUILD_CACHE_SIZE_MB environment variables.
+#/// Setting FIT_BUILD_CACHE_SIZE_MB to 0 disables the build cache.
+#///
+#/// @if REVISION_HISTORY_INCLUDED
+#/// @par Edit History
+#/// agent    18-OCT-2026 Created.
+#/// agent    18-OCT-2026 Added LinkFile().
+#/// agent    18-OCT-2026 The cache index is now locked so that the processes
+#///                      of a parallel campaign can share the cache, and only
+#///                      build folders are removed from the cache folder.
+#/// @endif
+#///
+#/// @par Copyright (c) 2026 Rockwell Automation Technologies, Inc.  All rights reserved.
+#///
+#/////////////////////////////////////////////////////////////////////////////
+
+#-----------------------------------------------------------------------------
+import os         # For path, walk, environ, getpid
+import re         # For matching the build key folder names
+import json       # For the cache index file
+import time       # For the last use time of a build
+import shutil     # For copytree, rmtree
+import hashlib    # For sha1
+import ctypes     # For CreateHardLinkW
+
+# Define constants that should not change.
+BUILD_CACHE_FOLDER_NAME                 = "Build_Cache"
+
+BUILD_CACHE_INDEX_FILE_NAME             = "index.json"
+
+BUILD_CACHE_DEFAULT_SIZE_MB             = 4096
+
+BUILD_CACHE_FOLDER_ENVIRONMENT_VARIABLE = "FIT_BUILD_CACHE_FOLDER"
+
+BUILD_CACHE_SIZE_ENVIRONMENT_VARIABLE   = "FIT_BUILD_CACHE_SIZE_MB"
+
+BUILD_CACHE_TEMPORARY_EXTENSION         = ".tmp"
+
+BUILD_CACHE_LOCK_FOLDER_NAME            = "index.lock"
+
+BUILD_CACHE_LOCK_TIMEOUT                = 600
+
+#-----------------------------------------------------------------------------
+# Return the SHA-1 of a file's contents, or None if the file does not exist.
+def GetFileHash(fileNameWithPath):
+    if not os.path.isfile(fileNameWithPath):
+        return None
+    hashFile = open(fileNameWithPath, 'rb')
+    fileHash = hashlib.sha1(hashFile.read()).hexdigest()
+    hashFile.close()
+    return fileHash
+
+#-----------------------------------------------------------------------------
+# Return the total size of the files in a folder.
+def GetFolderSize(folder):
+    size = 0
+    for path, folderNames, fileNames in os.walk(folder):
+        for filename in fileNames:
+            size += os.path.getsize(os.path.join(path, filename))
+    return size
+
+#-----------------------------------------------------------------------------
+# Create a hard link to a file (Python 2 has no os.link on Windows, so
+# CreateHardLinkW is used there). Returns False if no link was created.
+def LinkFile(sourceFileName, destinationFileName):
+    try:
+        if hasattr(os, "link"):
+            os.link(sourceFileName, destinationFileName)
+            return True
+        return ctypes.windll.kernel32.CreateHardLinkW(unicode(destinationFileName), unicode(sourceFileName), None) != 0
+    except (OSError, AttributeError):
+        return False
+
+# FaultInjectionBuildCache class
+# This class is used to save and restore the build outputs of fault
+# injection script files.
+class FaultInjectionBuildCache:
+
+    def __init__(self, CacheFolder = None, SizeBudget = None):
+        if CacheFolder is None:
+            CacheFolder = os.environ.get(BUILD_CACHE_FOLDER_ENVIRONMENT_VARIABLE, BUILD_CACHE_FOLDER_NAME)
+        if SizeBudget is None:
+            SizeBudget = int(os.environ.get(BUILD_CACHE_SIZE_ENVIRONMENT_VARIABLE, BUILD_CACHE_DEFAULT_SIZE_MB)) * 1024 * 1024
+        self.CacheFolder = CacheFolder
+        self.SizeBudget = SizeBudget
+
+        # Build key -> {"Size", "LastUsed"}.
+        self.Entries = None
+
+        # Toolchain folder -> identity, determined once per process.
+        self.ToolchainIdentities = {}
+
+        self.HitCount = 0
+        self.MissCount = 0
+        self.EvictionCount = 0
+
+    #-------------------------------------------------------------------------
+    # Return True if the build cache is enabled.
+    def IsEnabled(self):
+        return self.SizeBudget > 0
+
+    #-------------------------------------------------------------------------
+    # Lock the cache index against the other processes of a parallel
+    # campaign (see FaultInjectionBatchRunner.py). A lock older than
+    # BUILD_CACHE_LOCK_TIMEOUT seconds was left by a process that died and is
+    # removed.
+    def Lock(self):
+        lockFolder = os.path.join(self.CacheFolder, BUILD_CACHE_LOCK_FOLDER_NAME)
+        while True:
+            try:
+                if not os.path.exists(self.CacheFolder):
+                    os.makedirs(self.CacheFolder)
+                os.mkdir(lockFolder)
+                return
+            except OSError:
+                try:
+                    if time.time() - os.path.getmtime(lockFolder) > BUILD_CACHE_LOCK_TIMEOUT:
+                        os.rmdir(lockFolder)
+                except OSError:
+                    pass
+                time.sleep(0.1)
+
+    #-------------------------------------------------------------------------
+    # Unlock the cache index.
+    def Unlock(self):
+        os.rmdir(os.path.join(self.CacheFolder, BUILD_CACHE_LOCK_FOLDER_NAME))
+
+    #-------------------------------------------------------------------------
+    # Load the cache index file (if any). Builds that are in the cache folder
+    # but not in the index (for example after a crash) are removed. Other
+    # folders (for example the compiler cache's) are left alone. The index
+    # must be locked.
+    def Load(self):
+        self.Entries = {}
+        indexFileName = os.path.join(self.CacheFolder, BUILD_CACHE_INDEX_FILE_NAME)
+        if os.path.exists(indexFileName):
+            try:
+                indexFile = open(indexFileName)
+                self.Entries = json.load(indexFile)
+                indexFile.close()
+            except ValueError:
+                # A corrupt index file is simply rebuilt.
+                self.Entries = {}
+
+        if os.path.exists(self.CacheFolder):
+            for name in os.listdir(self.CacheFolder):
+                path = os.path.join(self.CacheFolder, name)
+                if not os.path.isdir(path) or name in self.Entries:
+                    continue
+                if re.match(r"^[0-9a-f]{40}$", name):
+                    shutil.rmtree(path, True)
+                elif re.match(r"^[0-9a-f]{40}" + re.escape(BUILD_CACHE_TEMPORARY_EXTENSION), name) and \
+                     time.time() - os.path.getmtime(path) > BUILD_CACHE_LOCK_TIMEOUT:
+                    shutil.rmtree(path, True)
+        for buildKey in self.Entries.keys():
+            if not os.path.isdir(os.path.join(self.CacheFolder, buildKey)):
+                del self.Entries[buildKey]
+
+    #-------------------------------------------------------------------------
+    # Save the cache index file.
+    def Save(self):
+        if not os.path.exists(self.CacheFolder):
+            os.makedirs(self.CacheFolder)
+        indexFile = open(os.path.join(self.CacheFolder, BUILD_CACHE_INDEX_FILE_NAME), 'w')
+        json.dump(self.Entries, indexFile, indent = 4, sort_keys = True)
+        indexFile.close()
+
+    #-------------------------------------------------------------------------
+    # Return the identity of the toolchain executables in a folder: the name,
+    # size and modification time of every executable in it.
+    def GetToolchainIdentity(self, folder):
+        if folder not in self.ToolchainIdentities:
+            identity = []
+            if os.path.isdir(folder):
+                for filename in sorted(os.listdir(folder)):
+                    if os.path.splitext(filename)[1].lower() == ".exe":
+                        fileStat = os.stat(os.path.join(folder, filename))
+                        identity.append([filename.lower(), fileStat.st_size, fileStat.st_mtime])
+            self.ToolchainIdentities[folder] = identity
+        return self.ToolchainIdentities[folder]
+
+    #-------------------------------------------------------------------------
+    # Return the build key of a dictionary of build inputs.
+    def GetKey(self, buildInputs):
+        return hashlib.sha1(json.dumps(buildInputs, sort_keys = True)).hexdigest()
+
+    #-------------------------------------------------------------------------
+    # Copy the cached build outputs of the key into the destination folder.
+    # Returns False (a miss) if the key is not in the cache.
+    def Restore(self, buildKey, destinationFolder, outputFolderNames):
+        self.Lock()
+        try:
+            self.Load()
+            if buildKey not in self.Entries:
+                self.MissCount += 1
+                return False
+
+            for outputFolderName in outputFolderNames:
+                destinationOutputFolder = os.path.join(destinationFolder, outputFolderName)
+                if os.path.exists(destinationOutputFolder):
+                    shutil.rmtree(destinationOutputFolder)
+                shutil.copytree(os.path.join(self.CacheFolder, buildKey, outputFolderName), destinationOutputFolder)
+
+            self.Entries[buildKey]["LastUsed"] = time.time()
+            self.Save()
+        finally:
+            self.Unlock()
+        self.HitCount += 1
+        return True
+
+    #-------------------------------------------------------------------------
+    # Save the build outputs in the source folder to the cache under the key
+    # and remove the least recently used builds if the cache is too big.
+    def Store(self, buildKey, sourceFolder, outputFolderNames):
+        # Copy to a temporary folder of this process first so that a partly
+        # copied build is never found under its key.
+        entryFolder = os.path.join(self.CacheFolder, buildKey)
+        temporaryFolder = entryFolder + BUILD_CACHE_TEMPORARY_EXTENSION + str(os.getpid())
+        if os.path.exists(temporaryFolder):
+            shutil.rmtree(temporaryFolder)
+        for outputFolderName in outputFolderNames:
+            shutil.copytree(os.path.join(sourceFolder, outputFolderName), os.path.join(temporaryFolder, outputFolderName))
+
+        self.Lock()
+        try:
+            self.Load()
+            if os.path.exists(entryFolder):
+                shutil.rmtree(entryFolder)
+            os.rename(temporaryFolder, entryFolder)
+
+            self.Entries[buildKey] = {"Size": GetFolderSize(entryFolder), "LastUsed": time.time()}
+            self.Evict()
+            self.Save()
+        finally:
+            self.Unlock()
+
+    #-------------------------------------------------------------------------
+    # Remove the least recently used builds until the cache fits its budget.
+    def Evict(self):
+        totalSize = sum([entry["Size"] for entry in self.Entries.values()])
+        for buildKey in sorted(self.Entries.keys(), key = lambda buildKey: self.Entries[buildKey]["LastUsed"]):
+            if totalSize <= self.SizeBudget:
+                break
+            totalSize -= self.Entries[buildKey]["Size"]
+            shutil.rmtree(os.path.join(self.CacheFolder, buildKey), True)
+            del self.Entries[buildKey]
+            self.EvictionCount += 1
+
+    #-------------------------------------------------------------------------
+    # Return the hit/miss statistics of the build cache.
+    def GetStatistics(self):
+        totalSize = 0
+        if self.Entries is not None:
+            totalSize = sum([entry["Size"] for entry in self.Entries.values()])
+        return "Build cache: %d hits, %d misses, %d evicted, %d builds (%.1f of %.1f MB)" % \
+               (self.HitCount, self.MissCount, self.EvictionCount, len(self.Entries or {}), totalSize / 1048576.0, self.SizeBudget / 1048576.0)
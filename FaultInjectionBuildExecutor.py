@@ -0,0 +1,304 @@
+#/////////////////////////////////////////////////////////////////////////////
+#/// @file FaultInjectionBuildExecutor.py
+#///
+#/// This script file contains the executor of the build and clean commands
+#/// of the fault injection utilities. A build command that hangs (for
+#/// example gmake-378 or wrws_update.bat waiting for a license or on a
+#/// console prompt) would otherwise block the rest of the batch forever.
+#///
+#/// Each command is run with subprocess. Its stdout and stderr are streamed
+#/// line by line to the console and appended to a build output file in the
+#/// test's build results folder. A command is stopped when it runs longer
+#/// than the wall clock timeout or prints nothing for longer than the
+#/// inactivity timeout, and when Ctrl-C is pressed (or StopEvent is set by
+#/// the thread that received it, when commands are run by other threads,
+#/// see FaultInjectionBatchRunner.py). Its whole process tree
+#/// is killed (the processes of a Windows job object, or of a POSIX process
+#/// group). The result holds the exit code, the duration, why the command
+#/// was stopped (if it was) and the peak memory of its processes (the peak
+#/// commit of the largest process of the job on Windows, the peak RSS of the
+#/// largest child elsewhere).
+#///
+#/// The timeouts (in seconds) are set with the FIT_BUILD_TIMEOUT and
+#/// FIT_BUILD_INACTIVITY_TIMEOUT environment variables. 0 disables a
+#/// timeout.
+#///
+#/// @if REVISION_HISTORY_INCLUDED
+#/// @par Edit History
+#/// agent    18-OCT-2026 Created.
+#/// agent    18-OCT-2026 Commands are also stopped when StopEvent is set.
+#/// @endif
+#///
+#/// @par Copyright (c) 2026 Rockwell Automation Technologies, Inc.  All rights reserved.
+#///
+#/////////////////////////////////////////////////////////////////////////////
+
+#-----------------------------------------------------------------------------
+import os         # For environ, setsid, killpg, wait4
+import sys        # For stdout, stderr
+import time       # For timing the commands
+import Queue      # For the lines read from the command's output
+import signal     # For SIGKILL
+import ctypes     # For the Windows job objects
+import threading  # For the output reader threads
+import subprocess # For Popen
+
+# Define constants that should not change.
+BUILD_TIMEOUT_ENVIRONMENT_VARIABLE              = "FIT_BUILD_TIMEOUT"
+
+BUILD_INACTIVITY_TIMEOUT_ENVIRONMENT_VARIABLE   = "FIT_BUILD_INACTIVITY_TIMEOUT"
+
+BUILD_DEFAULT_TIMEOUT                           = 4 * 60 * 60
+
+BUILD_DEFAULT_INACTIVITY_TIMEOUT                = 30 * 60
+
+BUILD_OUTPUT_FILE_NAME                          = "BuildOutput.log"
+
+BUILD_POLL_INTERVAL                             = 0.5
+
+BUILD_READER_JOIN_TIMEOUT                       = 5
+
+STOP_REASON_TIMEOUT                             = "wall clock timeout"
+
+STOP_REASON_INACTIVITY                          = "inactivity timeout"
+
+STOP_REASON_INTERRUPTED                         = "interrupted"
+
+JOB_OBJECT_EXTENDED_LIMIT_INFORMATION_CLASS     = 9
+
+# Set to stop the commands being run by every thread, since only the main
+# thread receives Ctrl-C.
+StopEvent = threading.Event()
+
+#-----------------------------------------------------------------------------
+# Windows job object structures, used to read the peak memory of a job.
+class JOBOBJECT_BASIC_LIMIT_INFORMATION(ctypes.Structure):
+    _fields_ = [("PerProcessUserTimeLimit", ctypes.c_int64),
+                ("PerJobUserTimeLimit", ctypes.c_int64),
+                ("LimitFlags", ctypes.c_ulong),
+                ("MinimumWorkingSetSize", ctypes.c_size_t),
+                ("MaximumWorkingSetSize", ctypes.c_size_t),
+                ("ActiveProcessLimit", ctypes.c_ulong),
+                ("Affinity", ctypes.c_size_t),
+                ("PriorityClass", ctypes.c_ulong),
+                ("SchedulingClass", ctypes.c_ulong)]
+
+class IO_COUNTERS(ctypes.Structure):
+    _fields_ = [("ReadOperationCount", ctypes.c_ulonglong),
+                ("WriteOperationCount", ctypes.c_ulonglong),
+                ("OtherOperationCount", ctypes.c_ulonglong),
+                ("ReadTransferCount", ctypes.c_ulonglong),
+                ("WriteTransferCount", ctypes.c_ulonglong),
+                ("OtherTransferCount", ctypes.c_ulonglong)]
+
+class JOBOBJECT_EXTENDED_LIMIT_INFORMATION(ctypes.Structure):
+    _fields_ = [("BasicLimitInformation", JOBOBJECT_BASIC_LIMIT_INFORMATION),
+                ("IoInfo", IO_COUNTERS),
+                ("ProcessMemoryLimit", ctypes.c_size_t),
+                ("JobMemoryLimit", ctypes.c_size_t),
+                ("PeakProcessMemoryUsed", ctypes.c_size_t),
+                ("PeakJobMemoryUsed", ctypes.c_size_t)]
+
+#-----------------------------------------------------------------------------
+# Read the lines of one of a command's output streams into a queue, followed
+# by None when the stream is closed.
+def ReadOutput(stream, streamName, outputQueue):
+    for line in iter(stream.readline, ""):
+        outputQueue.put((streamName, line))
+    stream.close()
+    outputQueue.put((streamName, None))
+
+# FaultInjectionBuildResult class
+# This class holds the result of a build command.
+class FaultInjectionBuildResult:
+
+    def __init__(self, Command):
+        self.Command = Command
+        self.ExitCode = None
+        self.Duration = 0.0
+
+        # Peak memory of the command's processes in bytes, or None if unknown.
+        self.PeakMemory = None
+
+        # Why the command was stopped, or None if it ran to its end.
+        self.StopReason = None
+
+    #-------------------------------------------------------------------------
+    # Return True if the command ran to its end successfully.
+    def IsSuccess(self):
+        return self.StopReason is None and self.ExitCode == 0
+
+    #-------------------------------------------------------------------------
+    # Return a one line summary of the result.
+    def GetSummary(self):
+        summary = "exit code %s after %.1f seconds" % (self.ExitCode, self.Duration)
+        if self.PeakMemory is not None:
+            summary += ", peak memory %.1f MB" % (self.PeakMemory / 1048576.0)
+        if self.StopReason is not None:
+            summary += ", stopped (%s)" % self.StopReason
+        return summary
+
+# FaultInjectionBuildExecutor class
+# This class is used to run build commands with their output streamed to the
+# console and to a build output file, and with timeouts.
+class FaultInjectionBuildExecutor:
+
+    def __init__(self, OutputFileName = None, Timeout = None, InactivityTimeout = None, IsEchoed = True):
+        if Timeout is None:
+            Timeout = float(os.environ.get(BUILD_TIMEOUT_ENVIRONMENT_VARIABLE, BUILD_DEFAULT_TIMEOUT))
+        if InactivityTimeout is None:
+            InactivityTimeout = float(os.environ.get(BUILD_INACTIVITY_TIMEOUT_ENVIRONMENT_VARIABLE, BUILD_DEFAULT_INACTIVITY_TIMEOUT))
+        self.OutputFileName = OutputFileName
+        self.Timeout = Timeout
+        self.InactivityTimeout = InactivityTimeout
+        self.IsEchoed = IsEchoed
+
+    #-------------------------------------------------------------------------
+    # Start a command in its own process tree: a Windows job object, or a
+    # POSIX process group. Returns the process and the job (None if the
+    # command could not be put in a job).
+    def StartCommand(self, command, environment):
+        if os.name == "nt":
+            process = subprocess.Popen(command, shell = True, stdout = subprocess.PIPE, stderr = subprocess.PIPE, env = environment)
+            job = ctypes.windll.kernel32.CreateJobObjectW(None, None)
+            if job and not ctypes.windll.kernel32.AssignProcessToJobObject(job, int(process._handle)):
+                # For example when the harness itself already runs in a job
+                # that does not allow nested jobs.
+                ctypes.windll.kernel32.CloseHandle(job)
+                job = None
+            return (process, job or None)
+        process = subprocess.Popen(command, shell = True, stdout = subprocess.PIPE, stderr = subprocess.PIPE, env = environment, preexec_fn = os.setsid)
+        return (process, None)
+
+    #-------------------------------------------------------------------------
+    # Return the exit code of a command if it ended (None if not), and
+    # record the peak memory of its processes.
+    def PollCommand(self, process, job, result):
+        if os.name == "nt":
+            exitCode = process.poll()
+            if exitCode is not None and job is not None:
+                information = JOBOBJECT_EXTENDED_LIMIT_INFORMATION()
+                if ctypes.windll.kernel32.QueryInformationJobObject(job, JOB_OBJECT_EXTENDED_LIMIT_INFORMATION_CLASS, ctypes.byref(information), ctypes.sizeof(information), None):
+                    result.PeakMemory = information.PeakProcessMemoryUsed
+            return exitCode
+
+        # wait4 also returns the peak RSS of the shell and the children it waited for.
+        if process.returncode is None:
+            pid, status, resourceUsage = os.wait4(process.pid, os.WNOHANG)
+            if pid == 0:
+                return None
+            if os.WIFSIGNALED(status):
+                process.returncode = -os.WTERMSIG(status)
+            else:
+                process.returncode = os.WEXITSTATUS(status)
+            result.PeakMemory = resourceUsage.ru_maxrss * 1024
+        return process.returncode
+
+    #-------------------------------------------------------------------------
+    # Kill every process of a command's process tree.
+    def KillCommand(self, process, job):
+        if os.name == "nt":
+            if job is not None:
+                ctypes.windll.kernel32.TerminateJobObject(job, 1)
+            else:
+                devnull = open(os.devnull, 'w')
+                subprocess.call("taskkill /F /T /PID %d" % process.pid, stdout = devnull, stderr = devnull)
+                devnull.close()
+        else:
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except OSError:
+                # The process group already ended.
+                pass
+
+    #-------------------------------------------------------------------------
+    # Write a line of a command's output to the build output file and to the
+    # console.
+    def WriteOutput(self, outputFile, streamName, line):
+        if outputFile is not None:
+            outputFile.write(line)
+        if self.IsEchoed:
+            if streamName == "stderr":
+                sys.stderr.write(line)
+            else:
+                sys.stdout.write(line)
+
+    #-------------------------------------------------------------------------
+    # Run a command with the environment variables in Environment added to
+    # the harness's. Returns its FaultInjectionBuildResult. Ctrl-C kills the
+    # command and is raised again.
+    def Run(self, command, Environment = None):
+        environment = dict(os.environ)
+        if Environment is not None:
+            environment.update(Environment)
+        result = FaultInjectionBuildResult(command)
+        outputFile = None
+        if self.OutputFileName is not None:
+            outputFile = open(self.OutputFileName, 'a')
+            outputFile.write("> %s\n" % command)
+
+        startTime = time.time()
+        lastOutputTime = startTime
+        process, job = self.StartCommand(command, environment)
+        outputQueue = Queue.Queue()
+        readers = [threading.Thread(target = ReadOutput, args = (process.stdout, "stdout", outputQueue)),
+                   threading.Thread(target = ReadOutput, args = (process.stderr, "stderr", outputQueue))]
+        for reader in readers:
+            reader.daemon = True
+            reader.start()
+
+        try:
+            try:
+                openStreamCount = len(readers)
+                exitCode = None
+                while openStreamCount != 0 or exitCode is None:
+                    try:
+                        streamName, line = outputQueue.get(True, BUILD_POLL_INTERVAL)
+                        if line is None:
+                            openStreamCount -= 1
+                        else:
+                            lastOutputTime = time.time()
+                            self.WriteOutput(outputFile, streamName, line)
+                    except Queue.Empty:
+                        pass
+
+                    if exitCode is None:
+                        exitCode = self.PollCommand(process, job, result)
+                    if exitCode is not None and openStreamCount != 0 and time.time() - lastOutputTime > BUILD_READER_JOIN_TIMEOUT:
+                        # A process that left the tree still holds the output open.
+                        break
+                    if exitCode is None and self.Timeout > 0 and time.time() - startTime > self.Timeout:
+                        result.StopReason = STOP_REASON_TIMEOUT
+                        break
+                    if exitCode is None and self.InactivityTimeout > 0 and time.time() - lastOutputTime > self.InactivityTimeout:
+                        result.StopReason = STOP_REASON_INACTIVITY
+                        break
+                    if exitCode is None and StopEvent.is_set():
+                        result.StopReason = STOP_REASON_INTERRUPTED
+                        break
+            except KeyboardInterrupt:
+                result.StopReason = STOP_REASON_INTERRUPTED
+                self.KillCommand(process, job)
+                for reader in readers:
+                    reader.join(BUILD_READER_JOIN_TIMEOUT)
+                raise
+
+            if result.StopReason is not None:
+                self.KillCommand(process, job)
+                for reader in readers:
+                    reader.join(BUILD_READER_JOIN_TIMEOUT)
+                exitCode = None
+                while exitCode is None:
+                    exitCode = self.PollCommand(process, job, result)
+                    time.sleep(0.1)
+                # A killed command never succeeds, whatever its exit code.
+                exitCode = exitCode or 1
+            result.ExitCode = exitCode
+        finally:
+            result.Duration = time.time() - startTime
+            if job is not None:
+                ctypes.windll.kernel32.CloseHandle(job)
+            if outputFile is not None:
+                outputFile.write("> %s\n" % result.GetSummary())
+                outputFile.close()
+        return result
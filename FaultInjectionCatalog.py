@@ -0,0 +1,241 @@
+#/////////////////////////////////////////////////////////////////////////////
+#/// @file FaultInjectionCatalog.py
+#///
+#/// This script file contains the fault injection point catalog. The catalog
+#/// walks the source folders of a view once and records every "Start/End
+#/// Fault Injection Point N" marker with its file, line and byte offset.
+#///
+#/// The catalog is saved to an index file and is reloaded on the next run.
+#/// A file is only scanned again when its modification time or size has
+#/// changed, so the fault injection utilities can resolve files and markers
+#/// through dictionary lookups instead of probing the view and searching the
+#/// text of every file.
+#///
+#/// The catalog can also be run from the command line to list the fault
+#/// injection script files that use a given point of a given file, for
+#/// example:
+#///     python FaultInjectionCatalog.py ApexDiagnostic.cpp 2
+#///
+#/// @if REVISION_HISTORY_INCLUDED
+#/// @par Edit History
+#/// agent    18-OCT-2026 Created.
+#/// agent    18-OCT-2026 The fault injection script files are now read
+#///                      through FaultInjectionTestDiscovery.
+#/// agent    18-OCT-2026 FindTestsUsingPoint() now uses the compiled patch
+#///                      plan.
+#/// agent    18-OCT-2026 Added the contents hash of every file and
+#///                      GetFingerprint().
+#/// agent    18-OCT-2026 The index file is now read back as byte strings, so
+#///                      files with non-ASCII bytes can be patched from the
+#///                      second run on.
+#/// @endif
+#///
+#/// @par Copyright (c) 2026 Rockwell Automation Technologies, Inc.  All rights reserved.
+#///
+#/////////////////////////////////////////////////////////////////////////////
+
+#-----------------------------------------------------------------------------
+import os         # For walk, stat, path
+import sys        # For argv
+import json       # For the index file
+import hashlib    # For sha1
+import FaultInjectionPatchEngine # For FAULT_INJECTION_MARKER_PATTERN
+import FaultInjectionManifest    # For EncodeStrings
+
+# Define constants that should not change.
+CATALOG_INDEX_FILE_NAME                 = "FaultInjectionCatalog.json"
+
+CATALOG_INDEX_VERSION                   = 2
+
+CATALOG_SOURCE_FILE_EXTENSIONS          = [".c", ".cpp", ".h", ".hpp", ".s", ".asm", ".inc", ".ldf", ".sct", ".mk"]
+
+CATALOG_SOURCE_FILE_NAMES               = ["makefile"]
+
+# FaultInjectionCatalog class
+# This class is used to index the fault injection points of a view.
+class FaultInjectionCatalog:
+
+    def __init__(self, ViewPath, SourceRoots, IndexFileName = CATALOG_INDEX_FILE_NAME, SkippedFolderNames = []):
+        self.ViewPath = ViewPath
+        self.SourceRoots = SourceRoots
+        self.IndexFileName = IndexFileName
+        self.SkippedFolderNames = [os.path.normcase(name) for name in SkippedFolderNames]
+
+        # Normalized file path -> {"Path", "Size", "MTime", "Hash", "Markers"},
+        # where "Hash" is the SHA-1 of the file's contents and "Markers" is a
+        # list of [kind, point, line, offset] in file order.
+        self.Files = {}
+
+        # Lower case file name -> list of normalized file paths.
+        self.FilesByName = {}
+
+        self.ScannedFileCount = 0
+
+        self.Fingerprint = None
+
+    #-------------------------------------------------------------------------
+    # Return the key used for a file path in the catalog.
+    def GetKey(self, path):
+        return os.path.normcase(os.path.normpath(path))
+
+    #-------------------------------------------------------------------------
+    # Return True if the file is a source file that can contain markers.
+    def IsSourceFile(self, filename):
+        filename = filename.lower()
+        if filename in CATALOG_SOURCE_FILE_NAMES:
+            return True
+        return os.path.splitext(filename)[1] in CATALOG_SOURCE_FILE_EXTENSIONS
+
+    #-------------------------------------------------------------------------
+    # Scan a file and return the SHA-1 of its contents and its markers as a
+    # list of [kind, point, line, offset].
+    def ScanFile(self, path):
+        sourceFile = open(path, 'rb')
+        text = sourceFile.read()
+        sourceFile.close()
+
+        markers = []
+        line = 1
+        lineOffset = 0
+        for match in FaultInjectionPatchEngine.FAULT_INJECTION_MARKER_PATTERN.finditer(text):
+            line += text.count("\n", lineOffset, match.start())
+            lineOffset = match.start()
+            markers.append([match.group(1), match.group(2), line, match.start()])
+
+        self.ScannedFileCount += 1
+        return (hashlib.sha1(text).hexdigest(), markers)
+
+    #-------------------------------------------------------------------------
+    # Load the index file (if any), walk the source folders and scan only the
+    # files that are new or whose modification time or size has changed.
+    # The index file is saved again if anything changed.
+    def Load(self):
+        previousFiles = {}
+        if os.path.exists(self.IndexFileName):
+            try:
+                indexFile = open(self.IndexFileName)
+                # The markers are compared with the byte string text of the
+                # files, so they must not come back as unicode strings.
+                index = FaultInjectionManifest.EncodeStrings(json.load(indexFile))
+                indexFile.close()
+                if index.get("Version") == CATALOG_INDEX_VERSION and index.get("ViewPath") == self.ViewPath:
+                    previousFiles = index["Files"]
+            except ValueError:
+                # A corrupt index file is simply rebuilt.
+                previousFiles = {}
+
+        self.Files = {}
+        self.FilesByName = {}
+        self.ScannedFileCount = 0
+        self.Fingerprint = None
+
+        for sourceRoot in self.SourceRoots:
+            for folder, folderNames, fileNames in os.walk(os.path.join(self.ViewPath, sourceRoot)):
+                folderNames[:] = [name for name in folderNames if os.path.normcase(name) not in self.SkippedFolderNames]
+                for filename in fileNames:
+                    if not self.IsSourceFile(filename):
+                        continue
+                    path = os.path.join(folder, filename)
+                    key = self.GetKey(path)
+                    if key in self.Files:
+                        # Already found through an enclosing source root.
+                        continue
+                    fileStat = os.stat(path)
+                    entry = previousFiles.get(key)
+                    if entry is None or entry["Size"] != fileStat.st_size or entry["MTime"] != fileStat.st_mtime:
+                        fileHash, markers = self.ScanFile(path)
+                        entry = {"Path": path, "Size": fileStat.st_size, "MTime": fileStat.st_mtime, "Hash": fileHash, "Markers": markers}
+                    self.Files[key] = entry
+                    self.FilesByName.setdefault(filename.lower(), []).append(key)
+
+        if self.ScannedFileCount or len(previousFiles) != len(self.Files):
+            self.Save()
+
+    #-------------------------------------------------------------------------
+    # Save the catalog to the index file.
+    def Save(self):
+        indexFolder = os.path.dirname(self.IndexFileName)
+        if indexFolder and not os.path.exists(indexFolder):
+            os.makedirs(indexFolder)
+        indexFile = open(self.IndexFileName, 'w')
+        json.dump({"Version": CATALOG_INDEX_VERSION, "ViewPath": self.ViewPath, "Files": self.Files}, indexFile)
+        indexFile.close()
+
+    #-------------------------------------------------------------------------
+    # Return the fingerprint of the cataloged source files: the SHA-1 of every
+    # file's path (relative to the view path) and contents hash. Two views
+    # with the same source files have the same fingerprint.
+    def GetFingerprint(self):
+        if self.Fingerprint is None:
+            viewPathLength = len(self.GetKey(self.ViewPath))
+            fingerprint = hashlib.sha1()
+            for key in sorted(self.Files.keys()):
+                fingerprint.update("%s %s\n" % (key[viewPathLength:], self.Files[key]["Hash"]))
+            self.Fingerprint = fingerprint.hexdigest()
+        return self.Fingerprint
+
+    #-------------------------------------------------------------------------
+    # Return the path of the file in the specified folder, or None if the
+    # catalog does not contain it.
+    def FindFile(self, folder, filename):
+        entry = self.Files.get(self.GetKey(os.path.join(folder, filename)))
+        if entry is None:
+            return None
+        return entry["Path"]
+
+    #-------------------------------------------------------------------------
+    # Return the (kind, point, offset) markers of a file in the form used by
+    # FaultInjectionPatchEngine, or None if the catalog does not contain it.
+    def GetMarkers(self, path):
+        entry = self.Files.get(self.GetKey(path))
+        if entry is None:
+            return None
+        return [(kind, point, offset) for kind, point, line, offset in entry["Markers"]]
+
+    #-------------------------------------------------------------------------
+    # Return a list of (path, line) for the start marker of the specified
+    # point in every cataloged file with the specified name.
+    def FindPoint(self, filename, point):
+        locations = []
+        for key in self.FilesByName.get(filename.lower(), []):
+            for kind, markerPoint, line, offset in self.Files[key]["Markers"]:
+                if kind == FaultInjectionPatchEngine.FAULT_INJECTION_MARKER_START and markerPoint == str(point):
+                    locations.append((self.Files[key]["Path"], line))
+        return locations
+
+    #-------------------------------------------------------------------------
+    # Return the names of the fault injection script files (from the specified
+    # FaultInjectionTestDiscovery specs) that modify the specified point of
+    # the specified file.
+    def FindTestsUsingPoint(self, filename, point, specs):
+        testNames = []
+        for spec in specs:
+            if spec.PatchPlan is None:
+                continue
+            for planFileName in spec.PatchPlan:
+                if planFileName.lower() != filename.lower():
+                    continue
+                for patternStart, patternEnd, replacement in spec.PatchPlan[planFileName]:
+                    match = FaultInjectionPatchEngine.FAULT_INJECTION_MARKER_PATTERN.search(patternStart)
+                    if match is not None and match.group(2) == str(point) and spec.TestName not in testNames:
+                        testNames.append(spec.TestName)
+        return testNames
+
+#-----------------------------------------------------------------------------
+# List the fault injection script files that use a point of a file, along
+# with where that point is found in the view.
+if __name__ == "__main__":
+    import NextGenFaultInjectionUtils
+
+    if len(sys.argv) != 3:
+        print "Usage: python FaultInjectionCatalog.py <file name> <fault injection point>"
+        sys.exit(1)
+
+    utils = NextGenFaultInjectionUtils.FaultInjectionUtils()
+    catalog = utils.CreateCatalog(utils.FindViewPath(os.getcwd())[0])
+    catalog.Load()
+
+    for path, line in catalog.FindPoint(sys.argv[1], sys.argv[2]):
+        print "Point %s found at %s(%d)" % (sys.argv[2], path, line)
+    for testName in catalog.FindTestsUsingPoint(sys.argv[1], sys.argv[2], utils.CreateTestDiscovery().Discover()):
+        print "Used by %s" % testName
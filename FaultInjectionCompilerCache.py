@@ -0,0 +1,504 @@
+#/////////////////////////////////////////////////////////////////////////////
+#/// @file FaultInjectionCompilerCache.py
+#///
+#/// This script file contains the compiler cache used by the fault injection
+#/// builds. Every fault injection build starts with a clean build, so every
+#/// translation unit of Apex and of the 1756 module is compiled again even
+#/// though only one to three source files were modified.
+#///
+#/// The compiler cache wraps the ARM compiler (armcc) and the VisualDSP
+#/// compiler (ccblkfn). For each compile of one C/C++ source file to an
+#/// object file, the source is preprocessed by the real compiler and the
+#/// object file (and its dependency file, if any) is looked up by the SHA-1
+#/// of the compiler's identity, its flags and the preprocessed source. On a
+#/// hit the stored files are copied instead of compiling. Any other use of
+#/// the compiler (linking, preprocessing only, response files) is passed
+#/// through unchanged.
+#///
+#/// For the compile-time variant builds (see FaultInjectionMultiFault.py),
+#/// the wrapper also wraps the ARM assembler (armasm) and the VisualDSP
+#/// assembler (easmblkfn), and every run of a wrapped tool is given the
+#/// FIT_ID macro set to FIT_VARIANT_ID. The macro is part of the preprocessed source but
+#/// not of the flags in the key, so only the translation units whose
+#/// preprocessed source depends on FIT_ID are compiled again for each
+#/// variant; the others are hits. The -DFIT_ID that APEX2_Build_Test.bat and
+#/// Module_Build.bat pass to make (FIT_DEFINES) is left out of the key
+#/// too, and is replaced by the wrapper's own, so it is not passed twice.
+#///
+#/// The wrapper is installed as armcc.bat and ccblkfn.bat shims in a folder
+#/// that APEX2_Build_Test.bat and Module_Build.bat put first on the PATH when
+#/// FIT_COMPILER_CACHE_SHIMS is set, so the makefiles are not changed. Each
+#/// compile appends its result to the FIT_COMPILER_CACHE_STATS file, which
+#/// the fault injection utilities summarize in the log of every test.
+#///
+#/// The folder being built (the view or a worktree, see
+#/// FaultInjectionWorktree.py) is FIT_COMPILER_CACHE_ROOT. It is replaced by
+#/// a placeholder in the flags, the object file names and the #line file
+#/// names of the preprocessed source before they are hashed, so the same
+#/// translation unit compiled in two worktrees has one key. The debug
+#/// information of an object served from the cache names the folder it was
+#/// first compiled in.
+#///
+#/// Usage:
+#///     python FaultInjectionCompilerCache.py <real compiler> <arguments>
+#///
+#/// @if REVISION_HISTORY_INCLUDED
+#/// @par Edit History
+#/// agent    18-OCT-2026 Created.
+#/// agent    18-OCT-2026 The assemblers are wrapped too, and every wrapped
+#///                      tool is given FIT_ID for the variant builds.
+#/// agent    18-OCT-2026 The key is relative to the folder being built
+#///                      (FIT_COMPILER_CACHE_ROOT), so the worktrees of a
+#///                      campaign share their objects.
+#/// agent    18-OCT-2026 Recorded the source files and variant ID of each run
+#///                      in the statistics.
+#/// agent    18-OCT-2026 The -DFIT_ID of the command line is no longer part
+#///                      of the key.
+#/// agent    18-OCT-2026 The compiler's messages are stored in a file of
+#///                      their own, as bytes.
+#/// @endif
+#///
+#/// @par Copyright (c) 2026 Rockwell Automation Technologies, Inc.  All rights reserved.
+#///
+#/////////////////////////////////////////////////////////////////////////////
+
+#-----------------------------------------------------------------------------
+import os         # For path, environ, stat, utime
+import sys        # For argv, exit, executable
+import json       # For the entry and statistics files
+import time       # For timing the compiles
+import shutil     # For copyfile, rmtree
+import re         # For the root folder in the preprocessed source
+import hashlib    # For sha1
+import subprocess # For running the real compiler
+
+# Define constants that should not change.
+COMPILER_CACHE_FOLDER_NAME                  = "Build_Cache\\Objects"
+
+COMPILER_CACHE_SHIMS_FOLDER_NAME            = "Build_Cache\\CompilerShims"
+
+COMPILER_CACHE_DEFAULT_SIZE_MB              = 2048
+
+COMPILER_CACHE_FOLDER_ENVIRONMENT_VARIABLE  = "FIT_COMPILER_CACHE_FOLDER"
+
+COMPILER_CACHE_SIZE_ENVIRONMENT_VARIABLE    = "FIT_COMPILER_CACHE_SIZE_MB"
+
+COMPILER_CACHE_SHIMS_ENVIRONMENT_VARIABLE   = "FIT_COMPILER_CACHE_SHIMS"
+
+COMPILER_CACHE_STATS_ENVIRONMENT_VARIABLE   = "FIT_COMPILER_CACHE_STATS"
+
+COMPILER_CACHE_ROOT_ENVIRONMENT_VARIABLE    = "FIT_COMPILER_CACHE_ROOT"
+
+# What the root folder is replaced by in the key.
+COMPILER_CACHE_ROOT_PLACEHOLDER             = "<root>"
+
+COMPILER_CACHE_ENTRY_FILE_NAME              = "entry.json"
+
+# The compiler's messages are bytes in the console's code page, so they are
+# stored as they are rather than in the entry file.
+COMPILER_CACHE_MESSAGES_FILE_NAME           = "messages.txt"
+
+COMPILER_CACHE_SOURCE_FILE_EXTENSIONS       = [".c", ".cpp", ".cc", ".cxx"]
+
+ASSEMBLER_SOURCE_FILE_EXTENSIONS            = [".s", ".asm"]
+
+VARIANT_ID_ENVIRONMENT_VARIABLE             = "FIT_VARIANT_ID"
+
+VARIANT_ID_MACRO_NAME                       = "FIT_ID"
+
+# The ARM assembler defines macros with its own option and directive syntax.
+ARM_ASSEMBLER_NAME                          = "armasm"
+
+COMPILER_CACHE_RESULT_HIT                   = "hit"
+
+COMPILER_CACHE_RESULT_MISS                  = "miss"
+
+COMPILER_CACHE_RESULT_NOT_CACHEABLE         = "not cacheable"
+
+# Options that are followed by a file name that is not part of the key.
+COMPILER_OUTPUT_OPTIONS                     = ["-o"]
+
+COMPILER_DEPENDENCY_FILE_OPTIONS            = ["--depend", "-MF", "-Mo"]
+
+# Options that make the compiler write a dependency file next to the object.
+COMPILER_DEPENDENCY_OPTIONS                 = ["--md", "-MD"]
+
+# Options that make the compiler do something other than compile one file.
+COMPILER_NOT_CACHEABLE_OPTIONS              = ["-E", "-M", "-MM"]
+
+#-----------------------------------------------------------------------------
+# Return the SHA-1 of a file's contents.
+def GetFileHash(fileNameWithPath):
+    hashFile = open(fileNameWithPath, 'rb')
+    fileHash = hashlib.sha1(hashFile.read()).hexdigest()
+    hashFile.close()
+    return fileHash
+
+#-----------------------------------------------------------------------------
+# Return a file name relative to the root folder (the view or the worktree
+# being built), so that the same file of two worktrees has the same name in
+# the key. A file name outside of the root folder is returned as is.
+def GetRootRelativeFileName(fileName, rootFolder):
+    fileName = os.path.normcase(os.path.abspath(fileName))
+    if rootFolder:
+        rootFolder = os.path.normcase(os.path.abspath(rootFolder))
+        if fileName.startswith(rootFolder + os.sep):
+            return os.path.join(COMPILER_CACHE_ROOT_PLACEHOLDER, fileName[len(rootFolder) + 1:])
+    return fileName
+
+#-----------------------------------------------------------------------------
+# Replace the root folder in the preprocessed source (the file names of its
+# #line directives) by a placeholder, whether its separators are written as
+# backslashes, escaped backslashes or slashes.
+def GetRootRelativeSource(preprocessedSource, rootFolder):
+    if not rootFolder:
+        return preprocessedSource
+    rootParts = re.split(r"[\\/]+", os.path.abspath(rootFolder).rstrip("\\/"))
+    rootPattern = r"(?:\\\\|\\|/)".join([re.escape(rootPart) for rootPart in rootParts])
+    return re.sub("(?i)" + rootPattern, COMPILER_CACHE_ROOT_PLACEHOLDER, preprocessedSource)
+
+#-----------------------------------------------------------------------------
+# Return the arguments that define the FIT_ID macro for a tool, or no
+# arguments if no variant is being built.
+def GetVariantArguments(compiler):
+    variantId = os.environ.get(VARIANT_ID_ENVIRONMENT_VARIABLE)
+    if not variantId:
+        return []
+    if os.path.splitext(os.path.basename(compiler))[0].lower() == ARM_ASSEMBLER_NAME:
+        return ["--predefine", "%s SETA %d" % (VARIANT_ID_MACRO_NAME, int(variantId))]
+    return ["-D%s=%d" % (VARIANT_ID_MACRO_NAME, int(variantId))]
+
+#-----------------------------------------------------------------------------
+# Return True if a compiler argument defines the FIT_ID macro.
+def IsVariantArgument(argument):
+    return argument.split("=")[0] == "-D" + VARIANT_ID_MACRO_NAME
+
+# FaultInjectionCompile class
+# This class describes one run of the compiler, as parsed from its arguments.
+class FaultInjectionCompile:
+
+    def __init__(self, Compiler, Arguments, VariantArguments = []):
+        self.Compiler = Compiler
+        self.Arguments = Arguments
+
+        # The arguments that define FIT_ID, which are not part of the key:
+        # the wrapper's own, or else the ones of the command line.
+        self.VariantArguments = list(VariantArguments)
+        self.SourceFileName = None
+        self.ObjectFileName = None
+        self.DependencyFileName = None
+
+        # The arguments without the object and dependency file names, which
+        # are used for the key and for preprocessing.
+        self.KeyArguments = []
+
+        # The reason the compile cannot be cached, if any.
+        self.NotCacheableReason = None
+
+        self.Parse()
+
+    #-------------------------------------------------------------------------
+    # Find the source, object and dependency files of the compile.
+    def Parse(self):
+        isCompileOnly = False
+        isDependencyWritten = False
+        sourceFileNames = []
+        argumentIndex = 0
+        while argumentIndex < len(self.Arguments):
+            argument = self.Arguments[argumentIndex]
+            option = argument.split("=")[0]
+            if argument.startswith("@") or argument.startswith("-via"):
+                self.NotCacheableReason = "response file"
+                return
+            elif argument in COMPILER_NOT_CACHEABLE_OPTIONS:
+                self.NotCacheableReason = "option %s" % argument
+                return
+            elif argument == "-c":
+                isCompileOnly = True
+                self.KeyArguments.append(argument)
+            elif option in COMPILER_OUTPUT_OPTIONS + COMPILER_DEPENDENCY_FILE_OPTIONS:
+                if "=" in argument:
+                    fileName = argument.split("=", 1)[1]
+                elif argumentIndex + 1 < len(self.Arguments):
+                    argumentIndex += 1
+                    fileName = self.Arguments[argumentIndex]
+                else:
+                    self.NotCacheableReason = "option %s without a file name" % argument
+                    return
+                if option in COMPILER_OUTPUT_OPTIONS:
+                    self.ObjectFileName = fileName
+                else:
+                    self.DependencyFileName = fileName
+            elif argument in COMPILER_DEPENDENCY_OPTIONS:
+                isDependencyWritten = True
+                self.KeyArguments.append(argument)
+            elif IsVariantArgument(argument):
+                if len(self.VariantArguments) == 0:
+                    self.VariantArguments.append(argument)
+            elif not argument.startswith("-") and os.path.splitext(argument)[1].lower() in COMPILER_CACHE_SOURCE_FILE_EXTENSIONS:
+                sourceFileNames.append(argument)
+            else:
+                self.KeyArguments.append(argument)
+            argumentIndex += 1
+
+        if not isCompileOnly:
+            self.NotCacheableReason = "not a compile only"
+        elif len(sourceFileNames) != 1:
+            self.NotCacheableReason = "%d source files" % len(sourceFileNames)
+        elif self.ObjectFileName is None:
+            self.NotCacheableReason = "no object file name"
+        else:
+            self.SourceFileName = sourceFileNames[0]
+            if isDependencyWritten and self.DependencyFileName is None:
+                self.DependencyFileName = os.path.splitext(self.ObjectFileName)[0] + ".d"
+
+    #-------------------------------------------------------------------------
+    # Return the arguments used to run the compiler: the wrapper's FIT_ID
+    # replaces the one of the command line, if any.
+    def GetCompileArguments(self):
+        if len(self.VariantArguments) == 0:
+            return self.Arguments
+        return self.VariantArguments + [argument for argument in self.Arguments if not IsVariantArgument(argument)]
+
+    #-------------------------------------------------------------------------
+    # Return the arguments used to preprocess the source file.
+    def GetPreprocessArguments(self):
+        return self.VariantArguments + [argument for argument in self.KeyArguments if argument not in ["-c"] + COMPILER_DEPENDENCY_OPTIONS] + ["-E", self.SourceFileName]
+
+    #-------------------------------------------------------------------------
+    # Return the output files of the compile as a list of (name in the cache
+    # entry, file name).
+    def GetOutputFiles(self):
+        outputFiles = [("object", self.ObjectFileName)]
+        if self.DependencyFileName is not None:
+            outputFiles.append(("depend", self.DependencyFileName))
+        return outputFiles
+
+# FaultInjectionCompilerCache class
+# This class is used to store and find compiled object files.
+class FaultInjectionCompilerCache:
+
+    def __init__(self, CacheFolder = None, SizeBudget = None):
+        if CacheFolder is None:
+            CacheFolder = os.environ.get(COMPILER_CACHE_FOLDER_ENVIRONMENT_VARIABLE, COMPILER_CACHE_FOLDER_NAME)
+        if SizeBudget is None:
+            SizeBudget = int(os.environ.get(COMPILER_CACHE_SIZE_ENVIRONMENT_VARIABLE, COMPILER_CACHE_DEFAULT_SIZE_MB)) * 1024 * 1024
+        self.CacheFolder = CacheFolder
+        self.SizeBudget = SizeBudget
+
+    #-------------------------------------------------------------------------
+    # Return True if the compiler cache is enabled.
+    def IsEnabled(self):
+        return self.SizeBudget > 0
+
+    #-------------------------------------------------------------------------
+    # Return the key of a compile: the compiler's identity, the flags, the
+    # object and dependency file names and the preprocessed source. The flags,
+    # the file names and the preprocessed source are made relative to the root folder
+    # (FIT_COMPILER_CACHE_ROOT), so the compiles of the worktrees of a
+    # campaign share their objects. Returns None if the source cannot be
+    # preprocessed.
+    def GetKey(self, compileRun):
+        preprocess = subprocess.Popen([compileRun.Compiler] + compileRun.GetPreprocessArguments(), stdout = subprocess.PIPE, stderr = subprocess.PIPE)
+        preprocessedSource = preprocess.communicate()[0]
+        if preprocess.returncode != 0:
+            return None
+
+        rootFolder = os.environ.get(COMPILER_CACHE_ROOT_ENVIRONMENT_VARIABLE)
+        compilerStat = os.stat(compileRun.Compiler)
+        key = hashlib.sha1()
+        key.update(json.dumps([os.path.normcase(compileRun.Compiler), compilerStat.st_size, compilerStat.st_mtime, \
+                               [GetRootRelativeSource(argument, rootFolder) for argument in compileRun.KeyArguments], \
+                               GetRootRelativeFileName(compileRun.ObjectFileName, rootFolder), \
+                               compileRun.DependencyFileName and GetRootRelativeFileName(compileRun.DependencyFileName, rootFolder)]))
+        key.update(GetRootRelativeSource(preprocessedSource, rootFolder))
+        return key.hexdigest()
+
+    #-------------------------------------------------------------------------
+    # Return the folder of a key's cache entry.
+    def GetEntryFolder(self, key):
+        return os.path.join(self.CacheFolder, key[:2], key)
+
+    #-------------------------------------------------------------------------
+    # Copy the stored output files of the key to the compile's output files.
+    # Returns the entry (with the original compile time and the compiler's
+    # messages) or None on a miss.
+    def Restore(self, key, compileRun):
+        entryFileName = os.path.join(self.GetEntryFolder(key), COMPILER_CACHE_ENTRY_FILE_NAME)
+        if not os.path.exists(entryFileName):
+            return None
+        try:
+            entryFile = open(entryFileName)
+            entry = json.load(entryFile)
+            entryFile.close()
+            messagesFileName = os.path.join(self.GetEntryFolder(key), COMPILER_CACHE_MESSAGES_FILE_NAME)
+            if os.path.exists(messagesFileName):
+                messagesFile = open(messagesFileName, 'rb')
+                entry["Messages"] = messagesFile.read()
+                messagesFile.close()
+            else:
+                # An entry stored before the messages file had them in the
+                # entry file, where json.load made them unicode.
+                entry["Messages"] = entry.get("Messages", u"").encode("utf-8")
+            for name, fileName in compileRun.GetOutputFiles():
+                shutil.copyfile(os.path.join(self.GetEntryFolder(key), name), fileName)
+        except (ValueError, IOError):
+            # A damaged entry is a miss and is replaced by the compile.
+            return None
+
+        # The modification time of the entry file is the last use time.
+        os.utime(entryFileName, None)
+        return entry
+
+    #-------------------------------------------------------------------------
+    # Store the compile's output files under the key.
+    def Store(self, key, compileRun, compileTime, messages):
+        entryFolder = self.GetEntryFolder(key)
+        temporaryFolder = entryFolder + ".%d.tmp" % os.getpid()
+        if os.path.exists(temporaryFolder):
+            shutil.rmtree(temporaryFolder)
+        os.makedirs(temporaryFolder)
+        for name, fileName in compileRun.GetOutputFiles():
+            shutil.copyfile(fileName, os.path.join(temporaryFolder, name))
+        entryFile = open(os.path.join(temporaryFolder, COMPILER_CACHE_ENTRY_FILE_NAME), 'w')
+        json.dump({"Source": compileRun.SourceFileName, "CompileTime": compileTime}, entryFile)
+        entryFile.close()
+        messagesFile = open(os.path.join(temporaryFolder, COMPILER_CACHE_MESSAGES_FILE_NAME), 'wb')
+        messagesFile.write(messages)
+        messagesFile.close()
+
+        # Another compile of the same key may have stored it first.
+        try:
+            os.rename(temporaryFolder, entryFolder)
+        except OSError:
+            shutil.rmtree(temporaryFolder, True)
+
+    #-------------------------------------------------------------------------
+    # Remove the least recently used entries until the cache fits its budget.
+    # Returns the number of entries removed.
+    def Evict(self):
+        if not os.path.isdir(self.CacheFolder):
+            return 0
+        entries = []
+        totalSize = 0
+        for path, folderNames, fileNames in os.walk(self.CacheFolder):
+            if COMPILER_CACHE_ENTRY_FILE_NAME not in fileNames:
+                continue
+            size = sum([os.path.getsize(os.path.join(path, fileName)) for fileName in fileNames])
+            entries.append((os.path.getmtime(os.path.join(path, COMPILER_CACHE_ENTRY_FILE_NAME)), size, path))
+            totalSize += size
+
+        evictedCount = 0
+        for lastUsed, size, path in sorted(entries):
+            if totalSize <= self.SizeBudget:
+                break
+            shutil.rmtree(path, True)
+            totalSize -= size
+            evictedCount += 1
+        return evictedCount
+
+    #-------------------------------------------------------------------------
+    # Run the compiler, through the cache if the compile can be cached.
+    # Returns the compiler's exit code.
+    def Run(self, compiler, arguments):
+        compileRun = FaultInjectionCompile(compiler, arguments, GetVariantArguments(compiler))
+        startTime = time.time()
+        key = None
+        if compileRun.NotCacheableReason is None and self.IsEnabled():
+            key = self.GetKey(compileRun)
+
+        if key is not None:
+            entry = self.Restore(key, compileRun)
+            if entry is not None:
+                sys.stderr.write(entry["Messages"])
+                self.WriteStatistics(compileRun, COMPILER_CACHE_RESULT_HIT, time.time() - startTime, entry["CompileTime"])
+                return 0
+
+        process = subprocess.Popen([compiler] + compileRun.GetCompileArguments(), stdout = subprocess.PIPE, stderr = subprocess.STDOUT)
+        messages = process.communicate()[0]
+        sys.stderr.write(messages)
+        compileTime = time.time() - startTime
+
+        if key is None:
+            self.WriteStatistics(compileRun, COMPILER_CACHE_RESULT_NOT_CACHEABLE, compileTime, 0.0)
+        else:
+            self.WriteStatistics(compileRun, COMPILER_CACHE_RESULT_MISS, compileTime, 0.0)
+            if process.returncode == 0:
+                self.Store(key, compileRun, compileTime, messages)
+        return process.returncode
+
+    #-------------------------------------------------------------------------
+    # Append the result of a compile to the statistics file (if any).
+    def WriteStatistics(self, compileRun, result, seconds, compileTime):
+        statisticsFileName = os.environ.get(COMPILER_CACHE_STATS_ENVIRONMENT_VARIABLE)
+        if not statisticsFileName:
+            return
+        # The source files of any run of the tool (assembler files included),
+        # to check that the variant builds compiled them with FIT_ID.
+        inputFileNames = [os.path.basename(argument).lower() for argument in compileRun.Arguments \
+                          if not argument.startswith("-") and os.path.splitext(argument)[1].lower() in COMPILER_CACHE_SOURCE_FILE_EXTENSIONS + ASSEMBLER_SOURCE_FILE_EXTENSIONS]
+        statisticsFile = open(statisticsFileName, 'a')
+        statisticsFile.write(json.dumps({"Result": result, "Source": compileRun.SourceFileName, "Seconds": seconds, "Saved": max(compileTime - seconds, 0.0), \
+                                         "Inputs": inputFileNames, "VariantId": os.environ.get(VARIANT_ID_ENVIRONMENT_VARIABLE) or None}) + "\n")
+        statisticsFile.close()
+
+#-----------------------------------------------------------------------------
+# Write the armcc.bat and ccblkfn.bat shims (and the assembler shims) that
+# run the real tools through the compiler cache to the specified folder.
+def InstallShims(shimsFolder, compilers):
+    if not os.path.exists(shimsFolder):
+        os.makedirs(shimsFolder)
+    for compiler in compilers:
+        shimFileName = os.path.join(shimsFolder, os.path.splitext(os.path.basename(compiler))[0] + ".bat")
+        shimFile = open(shimFileName, 'w')
+        shimFile.write("@\"%s\" \"%s\" \"%s\" %%*\n" % (sys.executable, os.path.abspath(__file__).replace(".pyc", ".py"), compiler))
+        shimFile.close()
+
+#-----------------------------------------------------------------------------
+# Summarize a statistics file written by the compiler cache.
+def SummarizeStatistics(statisticsFileName):
+    counts = {COMPILER_CACHE_RESULT_HIT: 0, COMPILER_CACHE_RESULT_MISS: 0, COMPILER_CACHE_RESULT_NOT_CACHEABLE: 0}
+    savedTime = 0.0
+    if os.path.exists(statisticsFileName):
+        statisticsFile = open(statisticsFileName)
+        for line in statisticsFile:
+            try:
+                statistics = json.loads(line)
+            except ValueError:
+                continue
+            counts[statistics["Result"]] = counts.get(statistics["Result"], 0) + 1
+            savedTime += statistics["Saved"]
+        statisticsFile.close()
+    cacheableCount = counts[COMPILER_CACHE_RESULT_HIT] + counts[COMPILER_CACHE_RESULT_MISS]
+    hitRate = 0.0
+    if cacheableCount:
+        hitRate = 100.0 * counts[COMPILER_CACHE_RESULT_HIT] / cacheableCount
+    return "Compiler cache: %d hits, %d misses (%.0f%% hit rate), %d not cacheable, %.1f seconds saved" % \
+           (counts[COMPILER_CACHE_RESULT_HIT], counts[COMPILER_CACHE_RESULT_MISS], hitRate, counts[COMPILER_CACHE_RESULT_NOT_CACHEABLE], savedTime)
+
+#-----------------------------------------------------------------------------
+# Return the names (lowercase, without their path) of the source files that
+# the wrapped tools compiled or assembled with FIT_ID set to a variant ID,
+# according to a statistics file written by the compiler cache.
+def GetVariantCompiledFileNames(statisticsFileName, variantId):
+    compiledFileNames = set()
+    if not os.path.exists(statisticsFileName):
+        return compiledFileNames
+    statisticsFile = open(statisticsFileName)
+    for line in statisticsFile:
+        try:
+            statistics = json.loads(line)
+        except ValueError:
+            continue
+        if statistics.get("VariantId") == str(variantId):
+            compiledFileNames.update(statistics.get("Inputs", []))
+    statisticsFile.close()
+    return compiledFileNames
+
+#-----------------------------------------------------------------------------
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print "Usage: python FaultInjectionCompilerCache.py <real compiler> <arguments>"
+        sys.exit(1)
+
+    sys.exit(FaultInjectionCompilerCache().Run(sys.argv[1], sys.argv[2:]))
@@ -0,0 +1,250 @@
+#/////////////////////////////////////////////////////////////////////////////
+#/// @file FaultInjectionIncrementalBuild.py
+#///
+#/// This script file contains the incremental build mode of the fault
+#/// injection builds. By default every fault injection build runs the clean
+#/// target before the build target, so all of Apex and of the 1756 module is
+#/// compiled again even though only one to three source files were modified.
+#///
+#/// In the incremental build mode the clean target is not run. Instead, the
+#/// dependency (.d) files written by the compilers next to the object files
+#/// are read and the content hash of every source and header file the
+#/// objects depend on is compared with the hash recorded by the previous
+#/// build. Only the objects that depend on a file whose contents changed
+#/// (the patched files, the files restored by undoing the previous test's
+#/// checkouts, and everything that includes them) are deleted, and the
+#/// remaining objects are touched so that make does not rebuild them just
+#/// because a checkout or uncheckout changed a file's timestamp. An object
+#/// without a dependency file, or with a dependency that cannot be found,
+#/// is always rebuilt.
+#///
+#/// The recorded hashes are saved before make runs, so an object built from
+#/// a patched file by a build that then fails is still rebuilt next time.
+#///
+#/// The build mode is selected with the FIT_BUILD_MODE environment variable
+#/// ("clean", the default, or "incremental"). When FIT_INCREMENTAL_VERIFY_EVERY
+#/// is set to n, every n-th incremental build is followed by a full clean
+#/// build and the object files of both builds are compared.
+#///
+#/// @if REVISION_HISTORY_INCLUDED
+#/// @par Edit History
+#/// agent    18-OCT-2026 Created.
+#/// @endif
+#///
+#/// @par Copyright (c) 2026 Rockwell Automation Technologies, Inc.  All rights reserved.
+#///
+#/////////////////////////////////////////////////////////////////////////////
+
+#-----------------------------------------------------------------------------
+import os         # For path, walk, environ, utime, remove
+import re         # For parsing the dependency files
+import json       # For the incremental build state file
+import FaultInjectionBuildCache  # For GetFileHash
+
+# Define constants that should not change.
+INCREMENTAL_BUILD_STATE_FILE_NAME           = "FaultInjectionIncrementalBuild.json"
+
+INCREMENTAL_BUILD_STATE_VERSION             = 1
+
+BUILD_MODE_ENVIRONMENT_VARIABLE             = "FIT_BUILD_MODE"
+
+BUILD_MODE_CLEAN                            = "clean"
+
+BUILD_MODE_INCREMENTAL                      = "incremental"
+
+VERIFY_INTERVAL_ENVIRONMENT_VARIABLE        = "FIT_INCREMENTAL_VERIFY_EVERY"
+
+OBJECT_FILE_EXTENSIONS                      = [".o", ".doj"]
+
+DEPENDENCY_FILE_EXTENSION                   = ".d"
+
+#-----------------------------------------------------------------------------
+# Return True if the incremental build mode is selected.
+def IsIncrementalBuildMode():
+    buildMode = os.environ.get(BUILD_MODE_ENVIRONMENT_VARIABLE, BUILD_MODE_CLEAN).lower()
+    if buildMode not in [BUILD_MODE_CLEAN, BUILD_MODE_INCREMENTAL]:
+        UnexpectedError = "Invalid %s '%s' (expected '%s' or '%s')" % (BUILD_MODE_ENVIRONMENT_VARIABLE, buildMode, BUILD_MODE_CLEAN, BUILD_MODE_INCREMENTAL)
+        raise RuntimeError, UnexpectedError
+    return buildMode == BUILD_MODE_INCREMENTAL
+
+#-----------------------------------------------------------------------------
+# Return the files listed as prerequisites in a make dependency file, with
+# relative paths resolved against the folder make was run in.
+def ParseDependencyFile(dependencyFileName, makeFolder):
+    dependencyFile = open(dependencyFileName)
+    text = dependencyFile.read()
+    dependencyFile.close()
+
+    dependencies = []
+    for line in re.sub(r"\\\r?\n", " ", text).splitlines():
+        if line.lstrip().startswith("#"):
+            continue
+        # The target ends at the first colon that is not part of a drive letter.
+        separator = re.search(r":(\s|$)", line)
+        if separator is None:
+            continue
+        for dependency in re.split(r"(?<!\\)\s+", line[separator.end():].strip()):
+            if dependency:
+                dependency = dependency.replace("\\ ", " ")
+                if not os.path.isabs(dependency):
+                    dependency = os.path.join(makeFolder, dependency)
+                dependencies.append(os.path.normpath(dependency))
+    return dependencies
+
+# FaultInjectionIncrementalBuild class
+# This class is used to delete only the object files of a product build that
+# depend on files whose contents changed since the previous build.
+class FaultInjectionIncrementalBuild:
+
+    def __init__(self, StateFileName = INCREMENTAL_BUILD_STATE_FILE_NAME, VerifyInterval = None):
+        if VerifyInterval is None:
+            VerifyInterval = int(os.environ.get(VERIFY_INTERVAL_ENVIRONMENT_VARIABLE, 0))
+        self.StateFileName = StateFileName
+        self.VerifyInterval = VerifyInterval
+
+        # Output folder -> {dependency file name -> content hash}.
+        self.Products = None
+
+        # Number of incremental builds, used to schedule the verification.
+        self.BuildCount = 0
+
+    #-------------------------------------------------------------------------
+    # Load the incremental build state file (if any).
+    def Load(self):
+        self.Products = {}
+        self.BuildCount = 0
+        if os.path.exists(self.StateFileName):
+            try:
+                stateFile = open(self.StateFileName)
+                state = json.load(stateFile)
+                stateFile.close()
+                if state.get("Version") == INCREMENTAL_BUILD_STATE_VERSION:
+                    self.Products = state["Products"]
+                    self.BuildCount = state["BuildCount"]
+            except ValueError:
+                # A corrupt state file only means that everything is rebuilt.
+                self.Products = {}
+
+    #-------------------------------------------------------------------------
+    # Save the incremental build state file.
+    def Save(self):
+        stateFolder = os.path.dirname(self.StateFileName)
+        if stateFolder and not os.path.exists(stateFolder):
+            os.makedirs(stateFolder)
+        stateFile = open(self.StateFileName, 'w')
+        json.dump({"Version": INCREMENTAL_BUILD_STATE_VERSION, "BuildCount": self.BuildCount, "Products": self.Products}, stateFile)
+        stateFile.close()
+
+    #-------------------------------------------------------------------------
+    # Return the object files of a product's output folder and the files each
+    # one depends on (None if it has no dependency file).
+    def GetObjects(self, makeFolder, outputFolder):
+        objects = {}
+        for path, folderNames, fileNames in os.walk(outputFolder):
+            for filename in fileNames:
+                baseName, extension = os.path.splitext(filename)
+                if extension.lower() in OBJECT_FILE_EXTENSIONS:
+                    objectFileName = os.path.join(path, filename)
+                    dependencyFileName = os.path.join(path, baseName + DEPENDENCY_FILE_EXTENSION)
+                    if os.path.isfile(dependencyFileName):
+                        objects[objectFileName] = ParseDependencyFile(dependencyFileName, makeFolder)
+                    else:
+                        objects[objectFileName] = None
+        return objects
+
+    #-------------------------------------------------------------------------
+    # Prepare a product's output folder for a build without the clean target:
+    # delete the object files that depend on changed files and touch the
+    # others. The current hashes are recorded before make runs. Returns the
+    # number of deleted and of kept object files.
+    def Prepare(self, makeFolder, outputFolder):
+        if self.Products is None:
+            self.Load()
+        recordedHashes = self.Products.get(os.path.normcase(outputFolder), {})
+        currentHashes = {}
+        deletedCount = 0
+        keptCount = 0
+        for objectFileName, dependencies in self.GetObjects(makeFolder, outputFolder).items():
+            isChanged = dependencies is None
+            for dependency in dependencies or []:
+                if dependency not in currentHashes:
+                    currentHashes[dependency] = FaultInjectionBuildCache.GetFileHash(dependency)
+                if currentHashes[dependency] is None or currentHashes[dependency] != recordedHashes.get(dependency):
+                    isChanged = True
+
+            if isChanged:
+                self.DeleteObject(objectFileName)
+                deletedCount += 1
+            else:
+                os.utime(objectFileName, None)
+                keptCount += 1
+
+        self.Products[os.path.normcase(outputFolder)] = currentHashes
+        self.Save()
+        return (deletedCount, keptCount)
+
+    #-------------------------------------------------------------------------
+    # Record the hashes of the files that the objects of a product's output
+    # folder depend on after a successful build.
+    def Update(self, makeFolder, outputFolder):
+        if self.Products is None:
+            self.Load()
+        currentHashes = {}
+        for dependencies in self.GetObjects(makeFolder, outputFolder).values():
+            for dependency in dependencies or []:
+                if dependency not in currentHashes:
+                    currentHashes[dependency] = FaultInjectionBuildCache.GetFileHash(dependency)
+        self.Products[os.path.normcase(outputFolder)] = currentHashes
+        self.Save()
+
+    #-------------------------------------------------------------------------
+    # Delete every object file of a product's output folder, so that the next
+    # build is a full build.
+    def Clean(self, makeFolder, outputFolder):
+        if self.Products is None:
+            self.Load()
+        for objectFileName in self.GetObjects(makeFolder, outputFolder):
+            self.DeleteObject(objectFileName)
+        self.Products.pop(os.path.normcase(outputFolder), None)
+        self.Save()
+
+    #-------------------------------------------------------------------------
+    # Delete an object file and its dependency file.
+    def DeleteObject(self, objectFileName):
+        os.remove(objectFileName)
+        dependencyFileName = os.path.splitext(objectFileName)[0] + DEPENDENCY_FILE_EXTENSION
+        if os.path.isfile(dependencyFileName):
+            os.remove(dependencyFileName)
+
+    #-------------------------------------------------------------------------
+    # Return the hashes of the object files of a product's output folder,
+    # keyed by their path relative to the output folder.
+    def GetObjectHashes(self, makeFolder, outputFolder):
+        objectHashes = {}
+        for objectFileName in self.GetObjects(makeFolder, outputFolder):
+            objectHashes[os.path.relpath(objectFileName, outputFolder)] = FaultInjectionBuildCache.GetFileHash(objectFileName)
+        return objectHashes
+
+    #-------------------------------------------------------------------------
+    # Count an incremental build. Returns True if it is to be verified
+    # against a full clean build.
+    def CountBuild(self):
+        if self.Products is None:
+            self.Load()
+        self.BuildCount += 1
+        self.Save()
+        return self.VerifyInterval > 0 and self.BuildCount % self.VerifyInterval == 0
+
+#-----------------------------------------------------------------------------
+# Return the differences between the object files of an incremental build
+# and of a clean build of the same product.
+def CompareObjectHashes(incrementalHashes, cleanHashes):
+    differences = []
+    for objectFileName in sorted(set(incrementalHashes.keys()) | set(cleanHashes.keys())):
+        if objectFileName not in cleanHashes:
+            differences.append("%s was only built by the incremental build" % objectFileName)
+        elif objectFileName not in incrementalHashes:
+            differences.append("%s was only built by the clean build" % objectFileName)
+        elif incrementalHashes[objectFileName] != cleanHashes[objectFileName]:
+            differences.append("%s differs from the clean build" % objectFileName)
+    return differences
@@ -0,0 +1,148 @@
+#/////////////////////////////////////////////////////////////////////////////
+#/// @file FaultInjectionJobServer.py
+#///
+#/// This script file contains the job server that shares the machine
+#/// between the make processes of the fault injection builds. Without it,
+#/// every build runs make with one job, and running several fault injection
+#/// script files at once (see FaultInjectionBatchRunner.py) with -j in each
+#/// build would start far more compiles than the machine has processors.
+#///
+#/// The job server is a semaphore with one token per job slot, shared by all
+#/// of the processes of a campaign. Before a build command is run, it takes
+#/// at least one token (waiting for one if necessary) and then as many more
+#/// as are free, up to its share of the slots, and the number of tokens it
+#/// holds is passed to APEX2_Build_Test.bat and Module_Build.bat in the
+#/// FIT_MAKE_JOBS environment variable, which they pass to make as -j. The
+#/// tokens are returned when the build command ends.
+#///
+#/// The ARM make and the VisualDSP gmake-378 are Windows builds of GNU make
+#/// that predate the make jobserver protocol on Windows, so the tokens are
+#/// taken for a whole build command rather than for each compile.
+#///
+#/// The number of slots is the number of processors, or FIT_JOB_SLOTS if it
+#/// is set. When FIT_JOB_SLOT_MEMORY_MB is set, the slots are also limited
+#/// to the available memory divided by that many MB per compile.
+#///
+#/// @if REVISION_HISTORY_INCLUDED
+#/// @par Edit History
+#/// agent    18-OCT-2026 Created.
+#/// agent    18-OCT-2026 A build command can be limited to fewer jobs than
+#///                      its share.
+#/// agent    18-OCT-2026 Build commands are now run through a
+#///                      FaultInjectionBuildExecutor.
+#/// agent    18-OCT-2026 A build command can be given more environment
+#///                      variables.
+#/// @endif
+#///
+#/// @par Copyright (c) 2026 Rockwell Automation Technologies, Inc.  All rights reserved.
+#///
+#/////////////////////////////////////////////////////////////////////////////
+
+#-----------------------------------------------------------------------------
+import os         # For environ, sysconf
+import ctypes     # For GlobalMemoryStatusEx
+import multiprocessing # For Semaphore, cpu_count
+
+# Define constants that should not change.
+JOB_SLOTS_ENVIRONMENT_VARIABLE          = "FIT_JOB_SLOTS"
+
+JOB_SLOT_MEMORY_ENVIRONMENT_VARIABLE    = "FIT_JOB_SLOT_MEMORY_MB"
+
+MAKE_JOBS_ENVIRONMENT_VARIABLE          = "FIT_MAKE_JOBS"
+
+#-----------------------------------------------------------------------------
+# Windows MEMORYSTATUSEX structure, used by GetAvailableMemory().
+class MEMORYSTATUSEX(ctypes.Structure):
+    _fields_ = [("dwLength", ctypes.c_ulong),
+                ("dwMemoryLoad", ctypes.c_ulong),
+                ("ullTotalPhys", ctypes.c_ulonglong),
+                ("ullAvailPhys", ctypes.c_ulonglong),
+                ("ullTotalPageFile", ctypes.c_ulonglong),
+                ("ullAvailPageFile", ctypes.c_ulonglong),
+                ("ullTotalVirtual", ctypes.c_ulonglong),
+                ("ullAvailVirtual", ctypes.c_ulonglong),
+                ("ullAvailExtendedVirtual", ctypes.c_ulonglong)]
+
+#-----------------------------------------------------------------------------
+# Return the available physical memory in bytes, or None if it is unknown.
+def GetAvailableMemory():
+    try:
+        if hasattr(ctypes, "windll"):
+            memoryStatus = MEMORYSTATUSEX()
+            memoryStatus.dwLength = ctypes.sizeof(MEMORYSTATUSEX)
+            if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(memoryStatus)):
+                return memoryStatus.ullAvailPhys
+            return None
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+#-----------------------------------------------------------------------------
+# Return the number of job slots of the machine.
+def GetJobSlotCount():
+    if JOB_SLOTS_ENVIRONMENT_VARIABLE in os.environ:
+        return max(1, int(os.environ[JOB_SLOTS_ENVIRONMENT_VARIABLE]))
+
+    try:
+        slotCount = multiprocessing.cpu_count()
+    except NotImplementedError:
+        slotCount = 1
+
+    memoryPerSlot = int(os.environ.get(JOB_SLOT_MEMORY_ENVIRONMENT_VARIABLE, 0)) * 1024 * 1024
+    availableMemory = GetAvailableMemory()
+    if memoryPerSlot > 0 and availableMemory is not None:
+        slotCount = min(slotCount, int(availableMemory / memoryPerSlot))
+    return max(1, slotCount)
+
+# FaultInjectionJobServer class
+# This class hands out the job slots of the machine to the build commands of
+# the processes it is shared with. ShareCount is the number of processes
+# that run build commands at once, each of which gets at most its share of
+# the slots per build command.
+class FaultInjectionJobServer:
+
+    def __init__(self, SlotCount = None, ShareCount = 1):
+        if SlotCount is None:
+            SlotCount = GetJobSlotCount()
+        self.SlotCount = SlotCount
+        self.ShareCount = ShareCount
+        self.Semaphore = multiprocessing.Semaphore(SlotCount)
+
+    #-------------------------------------------------------------------------
+    # Return the most job slots one build command is given.
+    def GetMaxJobCount(self):
+        return max(1, self.SlotCount / self.ShareCount)
+
+    #-------------------------------------------------------------------------
+    # Take the job slots for a build command: wait for one, then take the
+    # free ones up to the build command's share (or to MaxJobCount, if less).
+    # Returns the number taken.
+    def Acquire(self, maxJobCount = None):
+        if maxJobCount is None or maxJobCount > self.GetMaxJobCount():
+            maxJobCount = self.GetMaxJobCount()
+        self.Semaphore.acquire()
+        jobCount = 1
+        while jobCount < maxJobCount and self.Semaphore.acquire(False):
+            jobCount += 1
+        return jobCount
+
+    #-------------------------------------------------------------------------
+    # Return the job slots taken for a build command.
+    def Release(self, jobCount):
+        for job in range(jobCount):
+            self.Semaphore.release()
+
+    #-------------------------------------------------------------------------
+    # Run a build command through a FaultInjectionBuildExecutor with the job
+    # slots it was given, passed to the build scripts in FIT_MAKE_JOBS, and
+    # with the environment variables in Environment added. Returns the
+    # command's FaultInjectionBuildResult.
+    def RunBuildCommand(self, executor, command, maxJobCount = None, Environment = None):
+        jobCount = self.Acquire(maxJobCount)
+        try:
+            environment = {MAKE_JOBS_ENVIRONMENT_VARIABLE: str(jobCount)}
+            if Environment is not None:
+                environment.update(Environment)
+            return executor.Run(command, environment)
+        finally:
+            self.Release(jobCount)
@@ -0,0 +1,205 @@
+#/////////////////////////////////////////////////////////////////////////////
+#/// @file FaultInjectionManifest.py
+#///
+#/// This script file contains the loader of the fault injection manifest
+#/// files and the patch plan cache.
+#///
+#/// A fault injection manifest file is a JSON alternative to a fault
+#/// injection script file, for example:
+#///     {
+#///         "targetMode"        : "ApexDiag",
+#///         "testTags"          : ["crc"],
+#///         "expectedFault"     : "Firmware binary CRC diagnostic fault",
+#///         "fileModifications" : {
+#///             "ApexDiagnostic.cpp" : [
+#///                 {"point" : 2, "code" : ["crc ^= 1;"]},
+#///                 {"start" : ";; Start Fault Injection Point 3",
+#///                  "end"   : ";; End Fault Injection Point 3",
+#///                  "code"  : "NOP"}
+#///             ]
+#///         }
+#///     }
+#/// A block gives either the point number (and optionally the "comment" that
+#/// precedes the markers, "// " by default) or the exact start and end text
+#/// to search for and replace between. The code is a string or a list of
+#/// lines.
+#///
+#/// Both the manifest files and the file modifications dictionaries of the
+#/// fault injection script files are compiled into a patch plan: file name
+#/// -> list of (start text, end text, replacement code). The patch plans are
+#/// saved to a cache file keyed by the hash of the manifest or script file's
+#/// contents, so the blocks are not split and stripped again until the file
+#/// changes.
+#///
+#/// @if REVISION_HISTORY_INCLUDED
+#/// @par Edit History
+#/// agent    18-OCT-2026 Created.
+#/// agent    18-OCT-2026 Added GetBlocksHash().
+#/// @endif
+#///
+#/// @par Copyright (c) 2026 Rockwell Automation Technologies, Inc.  All rights reserved.
+#///
+#/////////////////////////////////////////////////////////////////////////////
+
+#-----------------------------------------------------------------------------
+import os         # For path
+import json       # For the manifest and patch plan cache files
+import hashlib    # For sha1
+import FaultInjectionPatchEngine # For CompileBlocks
+
+# Define constants that should not change.
+MANIFEST_FILE_PATTERN                   = "*FaultInjectionTest[0-9]*.json"
+
+MANIFEST_FILE_EXTENSION                 = ".json"
+
+MANIFEST_FILE_MODIFICATIONS_NAME        = "fileModifications"
+
+MANIFEST_DEFAULT_MARKER_COMMENT         = "// "
+
+PATCH_PLAN_CACHE_FILE_NAME              = "FaultInjectionPatchPlans.json"
+
+PATCH_PLAN_CACHE_VERSION                = 1
+
+#-----------------------------------------------------------------------------
+# Return the value read from a JSON file with every unicode string converted
+# to the str used by the fault injection script files and source files.
+def EncodeStrings(value):
+    if isinstance(value, unicode):
+        return value.encode("utf-8")
+    if isinstance(value, list):
+        return [EncodeStrings(item) for item in value]
+    if isinstance(value, dict):
+        return dict([(EncodeStrings(key), EncodeStrings(item)) for key, item in value.items()])
+    return value
+
+#-----------------------------------------------------------------------------
+# Compile a fault injection script file's dictionary into a patch plan.
+def CompileDictionary(fileModificationsDictionary):
+    engine = FaultInjectionPatchEngine.FaultInjectionPatchEngine()
+    patchPlan = {}
+    for filename in fileModificationsDictionary:
+        patchPlan[filename] = engine.CompileBlocks(fileModificationsDictionary[filename])
+    return patchPlan
+
+#-----------------------------------------------------------------------------
+# Return the hash of the compiled blocks of one file of a patch plan, which
+# identifies the state the blocks put the file in.
+def GetBlocksHash(compiledBlocks):
+    return hashlib.sha1(json.dumps([list(block) for block in compiledBlocks])).hexdigest()
+
+#-----------------------------------------------------------------------------
+# Compile the file modifications of a manifest file into a patch plan.
+def CompileManifest(manifest, manifestFileName):
+    fileModifications = manifest.get(MANIFEST_FILE_MODIFICATIONS_NAME)
+    if not isinstance(fileModifications, dict):
+        UnexpectedError = "No %s found in %s" % (MANIFEST_FILE_MODIFICATIONS_NAME, manifestFileName)
+        raise RuntimeError, UnexpectedError
+
+    patchPlan = {}
+    for filename in fileModifications:
+        compiledBlocks = []
+        for block in fileModifications[filename]:
+            if "point" in block:
+                comment = block.get("comment", MANIFEST_DEFAULT_MARKER_COMMENT)
+                patternStart = "%s%s Fault Injection Point %d" % (comment, FaultInjectionPatchEngine.FAULT_INJECTION_MARKER_START, block["point"])
+                patternEnd = "%s%s Fault Injection Point %d" % (comment, FaultInjectionPatchEngine.FAULT_INJECTION_MARKER_END, block["point"])
+            elif "start" in block and "end" in block:
+                patternStart = block["start"].strip()
+                patternEnd = block["end"].strip()
+            else:
+                UnexpectedError = "Block of %s in %s has neither a point nor start and end text" % (filename, manifestFileName)
+                raise RuntimeError, UnexpectedError
+
+            code = block.get("code", "")
+            if isinstance(code, list):
+                code = "\n".join(code)
+            compiledBlocks.append((patternStart, patternEnd, code.strip()))
+        patchPlan[filename] = compiledBlocks
+    return patchPlan
+
+#-----------------------------------------------------------------------------
+# Read a manifest file's text. Returns the manifest as a dictionary.
+def LoadManifest(text, manifestFileName):
+    try:
+        manifest = EncodeStrings(json.loads(text))
+    except ValueError as UnexpectedError:
+        UnexpectedError = "Unable to parse %s: %s" % (manifestFileName, UnexpectedError)
+        raise RuntimeError, UnexpectedError
+    if not isinstance(manifest, dict):
+        UnexpectedError = "%s is not a fault injection manifest" % manifestFileName
+        raise RuntimeError, UnexpectedError
+    return manifest
+
+#-----------------------------------------------------------------------------
+# Return True if the file is a fault injection manifest file.
+def IsManifestFile(fileName):
+    return os.path.splitext(fileName)[1].lower() == MANIFEST_FILE_EXTENSION
+
+# FaultInjectionPatchPlanCache class
+# This class keeps the compiled patch plans, keyed by the hash of the
+# contents of the manifest or script file they were compiled from.
+class FaultInjectionPatchPlanCache:
+
+    def __init__(self, CacheFileName = PATCH_PLAN_CACHE_FILE_NAME):
+        self.CacheFileName = CacheFileName
+
+        # Hash of the file's contents -> patch plan.
+        self.Plans = None
+        self.IsCacheChanged = False
+
+        self.CompiledPlanCount = 0
+
+    #-------------------------------------------------------------------------
+    # Load the patch plan cache file (if any).
+    def Load(self):
+        self.Plans = {}
+        if os.path.exists(self.CacheFileName):
+            try:
+                cacheFile = open(self.CacheFileName)
+                cache = json.load(cacheFile)
+                cacheFile.close()
+                if cache.get("Version") == PATCH_PLAN_CACHE_VERSION:
+                    self.Plans = EncodeStrings(cache["Plans"])
+            except ValueError:
+                # A corrupt cache file is simply rebuilt.
+                self.Plans = {}
+
+        # JSON has no tuples, so turn the compiled blocks back into tuples.
+        for contentHash in self.Plans:
+            for filename in self.Plans[contentHash]:
+                self.Plans[contentHash][filename] = [tuple(block) for block in self.Plans[contentHash][filename]]
+
+    #-------------------------------------------------------------------------
+    # Save the patch plan cache file if anything changed.
+    def Save(self):
+        if not self.IsCacheChanged:
+            return
+        cacheFolder = os.path.dirname(self.CacheFileName)
+        if cacheFolder and not os.path.exists(cacheFolder):
+            os.makedirs(cacheFolder)
+        cacheFile = open(self.CacheFileName, 'w')
+        json.dump({"Version": PATCH_PLAN_CACHE_VERSION, "Plans": self.Plans}, cacheFile)
+        cacheFile.close()
+        self.IsCacheChanged = False
+
+    #-------------------------------------------------------------------------
+    # Return the patch plan for the contents hash. On a cache miss, the plan
+    # is compiled by calling compileFunction.
+    def GetPlan(self, contentHash, compileFunction):
+        if self.Plans is None:
+            self.Load()
+        if contentHash not in self.Plans:
+            self.Plans[contentHash] = compileFunction()
+            self.IsCacheChanged = True
+            self.CompiledPlanCount += 1
+        return self.Plans[contentHash]
+
+    #-------------------------------------------------------------------------
+    # Drop the patch plans of all but the specified contents hashes.
+    def Prune(self, contentHashes):
+        if self.Plans is None:
+            self.Load()
+        for contentHash in self.Plans.keys():
+            if contentHash not in contentHashes:
+                del self.Plans[contentHash]
+                self.IsCacheChanged = True
@@ -0,0 +1,571 @@
+#/////////////////////////////////////////////////////////////////////////////
+#/// @file FaultInjectionMultiFault.py
+#///
+#/// This script file contains the planner of the multi-fault images, which
+#/// merge the fault injection script files of one build target into one
+#/// patched tree (see the --multi-fault option of
+#/// FaultInjectionBatchRunner.py). One image is built instead of one build
+#/// per script, and the fault to inject is selected when the image is run,
+#/// by the value of the FaultSelectId variable.
+#///
+#/// Each script merged into an image is given a selector value (1, 2, ...,
+#/// 0 selects no fault). The blocks of the scripts are merged marker by
+#/// marker:
+#///   - A block of statements in a C or C++ source file is guarded by an
+#///         if (FaultSelectId == <selector value>)
+#///     The blocks of several scripts for one marker become an if/else if
+#///     chain, and the code that was between the markers (if any) is kept in
+#///     a final else, so it still runs when none of the scripts is selected.
+#///     Scripts with the same block share one guard.
+#///   - A block of declarations only (C declarations and preprocessor lines,
+#///     or assembler IMPORT/EXPORT lines) cannot be guarded, so it is put in
+#///     the image as it is. That is only harmless if the names it declares
+#///     are used by the script's own guarded blocks only (such as its
+#///     InjectFaultFlag): none of them may be used by the code of the files
+#///     the script modifies. A block that declares anything else (such as a
+#///     static const redefinition that is the fault itself) is shared: it is
+#///     only merged into an image whose every script has the same block, so
+#///     such an image has no fault free selector value. The other scripts
+#///     are put in separate images (or built on their own, or as
+#///     compile-time variants, see below). The declaration blocks of several
+#///     scripts for one marker are put one after the other, unless they
+#///     declare the same names differently, in which case the scripts
+#///     conflict and are put in separate images.
+#///   - Any other block (assembler code, code in a header file, ...) cannot
+#///     be guarded, so its script is built on its own, as is a script that
+#///     replaces code between markers with declarations.
+#///
+#/// FaultSelectId is defined (volatile, so the value set by the lab is
+#/// always read) at a file scope fault injection point of each build target
+#/// that supports multi-fault images (see MULTI_FAULT_SELECTOR_DEFINITIONS).
+#/// Its address is in the map file of the image, where the lab sets the
+#/// selector value before the fault injection delay expires (for example
+#/// with the debugger at startup). Its initial value is FIT_FAULT_SELECT_ID
+#/// (0 by default) when the image is built. The selector values of every
+#/// image are saved to FaultInjectionMultiFaultImages.json in the build
+#/// results folder.
+#///
+#/// The planner also merges the scripts of one build target into
+#/// compile-time variant images (see the --variants option of
+#/// FaultInjectionBatchRunner.py). The patched tree of a variant image is
+#/// checked out and modified once, and then built once per script, with the
+#/// FIT_ID macro set to the script's variant ID (see
+#/// FaultInjectionCompilerCache.py), so that each build holds exactly one
+#/// fault. The blocks of every marker are merged into one conditional:
+#///   - in C and C++ files (headers included) and in the VisualDSP assembler
+#///     files, which are preprocessed like C:
+#///         #if (FIT_ID == 1)
+#///         <block of variant 1>
+#///         #elif (FIT_ID == 2) || (FIT_ID == 3)
+#///         <block shared by variants 2 and 3>
+#///         #else
+#///         <code that was between the markers>
+#///         #endif
+#///   - in the ARM assembler files of Apex, with nested IF (FIT_ID = n) /
+#///     ELSE / ENDIF directives.
+#/// Since only one block of a marker is compiled into each build, any
+#/// blocks (declarations, assembler code, ...) can be merged; only blocks in
+#/// other files (linker files, makefiles, ...) and markers that end at
+#/// different patterns keep a script on its own. The variant IDs of every
+#/// image are saved to FaultInjectionVariantImages.json.
+#///
+#/// @if REVISION_HISTORY_INCLUDED
+#/// @par Edit History
+#/// agent    18-OCT-2026 Created.
+#/// agent    18-OCT-2026 Added the compile-time variant images.
+#/// agent    18-OCT-2026 A line starting with * is only a comment inside a /*
+#///                      ... */ comment, and a block with no code is an empty
+#///                      block of statements rather than a declaration.
+#/// agent    18-OCT-2026 Only the declarations used by a script's own guarded
+#///                      blocks are merged freely; any other declaration
+#///                      block must be the same in every script of its image.
+#/// @endif
+#///
+#/// @par Copyright (c) 2026 Rockwell Automation Technologies, Inc.  All rights reserved.
+#///
+#/////////////////////////////////////////////////////////////////////////////
+
+#-----------------------------------------------------------------------------
+import os         # For path, environ
+import re         # For classifying the lines of the blocks
+import json       # For the selector map file
+import FaultInjectionPatchEngine # For FaultInjectionPatchEngine, FaultInjectionSourceCache
+import FaultInjectionCompilerCache # For VARIANT_ID_MACRO_NAME
+import NextGenFaultInjectionUtils # For TARGET_MODE_EDIT_FOLDERS, BUILD_RESULTS_FOLDER_NAME
+
+# Define constants that should not change.
+FAULT_SELECT_VARIABLE_NAME              = "FaultSelectId"
+
+FAULT_SELECT_ID_ENVIRONMENT_VARIABLE    = "FIT_FAULT_SELECT_ID"
+
+MULTI_FAULT_IMAGE_NAME                  = "%sMultiFaultImage%d"
+
+MULTI_FAULT_REPORT_FILE_NAME            = "FaultInjectionMultiFaultImages.json"
+
+VARIANT_ID_MACRO_NAME                   = FaultInjectionCompilerCache.VARIANT_ID_MACRO_NAME
+
+VARIANT_IMAGE_NAME                      = "%sVariantImage%d"
+
+VARIANT_REPORT_FILE_NAME                = "FaultInjectionVariantImages.json"
+
+# The build targets whose assembler files are assembled by the ARM
+# assembler, which has conditional directives of its own.
+ARM_ASSEMBLER_TARGET_MODES              = ["ApexDiag", "ApexOS"]
+
+CONDITIONAL_SYNTAX_PREPROCESSOR         = "preprocessor"
+
+CONDITIONAL_SYNTAX_ARM_ASSEMBLER        = "armasm"
+
+# Build target -> the file and the file scope fault injection point at which
+# FaultSelectId is defined. The build targets that are not listed have no
+# multi-fault images.
+MULTI_FAULT_SELECTOR_DEFINITIONS        = {"ApexDiag" : ("ApexDiagnostic.cpp", "// Start Fault Injection Point 1", "// End Fault Injection Point 1")}
+
+C_SOURCE_FILE_EXTENSIONS                = [".c", ".cpp"]
+
+C_FILE_EXTENSIONS                       = [".c", ".cpp", ".h", ".hpp"]
+
+ASSEMBLER_FILE_EXTENSIONS               = [".s", ".asm", ".inc"]
+
+BLOCK_KIND_DECLARATION                  = "declaration"
+
+BLOCK_KIND_SHARED_DECLARATION           = "shared declaration"
+
+BLOCK_KIND_STATEMENT                    = "statement"
+
+BLOCK_KIND_UNGUARDABLE                  = "unguardable"
+
+C_COMMENT_PATTERN                       = re.compile(r"^//")
+
+ASSEMBLER_COMMENT_PATTERN               = re.compile(r"^(;|//)")
+
+BLOCK_COMMENT_PATTERN                   = re.compile(r"/\*.*?\*/", re.DOTALL)
+
+C_PREPROCESSOR_PATTERN                  = re.compile(r"^#\s*(define|undef)\s+([A-Za-z_]\w*)|^#")
+
+C_DECLARATION_PATTERN                   = re.compile(r"^(?!(return|goto|delete|throw|case|else|do|break|continue)\b)([A-Za-z_][\w:]*(\s*\*)*\s+)+\**\s*(?P<name>[A-Za-z_]\w*)\s*(\[[^\]]*\])?\s*(=[^;]*)?;$")
+
+ASSEMBLER_DECLARATION_PATTERN           = re.compile(r"^\.?(IMPORT|EXPORT|EXTERN|GLOBAL)\s+([A-Za-z_]\w*)", re.IGNORECASE)
+
+#-----------------------------------------------------------------------------
+# Return the lines of a block's code that are neither blank nor comments.
+# The /* ... */ comments are removed first (keeping their line breaks), so
+# that a line starting with * is only a comment inside one of them (it is a
+# pointer dereference otherwise).
+def GetCodeLines(filename, code):
+    if os.path.splitext(filename)[1].lower() in ASSEMBLER_FILE_EXTENSIONS:
+        commentPattern = ASSEMBLER_COMMENT_PATTERN
+    else:
+        commentPattern = C_COMMENT_PATTERN
+    code = BLOCK_COMMENT_PATTERN.sub(lambda comment: "\n" * comment.group(0).count("\n"), code)
+    return [line.strip() for line in code.splitlines() if line.strip() and not commentPattern.match(line.strip())]
+
+#-----------------------------------------------------------------------------
+# Return the names declared by a line of declarations, or None if the line
+# is not a declaration.
+def GetDeclaredNames(filename, line):
+    extension = os.path.splitext(filename)[1].lower()
+    if extension in ASSEMBLER_FILE_EXTENSIONS:
+        match = ASSEMBLER_DECLARATION_PATTERN.match(line)
+        if match is None:
+            return None
+        return [match.group(2)]
+    if extension in C_FILE_EXTENSIONS:
+        match = C_PREPROCESSOR_PATTERN.match(line)
+        if match is not None:
+            return [name for name in [match.group(2)] if name is not None]
+        match = C_DECLARATION_PATTERN.match(line)
+        if match is not None:
+            return [match.group("name")]
+    return None
+
+#-----------------------------------------------------------------------------
+# Return the kind of a block of a file (see BLOCK_KIND_*). A block with no
+# code only removes the code between its markers, so it is a block of
+# statements (an empty one) in a source file.
+def ClassifyBlock(filename, code):
+    codeLines = GetCodeLines(filename, code)
+    if len(codeLines) != 0 and all([GetDeclaredNames(filename, line) is not None for line in codeLines]):
+        return BLOCK_KIND_DECLARATION
+    if os.path.splitext(filename)[1].lower() in C_SOURCE_FILE_EXTENSIONS:
+        return BLOCK_KIND_STATEMENT
+    return BLOCK_KIND_UNGUARDABLE
+
+#-----------------------------------------------------------------------------
+# Return the names declared by a block of declarations.
+def GetBlockDeclaredNames(filename, code):
+    names = set()
+    for line in GetCodeLines(filename, code):
+        names.update(GetDeclaredNames(filename, line))
+    return names
+
+#-----------------------------------------------------------------------------
+# Return the condition that selects any of the selector values.
+def GetSelectorCondition(selectorValues):
+    conditions = ["(%s == %du)" % (FAULT_SELECT_VARIABLE_NAME, selectorValue) for selectorValue in selectorValues]
+    return " || ".join(conditions)
+
+#-----------------------------------------------------------------------------
+# Return the code of an if/else if chain that runs the code of each block of
+# statements when one of its selector values is selected, and the original
+# code otherwise. StatementBlocks is a list of (code, selector values).
+def GuardStatementBlocks(statementBlocks, originalCode):
+    lines = ["// Fault Injection Selection Start",
+             "{",
+             "    extern volatile unsigned int %s;" % FAULT_SELECT_VARIABLE_NAME]
+    keyword = "if"
+    for code, selectorValues in statementBlocks:
+        lines.append("    %s (%s)" % (keyword, GetSelectorCondition(selectorValues)))
+        lines.append("    {")
+        lines.append(code)
+        lines.append("    }")
+        keyword = "else if"
+    if originalCode.strip():
+        lines.append("    else")
+        lines.append("    {")
+        lines.append(originalCode.strip("\r\n"))
+        lines.append("    }")
+    lines.append("}")
+    lines.append("// Fault Injection Selection End")
+    return "\n".join(lines)
+
+#-----------------------------------------------------------------------------
+# Return the syntax of the conditionals of a build target's file (see
+# CONDITIONAL_SYNTAX_*), or None if the file cannot have conditionals.
+def GetConditionalSyntax(targetMode, filename):
+    extension = os.path.splitext(filename)[1].lower()
+    if extension in C_FILE_EXTENSIONS:
+        return CONDITIONAL_SYNTAX_PREPROCESSOR
+    if extension in ASSEMBLER_FILE_EXTENSIONS:
+        if targetMode in ARM_ASSEMBLER_TARGET_MODES:
+            return CONDITIONAL_SYNTAX_ARM_ASSEMBLER
+        return CONDITIONAL_SYNTAX_PREPROCESSOR
+    return None
+
+#-----------------------------------------------------------------------------
+# Return the condition that selects any of the variant IDs.
+def GetVariantCondition(syntax, variantIds):
+    if syntax == CONDITIONAL_SYNTAX_ARM_ASSEMBLER:
+        conditions = ["(%s = %d)" % (VARIANT_ID_MACRO_NAME, variantId) for variantId in variantIds]
+        return " :LOR: ".join(conditions)
+    conditions = ["(%s == %d)" % (VARIANT_ID_MACRO_NAME, variantId) for variantId in variantIds]
+    return " || ".join(conditions)
+
+#-----------------------------------------------------------------------------
+# Return the code of a conditional that compiles the code of each block when
+# one of its variant IDs is built, and the original code otherwise.
+# VariantBlocks is a list of (code, variant IDs).
+def GuardVariantBlocks(variantBlocks, originalCode, syntax):
+    if syntax == CONDITIONAL_SYNTAX_ARM_ASSEMBLER:
+        # The directives must not start in the first column, which is for labels.
+        lines = ["    ;; Fault Injection Variant Start"]
+        for blockIndex in range(len(variantBlocks)):
+            code, variantIds = variantBlocks[blockIndex]
+            lines.append("    IF %s" % GetVariantCondition(syntax, variantIds))
+            lines.append(code)
+            if blockIndex + 1 < len(variantBlocks) or originalCode.strip():
+                lines.append("    ELSE")
+        if originalCode.strip():
+            lines.append(originalCode.strip("\r\n"))
+        lines.extend(["    ENDIF"] * len(variantBlocks))
+        lines.append("    ;; Fault Injection Variant End")
+        return "\n".join(lines)
+
+    lines = ["// Fault Injection Variant Start"]
+    directive = "#if"
+    for code, variantIds in variantBlocks:
+        lines.append("%s %s" % (directive, GetVariantCondition(syntax, variantIds)))
+        lines.append(code)
+        directive = "#elif"
+    if originalCode.strip():
+        lines.append("#else")
+        lines.append(originalCode.strip("\r\n"))
+    lines.append("#endif")
+    lines.append("// Fault Injection Variant End")
+    return "\n".join(lines)
+
+# FaultInjectionMultiFaultMarker class
+# This class holds the blocks of the scripts of an image for one fault
+# injection point of a file. The blocks of a variant image's marker are
+# merged into a conditional of the specified syntax (see CONDITIONAL_SYNTAX_*).
+class FaultInjectionMultiFaultMarker:
+
+    def __init__(self, Filename, PatternStart, PatternEnd, OriginalCode, ConditionalSyntax = None):
+        self.Filename = Filename
+        self.PatternStart = PatternStart
+        self.PatternEnd = PatternEnd
+        self.OriginalCode = OriginalCode
+        self.ConditionalSyntax = ConditionalSyntax
+
+        # The distinct blocks of declarations, in the order they were added,
+        # and the ones that are shared by every script of the image.
+        self.Declarations = []
+
+        self.SharedDeclarations = []
+
+        # The distinct blocks of statements and their selector values, in
+        # the order they were added.
+        self.Statements = []
+
+    #-------------------------------------------------------------------------
+    # Return the reason why a block cannot be added to the marker, or None.
+    def GetConflict(self, patternEnd, code, kind):
+        if patternEnd != self.PatternEnd:
+            return "'%s' of %s ends at '%s' instead of '%s'" % (self.PatternStart, self.Filename, patternEnd, self.PatternEnd)
+        if kind in [BLOCK_KIND_DECLARATION, BLOCK_KIND_SHARED_DECLARATION] and code not in self.Declarations:
+            names = GetBlockDeclaredNames(self.Filename, code)
+            for declaration in self.Declarations:
+                sharedNames = names & GetBlockDeclaredNames(self.Filename, declaration)
+                if len(sharedNames) != 0:
+                    return "'%s' of %s declares %s differently" % (self.PatternStart, self.Filename, ", ".join(sorted(sharedNames)))
+        return None
+
+    #-------------------------------------------------------------------------
+    # Add a block of a script with the specified selector value.
+    def Add(self, code, kind, selectorValue):
+        if kind in [BLOCK_KIND_DECLARATION, BLOCK_KIND_SHARED_DECLARATION]:
+            if code not in self.Declarations:
+                self.Declarations.append(code)
+            if kind == BLOCK_KIND_SHARED_DECLARATION and code not in self.SharedDeclarations:
+                self.SharedDeclarations.append(code)
+            return
+        for statementCode, selectorValues in self.Statements:
+            if statementCode == code:
+                selectorValues.append(selectorValue)
+                return
+        self.Statements.append((code, [selectorValue]))
+
+    #-------------------------------------------------------------------------
+    # Return the compiled block of the marker.
+    def GetCompiledBlock(self):
+        if self.ConditionalSyntax is not None:
+            return (self.PatternStart, self.PatternEnd, GuardVariantBlocks(self.Statements, self.OriginalCode, self.ConditionalSyntax))
+        pieces = list(self.Declarations)
+        if len(self.Statements) != 0:
+            pieces.append(GuardStatementBlocks(self.Statements, self.OriginalCode))
+        return (self.PatternStart, self.PatternEnd, "\n".join(pieces))
+
+# FaultInjectionMultiFaultImage class
+# This class holds the scripts merged into one multi-fault image (or
+# compile-time variant image) and the merged blocks of their patch plans.
+class FaultInjectionMultiFaultImage:
+
+    def __init__(self, Name, TargetMode, IsVariant = False):
+        self.Name = Name
+        self.TargetMode = TargetMode
+        self.IsVariant = IsVariant
+        if IsVariant:
+            self.SelectorName = VARIANT_ID_MACRO_NAME
+        else:
+            self.SelectorName = FAULT_SELECT_VARIABLE_NAME
+
+        # The selector value (the variant ID of a variant image) and name of
+        # each script, in selector value order.
+        self.Tests = []
+
+        # (file name, start pattern) -> FaultInjectionMultiFaultMarker.
+        self.Markers = {}
+
+    #-------------------------------------------------------------------------
+    # Return the reason why the classified blocks (file name, start pattern,
+    # end pattern, code, kind, original code) of a script cannot be added to
+    # the image, or None.
+    def GetConflict(self, classifiedBlocks):
+        # The shared declarations must be the same in every script.
+        sharedBlocks = [(filename, patternStart, code) for filename, patternStart, patternEnd, code, kind, originalCode in classifiedBlocks if kind == BLOCK_KIND_SHARED_DECLARATION]
+        for (filename, patternStart), marker in sorted(self.Markers.items()):
+            for code in marker.SharedDeclarations:
+                if (filename, patternStart, code) not in sharedBlocks:
+                    return "the other scripts share a declaration block at '%s' of %s" % (patternStart, filename)
+        for filename, patternStart, patternEnd, code, kind, originalCode in classifiedBlocks:
+            marker = self.Markers.get((filename, patternStart))
+            if kind == BLOCK_KIND_SHARED_DECLARATION and len(self.Tests) != 0 and (marker is None or code not in marker.SharedDeclarations):
+                return "'%s' of %s declares names used outside of its guarded blocks, which the other scripts do not" % (patternStart, filename)
+            if marker is not None:
+                conflict = marker.GetConflict(patternEnd, code, kind)
+                if conflict is not None:
+                    return conflict
+        return None
+
+    #-------------------------------------------------------------------------
+    # Add the classified blocks of a script to the image. Returns the
+    # script's selector value.
+    def Add(self, testName, classifiedBlocks):
+        selectorValue = len(self.Tests) + 1
+        self.Tests.append((selectorValue, testName))
+        for filename, patternStart, patternEnd, code, kind, originalCode in classifiedBlocks:
+            if (filename, patternStart) not in self.Markers:
+                conditionalSyntax = None
+                if self.IsVariant:
+                    conditionalSyntax = GetConditionalSyntax(self.TargetMode, filename)
+                self.Markers[(filename, patternStart)] = FaultInjectionMultiFaultMarker(filename, patternStart, patternEnd, originalCode, conditionalSyntax)
+            self.Markers[(filename, patternStart)].Add(code, kind, selectorValue)
+        return selectorValue
+
+    #-------------------------------------------------------------------------
+    # Return the merged patch plan of the image.
+    def GetPatchPlan(self):
+        patchPlan = {}
+        for filename, patternStart in sorted(self.Markers.keys()):
+            patchPlan.setdefault(filename, []).append(self.Markers[(filename, patternStart)].GetCompiledBlock())
+        return patchPlan
+
+# FaultInjectionMultiFaultPlanner class
+# This class merges the fault injection script files of a campaign into
+# multi-fault images, or into compile-time variant images if IsVariant is
+# set.
+class FaultInjectionMultiFaultPlanner:
+
+    def __init__(self, ViewPath, Catalog, SourceCache = None, IsVariant = False):
+        self.ViewPath = ViewPath
+        self.Catalog = Catalog
+        self.IsVariant = IsVariant
+        if SourceCache is None:
+            SourceCache = FaultInjectionPatchEngine.FaultInjectionSourceCache()
+        self.SourceCache = SourceCache
+        self.Engine = FaultInjectionPatchEngine.FaultInjectionPatchEngine()
+
+        # Build target -> its images, in the order they were created.
+        self.Images = {}
+
+        # The scripts that are built on their own and why.
+        self.StandaloneTests = []
+
+    #-------------------------------------------------------------------------
+    # Return the path of a build target's file in the view.
+    def GetViewFileName(self, targetMode, filename):
+        editFolder = self.ViewPath + "\\" + NextGenFaultInjectionUtils.TARGET_MODE_EDIT_FOLDERS[targetMode]
+        fileNameWithPath = self.Catalog.FindFile(editFolder, filename)
+        if fileNameWithPath is None:
+            UnexpectedError = "File '%s' was not found in %s" % (filename, editFolder)
+            raise RuntimeError, UnexpectedError
+        return fileNameWithPath
+
+    #-------------------------------------------------------------------------
+    # Return the code between the markers of a block in the view's file.
+    def GetOriginalCode(self, targetMode, filename, patternStart, patternEnd):
+        fileNameWithPath = self.GetViewFileName(targetMode, filename)
+        text = self.SourceCache.GetText(fileNameWithPath)
+        markerIndex = self.SourceCache.GetMarkerIndex(fileNameWithPath, self.Catalog.GetMarkers(fileNameWithPath))
+        splice = self.Engine.PlanFile(text, [(patternStart, patternEnd, "")], fileNameWithPath, markerIndex)[0]
+        return text[splice.Start + len(patternStart):splice.End - len(patternEnd)]
+
+    #-------------------------------------------------------------------------
+    # Return the blocks of a patch plan with their kind and original code
+    # (see FaultInjectionMultiFaultImage.GetConflict()), and the reason why
+    # the script cannot be merged into an image, or None.
+    def ClassifyPatchPlan(self, targetMode, patchPlan):
+        classifiedBlocks = []
+        for filename in sorted(patchPlan.keys()):
+            for patternStart, patternEnd, code in patchPlan[filename]:
+                if self.IsVariant:
+                    # Every block of a file with conditionals is compiled in
+                    # its variant only.
+                    if GetConditionalSyntax(targetMode, filename) is None:
+                        return (None, "'%s' of %s cannot be made conditional" % (patternStart, filename))
+                    kind = BLOCK_KIND_STATEMENT
+                else:
+                    kind = ClassifyBlock(filename, code)
+                if kind == BLOCK_KIND_UNGUARDABLE:
+                    return (None, "'%s' of %s cannot be guarded" % (patternStart, filename))
+                originalCode = self.GetOriginalCode(targetMode, filename, patternStart, patternEnd)
+                if kind == BLOCK_KIND_DECLARATION and originalCode.strip():
+                    return (None, "'%s' of %s replaces code with declarations" % (patternStart, filename))
+                classifiedBlocks.append((filename, patternStart, patternEnd, code, kind, originalCode))
+
+        # The declarations that are not only used by the script's own guarded
+        # blocks are shared.
+        statementCodes = [code for filename, patternStart, patternEnd, code, kind, originalCode in classifiedBlocks if kind == BLOCK_KIND_STATEMENT]
+        for blockIndex in range(len(classifiedBlocks)):
+            filename, patternStart, patternEnd, code, kind, originalCode = classifiedBlocks[blockIndex]
+            if kind == BLOCK_KIND_DECLARATION and not self.IsPrivateDeclaration(targetMode, patchPlan, filename, code, statementCodes):
+                classifiedBlocks[blockIndex] = (filename, patternStart, patternEnd, code, BLOCK_KIND_SHARED_DECLARATION, originalCode)
+        return (classifiedBlocks, None)
+
+    #-------------------------------------------------------------------------
+    # Return True if every name declared by a block of declarations is used
+    # by the script's blocks of statements (which are guarded) and by none
+    # of the code of the files the script modifies.
+    def IsPrivateDeclaration(self, targetMode, patchPlan, filename, code, statementCodes):
+        for name in GetBlockDeclaredNames(filename, code):
+            namePattern = re.compile(r"\b%s\b" % re.escape(name))
+            if not any([namePattern.search(statementCode) for statementCode in statementCodes]):
+                return False
+            for patchedFilename in patchPlan.keys():
+                if namePattern.search(self.SourceCache.GetText(self.GetViewFileName(targetMode, patchedFilename))):
+                    return False
+        return True
+
+    #-------------------------------------------------------------------------
+    # Create a new image of a build target, with FaultSelectId defined (a
+    # variant image needs no definition, FIT_ID is defined by the compiler).
+    def CreateImage(self, targetMode):
+        images = self.Images.setdefault(targetMode, [])
+        if self.IsVariant:
+            image = FaultInjectionMultiFaultImage(VARIANT_IMAGE_NAME % (targetMode, len(images) + 1), targetMode, True)
+            images.append(image)
+            return image
+        image = FaultInjectionMultiFaultImage(MULTI_FAULT_IMAGE_NAME % (targetMode, len(images) + 1), targetMode)
+        filename, patternStart, patternEnd = MULTI_FAULT_SELECTOR_DEFINITIONS[targetMode]
+        if self.GetOriginalCode(targetMode, filename, patternStart, patternEnd).strip():
+            UnexpectedError = "'%s' of %s is not an empty file scope point, %s cannot be defined there" % (patternStart, filename, FAULT_SELECT_VARIABLE_NAME)
+            raise RuntimeError, UnexpectedError
+        definition = "volatile unsigned int %s = %du;" % (FAULT_SELECT_VARIABLE_NAME, int(os.environ.get(FAULT_SELECT_ID_ENVIRONMENT_VARIABLE, 0)))
+        image.Markers[(filename, patternStart)] = FaultInjectionMultiFaultMarker(filename, patternStart, patternEnd, "")
+        image.Markers[(filename, patternStart)].Add(definition, BLOCK_KIND_DECLARATION, 0)
+        images.append(image)
+        return image
+
+    #-------------------------------------------------------------------------
+    # Add a script to the first image of its build target it does not
+    # conflict with (or to a new image). Returns the image, or None if the
+    # script is built on its own.
+    def AddTest(self, testName, targetMode, patchPlan):
+        if not self.IsVariant and targetMode not in MULTI_FAULT_SELECTOR_DEFINITIONS:
+            self.StandaloneTests.append((testName, "%s has no multi-fault images" % targetMode))
+            return None
+        classifiedBlocks, reason = self.ClassifyPatchPlan(targetMode, patchPlan)
+        if classifiedBlocks is None:
+            self.StandaloneTests.append((testName, reason))
+            return None
+
+        for image in self.Images.get(targetMode, []):
+            if image.GetConflict(classifiedBlocks) is None:
+                image.Add(testName, classifiedBlocks)
+                return image
+        image = self.CreateImage(targetMode)
+        reason = image.GetConflict(classifiedBlocks)
+        if reason is not None:
+            self.Images[targetMode].remove(image)
+            self.StandaloneTests.append((testName, reason))
+            return None
+        image.Add(testName, classifiedBlocks)
+        return image
+
+    #-------------------------------------------------------------------------
+    # Return every image of more than one script. The scripts of the other
+    # images are moved to the scripts built on their own.
+    def GetImages(self):
+        images = []
+        for targetMode in sorted(self.Images.keys()):
+            for image in self.Images[targetMode]:
+                if len(image.Tests) > 1:
+                    images.append(image)
+                else:
+                    self.StandaloneTests.append((image.Tests[0][1], "no other script can be merged with it"))
+        return images
+
+#-----------------------------------------------------------------------------
+# Save the selector value of every script of the images to the build
+# results folder.
+def SaveImageReport(images, ReportFileName = MULTI_FAULT_REPORT_FILE_NAME):
+    if not os.path.exists(NextGenFaultInjectionUtils.BUILD_RESULTS_FOLDER_NAME):
+        os.makedirs(NextGenFaultInjectionUtils.BUILD_RESULTS_FOLDER_NAME)
+    report = {}
+    for image in images:
+        report[image.Name] = {"TargetMode"  : image.TargetMode,
+                              "Selector"    : image.SelectorName,
+                              "Tests"       : dict([(str(selectorValue), testName) for selectorValue, testName in image.Tests])}
+    reportFile = open(NextGenFaultInjectionUtils.BUILD_RESULTS_FOLDER_NAME + "\\" + ReportFileName, 'w')
+    json.dump(report, reportFile, indent = 4, sort_keys = True)
+    reportFile.close()
@@ -0,0 +1,291 @@
+#/////////////////////////////////////////////////////////////////////////////
+#/// @file FaultInjectionOrchestrator.py
+#///
+#/// This script file contains the orchestrator of the fault injection
+#/// utilities, which runs their blocking work concurrently in one process.
+#/// Without it, the ClearCase commands, the folder copies and the build
+#/// commands of a fault injection script file all wait for each other, and
+#/// nothing else can run (or report progress) meanwhile.
+#///
+#/// The orchestrator has bounded pools of threads:
+#///   - the test threads, which run the fault injection script files
+#///     (FIT_TEST_THREADS, 1 by default). More than one test thread is only
+#///     useful when every script is run in its own worktree (see
+#///     FaultInjectionWorktree.py), since scripts run in one view would
+#///     modify each other's files.
+#///   - the VCS threads, which run the ClearCase commands (FIT_VCS_THREADS,
+#///     4 by default), so that no more of them than the view server can take
+#///     run at once.
+#///   - the file threads, which copy the build folders (FIT_FILE_THREADS, 4
+#///     by default).
+#/// The build commands are run as subprocesses whose output is read by
+#/// threads of their own (see FaultInjectionBuildExecutor.py).
+#///
+#/// The progress of the scripts is published as events on an event bus. The
+#/// subscribers are called in order, on a thread of the bus, so a slow
+#/// subscriber never holds up a build. When FIT_EVENT_LOG is set, every
+#/// event is appended to that file as a line of JSON, for live reporting.
+#///
+#/// The fault injection utilities' ModifyAndBuildFaultInjectionFile() is a
+#/// synchronous wrapper that runs the script on a test thread and waits for
+#/// it. Python 2 has no asyncio, so the orchestrator is built on threads and
+#/// queues rather than on coroutines.
+#///
+#/// @if REVISION_HISTORY_INCLUDED
+#/// @par Edit History
+#/// agent    18-OCT-2026 Created.
+#/// agent    18-OCT-2026 Added EVENT_FOLDER_MOVED.
+#/// @endif
+#///
+#/// @par Copyright (c) 2026 Rockwell Automation Technologies, Inc.  All rights reserved.
+#///
+#/////////////////////////////////////////////////////////////////////////////
+
+#-----------------------------------------------------------------------------
+import os         # For environ
+import sys        # For stderr
+import time       # For the time of the events
+import json       # For the event log file
+import Queue      # For the events waiting to be dispatched
+import threading  # For the event dispatcher thread, Lock
+import traceback  # For logging the failure of a subscriber
+import multiprocessing.pool # For ThreadPool
+import FaultInjectionBuildExecutor # For StopEvent
+
+# Define constants that should not change.
+TEST_THREADS_ENVIRONMENT_VARIABLE       = "FIT_TEST_THREADS"
+
+VCS_THREADS_ENVIRONMENT_VARIABLE        = "FIT_VCS_THREADS"
+
+FILE_THREADS_ENVIRONMENT_VARIABLE       = "FIT_FILE_THREADS"
+
+EVENT_LOG_ENVIRONMENT_VARIABLE          = "FIT_EVENT_LOG"
+
+DEFAULT_TEST_THREADS                    = 1
+
+DEFAULT_VCS_THREADS                     = 4
+
+DEFAULT_FILE_THREADS                    = 4
+
+# Waiting for a result without a timeout cannot be interrupted by Ctrl-C.
+OPERATION_TIMEOUT                       = 7 * 24 * 3600
+
+STOP_POLL_INTERVAL                      = 0.1
+
+EVENT_TEST_STARTED                      = "TestStarted"
+
+EVENT_TEST_FINISHED                     = "TestFinished"
+
+EVENT_FILE_MODIFIED                     = "FileModified"
+
+EVENT_BUILD_STEP_STARTED                = "BuildStepStarted"
+
+EVENT_BUILD_STEP_FINISHED               = "BuildStepFinished"
+
+EVENT_BUILD_RESTORED                    = "BuildRestored"
+
+EVENT_FOLDER_COPIED                     = "FolderCopied"
+
+EVENT_FOLDER_MOVED                      = "FolderMoved"
+
+# FaultInjectionEvent class
+# This class describes one event published on the event bus.
+class FaultInjectionEvent:
+
+    def __init__(self, Name, TestName, Data):
+        self.Name = Name
+        self.TestName = TestName
+        self.Data = Data
+        self.Time = time.time()
+
+    #-------------------------------------------------------------------------
+    # Return the event as a dictionary (for the event log file).
+    def ToDictionary(self):
+        return {"Name": self.Name, "TestName": self.TestName, "Time": self.Time, "Data": self.Data}
+
+# FaultInjectionEventBus class
+# This class delivers the published events to their subscribers, in the
+# order they were published, on a thread of its own.
+class FaultInjectionEventBus:
+
+    def __init__(self):
+        # The callbacks and the names of the events they are called for (None
+        # for every event).
+        self.Subscribers = []
+
+        self.Events = Queue.Queue()
+        self.Lock = threading.Lock()
+        self.DispatcherThread = None
+
+    #-------------------------------------------------------------------------
+    # Call a callback with every event published from now on whose name is
+    # one of EventNames (or with every event).
+    def Subscribe(self, callback, EventNames = None):
+        self.Lock.acquire()
+        try:
+            self.Subscribers = self.Subscribers + [(callback, EventNames)]
+        finally:
+            self.Lock.release()
+
+    #-------------------------------------------------------------------------
+    # Stop calling a callback.
+    def Unsubscribe(self, callback):
+        self.Lock.acquire()
+        try:
+            self.Subscribers = [subscriber for subscriber in self.Subscribers if subscriber[0] != callback]
+        finally:
+            self.Lock.release()
+
+    #-------------------------------------------------------------------------
+    # Publish an event of a fault injection script file. Returns at once.
+    def Publish(self, name, testName, **data):
+        self.Lock.acquire()
+        try:
+            if self.DispatcherThread is None:
+                self.DispatcherThread = threading.Thread(target = self.DispatchEvents)
+                self.DispatcherThread.daemon = True
+                self.DispatcherThread.start()
+        finally:
+            self.Lock.release()
+        self.Events.put(FaultInjectionEvent(name, testName, data))
+
+    #-------------------------------------------------------------------------
+    # Wait until every event published so far is delivered.
+    def Flush(self):
+        self.Events.join()
+
+    #-------------------------------------------------------------------------
+    # Deliver the published events to their subscribers. A subscriber that
+    # fails does not stop the others.
+    def DispatchEvents(self):
+        while True:
+            event = self.Events.get()
+            for callback, eventNames in self.Subscribers:
+                if eventNames is None or event.Name in eventNames:
+                    try:
+                        callback(event)
+                    except Exception:
+                        sys.stderr.write("Event subscriber failed on %s:\n%s" % (event.Name, traceback.format_exc()))
+            self.Events.task_done()
+
+# FaultInjectionEventLog class
+# This class is an event bus subscriber that appends every event to a file
+# as a line of JSON.
+class FaultInjectionEventLog:
+
+    def __init__(self, FileName):
+        self.FileName = FileName
+
+    #-------------------------------------------------------------------------
+    # Append an event to the file.
+    def __call__(self, event):
+        eventLogFile = open(self.FileName, 'a')
+        try:
+            eventLogFile.write(json.dumps(event.ToDictionary()) + "\n")
+        finally:
+            eventLogFile.close()
+
+# FaultInjectionOrchestrator class
+# This class runs the fault injection script files and their ClearCase
+# commands and folder copies on its bounded thread pools, and holds the
+# event bus their progress is published on.
+class FaultInjectionOrchestrator:
+
+    def __init__(self, TestThreadCount = None, VcsThreadCount = None, FileThreadCount = None, EventBus = None):
+        if TestThreadCount is None:
+            TestThreadCount = int(os.environ.get(TEST_THREADS_ENVIRONMENT_VARIABLE, DEFAULT_TEST_THREADS))
+        if VcsThreadCount is None:
+            VcsThreadCount = int(os.environ.get(VCS_THREADS_ENVIRONMENT_VARIABLE, DEFAULT_VCS_THREADS))
+        if FileThreadCount is None:
+            FileThreadCount = int(os.environ.get(FILE_THREADS_ENVIRONMENT_VARIABLE, DEFAULT_FILE_THREADS))
+        if EventBus is None:
+            EventBus = FaultInjectionEventBus()
+            if EVENT_LOG_ENVIRONMENT_VARIABLE in os.environ:
+                EventBus.Subscribe(FaultInjectionEventLog(os.environ[EVENT_LOG_ENVIRONMENT_VARIABLE]))
+        self.EventBus = EventBus
+        self.TestPool = multiprocessing.pool.ThreadPool(max(1, TestThreadCount))
+        self.VcsPool = multiprocessing.pool.ThreadPool(max(1, VcsThreadCount))
+        self.FilePool = multiprocessing.pool.ThreadPool(max(1, FileThreadCount))
+
+        # The number of fault injection script files submitted and not done.
+        self.RunningTestCount = 0
+        self.Lock = threading.Lock()
+
+    #-------------------------------------------------------------------------
+    # Return the results of operations submitted to a pool, in order. The
+    # first operation that failed raises its exception.
+    def WaitFor(self, asyncResults):
+        return [asyncResult.get(OPERATION_TIMEOUT) for asyncResult in asyncResults]
+
+    #-------------------------------------------------------------------------
+    # Run a ClearCase command on a VCS thread and return its result.
+    def RunVcsOperation(self, function, *args, **kwargs):
+        return self.VcsPool.apply_async(function, args, kwargs).get(OPERATION_TIMEOUT)
+
+    #-------------------------------------------------------------------------
+    # Start a file operation on a file thread. Returns its AsyncResult (see
+    # WaitFor()).
+    def SubmitFileOperation(self, function, *args, **kwargs):
+        return self.FilePool.apply_async(function, args, kwargs)
+
+    #-------------------------------------------------------------------------
+    # Run a file operation on a file thread and return its result.
+    def RunFileOperation(self, function, *args, **kwargs):
+        return self.WaitFor([self.SubmitFileOperation(function, *args, **kwargs)])[0]
+
+    #-------------------------------------------------------------------------
+    # Run a fault injection script file on a test thread, publishing when it
+    # starts and when it is finished.
+    def RunTest(self, testName, function, args):
+        self.EventBus.Publish(EVENT_TEST_STARTED, testName)
+        startTime = time.time()
+        try:
+            result = function(*args)
+        except Exception as UnexpectedError:
+            self.EventBus.Publish(EVENT_TEST_FINISHED, testName, IsSuccess = False, Duration = time.time() - startTime, Error = str(UnexpectedError))
+            raise
+        self.EventBus.Publish(EVENT_TEST_FINISHED, testName, IsSuccess = True, Duration = time.time() - startTime)
+        return result
+
+    #-------------------------------------------------------------------------
+    # Start a fault injection script file (a function and its arguments) on
+    # a test thread. Returns its AsyncResult (see WaitForTest()).
+    def SubmitTest(self, testName, function, *args):
+        self.Lock.acquire()
+        try:
+            if self.RunningTestCount == 0:
+                # A stop requested for the previous scripts is over.
+                FaultInjectionBuildExecutor.StopEvent.clear()
+            self.RunningTestCount += 1
+        finally:
+            self.Lock.release()
+        return self.TestPool.apply_async(self.RunTest, (testName, function, args), callback = self.EndTest)
+
+    #-------------------------------------------------------------------------
+    # Count a fault injection script file as done. Only called for the ones
+    # that succeeded, see WaitForTest() for the others.
+    def EndTest(self, result):
+        self.Lock.acquire()
+        try:
+            self.RunningTestCount -= 1
+        finally:
+            self.Lock.release()
+
+    #-------------------------------------------------------------------------
+    # Wait for a fault injection script file to be done and return its
+    # result (or raise its exception). On Ctrl-C, its build command is
+    # stopped and it is still waited for, so that it can undo its checkouts.
+    def WaitForTest(self, asyncResult):
+        try:
+            try:
+                return asyncResult.get(OPERATION_TIMEOUT)
+            except KeyboardInterrupt:
+                FaultInjectionBuildExecutor.StopEvent.set()
+                # The interrupted wait leaves the result's condition unusable.
+                while not asyncResult.ready():
+                    time.sleep(STOP_POLL_INTERVAL)
+                raise
+        finally:
+            if asyncResult.ready() and not asyncResult.successful():
+                self.EndTest(None)
+            self.EventBus.Flush()
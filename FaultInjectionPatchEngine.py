@@ -0,0 +1,251 @@
+#/////////////////////////////////////////////////////////////////////////////
+#/// @file FaultInjectionPatchEngine.py
+#///
+#/// This script file contains the patch engine used by the fault injection
+#/// utilities to apply the blocks of a fault injection script file's
+#/// dictionary to a source file.
+#///
+#/// The source file is scanned once and an index of every "Start Fault
+#/// Injection Point N" / "End Fault Injection Point N" marker is built with
+#/// the byte offset of each marker. Every block for the file is then located
+#/// through that index and all of the blocks are applied as one ordered list
+#/// of splices, so the file is copied only once no matter how many blocks
+#/// are applied to it. A block whose start pattern matches more than once in
+#/// the file, or whose region overlaps the region of another block, is
+#/// rejected instead of being applied.
+#///
+#/// @if REVISION_HISTORY_INCLUDED
+#/// @par Edit History
+#/// agent    18-OCT-2026 Created.
+#/// agent    18-OCT-2026 Added CompileBlocks() and
+#///                      ModifyFileWithCompiledBlocks(). PlanFile() now takes
+#///                      compiled blocks.
+#/// @endif
+#///
+#/// @par Copyright (c) 2026 Rockwell Automation Technologies, Inc.  All rights reserved.
+#///
+#/////////////////////////////////////////////////////////////////////////////
+
+#-----------------------------------------------------------------------------
+import re         # For marker scanning
+
+# Define constants that should not change.
+FAULT_INJECTION_MARKER_PATTERN = re.compile(r"(Start|End) Fault Injection Point (\d+)")
+
+FAULT_INJECTION_MARKER_START   = "Start"
+
+FAULT_INJECTION_MARKER_END     = "End"
+
+# FaultInjectionMarkerIndex class
+# This class holds the offsets of every fault injection marker in a file's
+# text. The text is scanned only once, when the index is created. If the
+# markers are already known (for example from the fault injection point
+# catalog), they are checked against the text instead of scanning it.
+class FaultInjectionMarkerIndex:
+
+    def __init__(self, text, markers = None):
+        self.Text = text
+
+        # Point number -> list of byte offsets of the marker text, in file order.
+        self.StartOffsets = {}
+        self.EndOffsets = {}
+
+        if markers is not None and self.AddKnownMarkers(markers):
+            return
+
+        self.StartOffsets = {}
+        self.EndOffsets = {}
+        for match in FAULT_INJECTION_MARKER_PATTERN.finditer(text):
+            if match.group(1) == FAULT_INJECTION_MARKER_START:
+                self.StartOffsets.setdefault(match.group(2), []).append(match.start())
+            else:
+                self.EndOffsets.setdefault(match.group(2), []).append(match.start())
+
+    #-------------------------------------------------------------------------
+    # Add the known (kind, point, offset) markers to the index. Returns False
+    # if any of them no longer matches the text, in which case the caller
+    # must scan the text instead.
+    def AddKnownMarkers(self, markers):
+        for kind, point, offset in markers:
+            if not self.Text.startswith("%s Fault Injection Point %s" % (kind, point), offset):
+                return False
+            if kind == FAULT_INJECTION_MARKER_START:
+                self.StartOffsets.setdefault(point, []).append(offset)
+            else:
+                self.EndOffsets.setdefault(point, []).append(offset)
+        return True
+
+    #-------------------------------------------------------------------------
+    # Return the offsets at which the specified pattern starts in the text.
+    # If the pattern contains a fault injection marker, only the indexed
+    # markers are checked. Otherwise the text is searched for the pattern.
+    def FindPattern(self, pattern, fromOffset):
+        match = FAULT_INJECTION_MARKER_PATTERN.search(pattern)
+        if match is None:
+            offsets = []
+            offset = self.Text.find(pattern, fromOffset)
+            while offset >= 0:
+                offsets.append(offset)
+                offset = self.Text.find(pattern, offset + 1)
+            return offsets
+
+        if match.group(1) == FAULT_INJECTION_MARKER_START:
+            markerOffsets = self.StartOffsets.get(match.group(2), [])
+        else:
+            markerOffsets = self.EndOffsets.get(match.group(2), [])
+
+        # The marker text is preceded by the comment prefix of the pattern
+        # (for example "// " or ";;"), so back up by the prefix length.
+        prefixLength = match.start()
+        offsets = []
+        for markerOffset in markerOffsets:
+            offset = markerOffset - prefixLength
+            if offset >= fromOffset and self.Text.startswith(pattern, offset):
+                offsets.append(offset)
+        return offsets
+
+# FaultInjectionSplice class
+# This class describes one region of a file to be replaced by a block.
+class FaultInjectionSplice:
+
+    def __init__(self, start, end, replacement, patternStart):
+        self.Start = start
+        self.End = end
+        self.Replacement = replacement
+        self.PatternStart = patternStart
+
+# FaultInjectionPatchEngine class
+# This class is used to apply fault injection blocks to source files.
+class FaultInjectionPatchEngine:
+
+    #-------------------------------------------------------------------------
+    # Split a block from a fault injection script file's dictionary into its
+    # start pattern, end pattern and replacement code. The first two lines of
+    # the block are the start and end text to search for and replace between.
+    def ParseBlock(self, newblock):
+        newblock = newblock.strip()
+        patternStart = newblock.split('\n')[0]
+        patternEnd   = newblock.split('\n')[1]
+        patternEnd   = patternEnd.strip()
+        newblock_woPattern = newblock.replace(patternStart,'')
+        newblock_woPattern = newblock_woPattern.replace(patternEnd,'')
+        newblock_woPattern = newblock_woPattern.strip()
+        return (patternStart, patternEnd, newblock_woPattern)
+
+    #-------------------------------------------------------------------------
+    # Split every block of a file into its start pattern, end pattern and
+    # replacement code (see ParseBlock).
+    def CompileBlocks(self, blocks):
+        return [self.ParseBlock(newblock) for newblock in blocks]
+
+    #-------------------------------------------------------------------------
+    # Locate the region of every compiled block (start pattern, end pattern,
+    # replacement code) in the text and return the ordered list of splices.
+    # An error is raised if a pattern is not found, if a start pattern is
+    # found more than once or if two regions overlap.
+    def PlanFile(self, text, compiledBlocks, fileNameWithPath, markerIndex = None):
+        if markerIndex is None:
+            markerIndex = FaultInjectionMarkerIndex(text)
+
+        # Use the line ending of the file for the inserted code.
+        if "\r\n" in text:
+            newline = "\r\n"
+        else:
+            newline = "\n"
+
+        splices = []
+        for patternStart, patternEnd, replacement in compiledBlocks:
+
+            startOffsets = markerIndex.FindPattern(patternStart, 0)
+            if len(startOffsets) == 0:
+                UnexpectedError = "Search pattern '%s' not found in %s" % (patternStart, fileNameWithPath)
+                raise RuntimeError, UnexpectedError
+            if len(startOffsets) > 1:
+                UnexpectedError = "Search pattern '%s' found %d times in %s" % (patternStart, len(startOffsets), fileNameWithPath)
+                raise RuntimeError, UnexpectedError
+            start = startOffsets[0]
+
+            endOffsets = markerIndex.FindPattern(patternEnd, start)
+            if len(endOffsets) == 0:
+                UnexpectedError = "Search pattern '%s' not found in %s" % (patternEnd, fileNameWithPath)
+                raise RuntimeError, UnexpectedError
+            end = endOffsets[0] + len(patternEnd)
+
+            replacement = replacement.replace("\r\n", "\n").replace("\n", newline)
+            splices.append(FaultInjectionSplice(start, end, replacement, patternStart))
+
+        # Apply the splices in file order and make sure that no two overlap.
+        splices.sort(key = lambda splice: splice.Start)
+        for spliceIndex in range(1, len(splices)):
+            if splices[spliceIndex].Start < splices[spliceIndex - 1].End:
+                UnexpectedError = "Blocks '%s' and '%s' overlap in %s" % \
+                    (splices[spliceIndex - 1].PatternStart, splices[spliceIndex].PatternStart, fileNameWithPath)
+                raise RuntimeError, UnexpectedError
+
+        return splices
+
+    #-------------------------------------------------------------------------
+    # Apply an ordered list of splices to the text in a single pass.
+    def ApplyPlan(self, text, splices):
+        pieces = []
+        position = 0
+        for splice in splices:
+            pieces.append(text[position:splice.Start])
+            pieces.append(splice.Replacement)
+            position = splice.End
+        pieces.append(text[position:])
+        return "".join(pieces)
+
+    #-------------------------------------------------------------------------
+    # Modify the file with all of the blocks specified for it. The optional
+    # markers are the (kind, point, offset) markers already known for the file.
+    def ModifyFile(self, fileNameWithPath, blocks, markers = None):
+        self.ModifyFileWithCompiledBlocks(fileNameWithPath, self.CompileBlocks(blocks), markers)
+
+    #-------------------------------------------------------------------------
+    # Modify the file with all of the compiled blocks specified for it (for
+    # example from a FaultInjectionManifest patch plan).
+    def ModifyFileWithCompiledBlocks(self, fileNameWithPath, compiledBlocks, markers = None):
+        fileToEdit = open(fileNameWithPath, 'rb')
+        text = fileToEdit.read()
+        fileToEdit.close()
+
+        markerIndex = FaultInjectionMarkerIndex(text, markers)
+        text = self.ApplyPlan(text, self.PlanFile(text, compiledBlocks, fileNameWithPath, markerIndex))
+
+        fileToEdit = open(fileNameWithPath, 'wb')
+        fileToEdit.write(text)
+        fileToEdit.close()
+
+# FaultInjectionSourceCache class
+# This class keeps the text and marker index of every source file that has
+# been read, so that files shared by several fault injection script files
+# are only read and scanned once.
+class FaultInjectionSourceCache:
+
+    def __init__(self):
+        self.Texts = {}
+        self.MarkerIndexes = {}
+
+    #-------------------------------------------------------------------------
+    # Return the text of the file.
+    def GetText(self, fileNameWithPath):
+        if fileNameWithPath not in self.Texts:
+            sourceFile = open(fileNameWithPath, 'rb')
+            self.Texts[fileNameWithPath] = sourceFile.read()
+            sourceFile.close()
+        return self.Texts[fileNameWithPath]
+
+    #-------------------------------------------------------------------------
+    # Return the marker index of the file. The optional markers are the
+    # (kind, point, offset) markers already known for the file.
+    def GetMarkerIndex(self, fileNameWithPath, markers = None):
+        if fileNameWithPath not in self.MarkerIndexes:
+            self.MarkerIndexes[fileNameWithPath] = FaultInjectionMarkerIndex(self.GetText(fileNameWithPath), markers)
+        return self.MarkerIndexes[fileNameWithPath]
+
+    #-------------------------------------------------------------------------
+    # Forget the file, for example after it has been modified.
+    def Forget(self, fileNameWithPath):
+        self.Texts.pop(fileNameWithPath, None)
+        self.MarkerIndexes.pop(fileNameWithPath, None)
@@ -0,0 +1,122 @@
+#/////////////////////////////////////////////////////////////////////////////
+#/// @file FaultInjectionResourcePool.py
+#///
+#/// This script file contains the named resource pools of the fault
+#/// injection builds, such as the seats of the license-limited ARM and
+#/// VisualDSP compilers. When fault injection script files are built in
+#/// parallel (see FaultInjectionBatchRunner.py), more compiles than there are
+#/// license seats would otherwise fail or stall waiting for a seat.
+#///
+#/// Each build step declares the pool it uses. A step is only started once a
+#/// seat of its pool is free. The waiting steps are admitted in priority
+#/// order (lowest first, then first come first served). A step that is
+#/// admitted takes up to as many seats as make jobs it may run, and runs
+#/// make with no more jobs than it has seats.
+#///
+#/// The pools and their seats are set with the FIT_RESOURCE_POOLS
+#/// environment variable, for example "arm_cc=4, vdsp_gmake=2". A pool that
+#/// is not listed is unlimited. The worker processes of a parallel campaign
+#/// share the pools through a FaultInjectionResourcePoolManager, which is the
+#/// local counting semaphore service that stands in for the license server.
+#///
+#/// @if REVISION_HISTORY_INCLUDED
+#/// @par Edit History
+#/// agent    18-OCT-2026 Created.
+#/// @endif
+#///
+#/// @par Copyright (c) 2026 Rockwell Automation Technologies, Inc.  All rights reserved.
+#///
+#/////////////////////////////////////////////////////////////////////////////
+
+#-----------------------------------------------------------------------------
+import os         # For environ
+import threading  # For Condition
+import multiprocessing.managers # For BaseManager
+
+# Define constants that should not change.
+RESOURCE_POOLS_ENVIRONMENT_VARIABLE     = "FIT_RESOURCE_POOLS"
+
+#-----------------------------------------------------------------------------
+# Return the pools and their seats of a pool specification such as
+# "arm_cc=4, vdsp_gmake=2".
+def ParsePoolSpecification(specification):
+    pools = {}
+    for pool in specification.split(","):
+        if not pool.strip():
+            continue
+        name, separator, seats = pool.partition("=")
+        try:
+            if not separator or not name.strip() or int(seats) < 1:
+                raise ValueError
+            pools[name.strip()] = int(seats)
+        except ValueError:
+            UnexpectedError = "Invalid resource pool '%s' in %s (expected name=seats)" % (pool.strip(), RESOURCE_POOLS_ENVIRONMENT_VARIABLE)
+            raise RuntimeError, UnexpectedError
+    return pools
+
+# FaultInjectionResourcePools class
+# This class holds the free seats of the named resource pools and admits the
+# build steps waiting for them in priority order.
+class FaultInjectionResourcePools:
+
+    def __init__(self, Pools = None):
+        if Pools is None:
+            Pools = ParsePoolSpecification(os.environ.get(RESOURCE_POOLS_ENVIRONMENT_VARIABLE, ""))
+        self.Pools = Pools
+        self.FreeSeats = dict(Pools)
+
+        # Pool name -> sorted list of the (priority, sequence number) of the
+        # waiting build steps.
+        self.Waiting = dict([(name, []) for name in Pools])
+
+        self.SequenceNumber = 0
+        self.Condition = threading.Condition()
+
+    #-------------------------------------------------------------------------
+    # Return the pools and their seats.
+    def GetPools(self):
+        return dict(self.Pools)
+
+    #-------------------------------------------------------------------------
+    # Wait until a build step of the specified priority is admitted to a
+    # pool, then take up to MaxSeats of its free seats. Returns the number of
+    # seats taken (MaxSeats for a pool that is not limited).
+    def Acquire(self, poolName, priority, maxSeats):
+        if poolName not in self.Pools:
+            return maxSeats
+        self.Condition.acquire()
+        try:
+            self.SequenceNumber += 1
+            waiter = (priority, self.SequenceNumber)
+            self.Waiting[poolName].append(waiter)
+            self.Waiting[poolName].sort()
+            while self.Waiting[poolName][0] != waiter or self.FreeSeats[poolName] == 0:
+                self.Condition.wait()
+            self.Waiting[poolName].pop(0)
+            seats = min(self.FreeSeats[poolName], max(1, maxSeats))
+            self.FreeSeats[poolName] -= seats
+            # The next waiting step may be admitted to the seats left.
+            self.Condition.notifyAll()
+            return seats
+        finally:
+            self.Condition.release()
+
+    #-------------------------------------------------------------------------
+    # Return the seats taken by a build step to its pool.
+    def Release(self, poolName, seats):
+        if poolName not in self.Pools:
+            return
+        self.Condition.acquire()
+        try:
+            self.FreeSeats[poolName] += seats
+            self.Condition.notifyAll()
+        finally:
+            self.Condition.release()
+
+# FaultInjectionResourcePoolManager class
+# This class serves one FaultInjectionResourcePools to the worker processes
+# of a parallel campaign.
+class FaultInjectionResourcePoolManager(multiprocessing.managers.BaseManager):
+    pass
+
+FaultInjectionResourcePoolManager.register("FaultInjectionResourcePools", FaultInjectionResourcePools)
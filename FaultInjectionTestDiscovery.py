@@ -0,0 +1,248 @@
+#/////////////////////////////////////////////////////////////////////////////
+#/// @file FaultInjectionTestDiscovery.py
+#///
+#/// This script file contains the discovery of the fault injection script
+#/// files. A fault injection script file is a module that only defines:
+#///     targetMode                  - the build target (for example ApexDiag)
+#///     fileModificationsDictionary - the files and blocks to be modified
+#///     testTags                    - optional list of tags
+#///     expectedFault               - optional description of the fault that
+#///                                   the test firmware is expected to report
+#/// and only builds the test firmware under 'if __name__ == "__main__":', so
+#/// it can be imported without checking out or building anything.
+#///
+#/// Fault injection manifest files (see FaultInjectionManifest.py) are
+#/// discovered along with the script files.
+#///
+#/// The fault injection script files are imported only when they are not
+#/// already in the test spec cache, which is saved to a file and keyed by
+#/// the hash of each script file's contents. Enumerating the scripts of a
+#/// folder that has not changed only reads and hashes the files.
+#///
+#/// @if REVISION_HISTORY_INCLUDED
+#/// @par Edit History
+#/// agent    18-OCT-2026 Created.
+#/// agent    18-OCT-2026 Added fault injection manifest files and the patch
+#///                      plan cache.
+#/// agent    18-OCT-2026 Only assignments of literal values to names are
+#///                      allowed at module level.
+#/// @endif
+#///
+#/// @par Copyright (c) 2026 Rockwell Automation Technologies, Inc.  All rights reserved.
+#///
+#/////////////////////////////////////////////////////////////////////////////
+
+#-----------------------------------------------------------------------------
+import os         # For path
+import sys        # For modules
+import ast        # For checking that a script can be imported
+import imp        # For load_source
+import glob       # For finding the fault injection script files
+import json       # For the test spec cache file
+import hashlib    # For sha1
+import FaultInjectionManifest    # For LoadManifest, FaultInjectionPatchPlanCache
+
+# Define constants that should not change.
+TEST_SPEC_CACHE_FILE_NAME               = "FaultInjectionTests.json"
+
+TEST_SPEC_CACHE_VERSION                 = 1
+
+FAULT_INJECTION_SCRIPT_FILE_PATTERN     = "*FaultInjectionTest[0-9]*.py"
+
+FILE_MODIFICATIONS_DICTIONARY_NAME      = "fileModificationsDictionary"
+
+TARGET_MODE_NAME                        = "targetMode"
+
+TEST_TAGS_NAME                          = "testTags"
+
+EXPECTED_FAULT_NAME                     = "expectedFault"
+
+LITERAL_NAMES                           = ["True", "False", "None"]
+
+#-----------------------------------------------------------------------------
+# Return True if an expression of a fault injection script file is a
+# literal (a string, a number, True, False, None, or a dictionary, list or
+# tuple of literals), which cannot run any code when it is evaluated.
+def IsLiteral(node):
+    if isinstance(node, (ast.Str, ast.Num)):
+        return True
+    if isinstance(node, ast.Name):
+        return node.id in LITERAL_NAMES
+    if isinstance(node, ast.Dict):
+        return all([IsLiteral(item) for item in node.keys + node.values])
+    if isinstance(node, (ast.List, ast.Tuple)):
+        return all([IsLiteral(item) for item in node.elts])
+    return False
+
+# FaultInjectionTestSpec class
+# This class describes one fault injection script file. Problems lists the
+# reasons the script could not be loaded, if any.
+class FaultInjectionTestSpec:
+
+    def __init__(self, FileName, Hash, TargetMode = None, FileModificationsDictionary = None, TestTags = [], ExpectedFault = None, Problems = []):
+        self.FileName = FileName
+        self.TestName = os.path.basename(FileName)
+        self.Hash = Hash
+        self.TargetMode = TargetMode
+        self.FileModificationsDictionary = FileModificationsDictionary
+        self.TestTags = list(TestTags)
+        self.ExpectedFault = ExpectedFault
+        self.Problems = list(Problems)
+
+        # File name -> list of (start text, end text, replacement code), see
+        # FaultInjectionManifest. None if the spec could not be loaded.
+        self.PatchPlan = None
+
+# FaultInjectionTestDiscovery class
+# This class is used to find and load the fault injection script files.
+class FaultInjectionTestDiscovery:
+
+    def __init__(self, CacheFileName = TEST_SPEC_CACHE_FILE_NAME, PlanCacheFileName = FaultInjectionManifest.PATCH_PLAN_CACHE_FILE_NAME):
+        self.CacheFileName = CacheFileName
+        self.PlanCache = FaultInjectionManifest.FaultInjectionPatchPlanCache(PlanCacheFileName)
+
+        # Hash of the script file's contents -> {"TargetMode",
+        # "FileModificationsDictionary", "TestTags", "ExpectedFault"}.
+        self.Specs = None
+        self.IsCacheChanged = False
+
+        self.ImportedFileCount = 0
+
+    #-------------------------------------------------------------------------
+    # Load the test spec cache file (if any).
+    def LoadCache(self):
+        self.Specs = {}
+        if os.path.exists(self.CacheFileName):
+            try:
+                cacheFile = open(self.CacheFileName)
+                cache = json.load(cacheFile)
+                cacheFile.close()
+                if cache.get("Version") == TEST_SPEC_CACHE_VERSION:
+                    self.Specs = FaultInjectionManifest.EncodeStrings(cache["Specs"])
+            except ValueError:
+                # A corrupt cache file is simply rebuilt.
+                self.Specs = {}
+
+    #-------------------------------------------------------------------------
+    # Save the test spec cache file if anything changed.
+    def SaveCache(self):
+        if not self.IsCacheChanged:
+            return
+        cacheFolder = os.path.dirname(self.CacheFileName)
+        if cacheFolder and not os.path.exists(cacheFolder):
+            os.makedirs(cacheFolder)
+        cacheFile = open(self.CacheFileName, 'w')
+        json.dump({"Version": TEST_SPEC_CACHE_VERSION, "Specs": self.Specs}, cacheFile)
+        cacheFile.close()
+        self.IsCacheChanged = False
+
+    #-------------------------------------------------------------------------
+    # Make sure that the module level code of a fault injection script file
+    # only imports modules and assigns literals to names, so that importing
+    # it cannot check out or build anything.
+    def CheckModule(self, text, testFileName):
+        for node in ast.parse(text, testFileName).body:
+            if isinstance(node, (ast.Import, ast.ImportFrom)):
+                continue
+            if isinstance(node, ast.Assign) and all([isinstance(target, ast.Name) for target in node.targets]) and IsLiteral(node.value):
+                continue
+            if isinstance(node, ast.Expr) and isinstance(node.value, ast.Str):
+                continue
+            if isinstance(node, ast.If) and isinstance(node.test, ast.Compare) and \
+               isinstance(node.test.left, ast.Name) and node.test.left.id == "__name__":
+                continue
+            UnexpectedError = "%s runs code at line %d when it is imported (the build must only run under 'if __name__ == \"__main__\":')" % (testFileName, node.lineno)
+            raise RuntimeError, UnexpectedError
+
+    #-------------------------------------------------------------------------
+    # Import a fault injection script file and return its spec values.
+    def ImportSpec(self, testFileName):
+        moduleName = "FaultInjectionTest_" + os.path.splitext(os.path.basename(testFileName))[0]
+        try:
+            module = imp.load_source(moduleName, testFileName)
+        finally:
+            sys.modules.pop(moduleName, None)
+        self.ImportedFileCount += 1
+
+        if not hasattr(module, FILE_MODIFICATIONS_DICTIONARY_NAME):
+            UnexpectedError = "No %s found in %s" % (FILE_MODIFICATIONS_DICTIONARY_NAME, testFileName)
+            raise RuntimeError, UnexpectedError
+
+        return {"TargetMode"                  : getattr(module, TARGET_MODE_NAME, None),
+                "FileModificationsDictionary" : getattr(module, FILE_MODIFICATIONS_DICTIONARY_NAME),
+                "TestTags"                    : list(getattr(module, TEST_TAGS_NAME, [])),
+                "ExpectedFault"               : getattr(module, EXPECTED_FAULT_NAME, None)}
+
+    #-------------------------------------------------------------------------
+    # Read a fault injection manifest file and return its spec values.
+    def ReadManifestSpec(self, text, manifestFileName):
+        manifest = FaultInjectionManifest.LoadManifest(text, manifestFileName)
+        return {"TargetMode"                  : manifest.get(TARGET_MODE_NAME),
+                "FileModificationsDictionary" : None,
+                "TestTags"                    : list(manifest.get(TEST_TAGS_NAME, [])),
+                "ExpectedFault"               : manifest.get(EXPECTED_FAULT_NAME)}
+
+    #-------------------------------------------------------------------------
+    # Return the spec of a fault injection script or manifest file. A script
+    # file is only imported if its contents are not in the test spec cache,
+    # and its blocks are only compiled if they are not in the patch plan
+    # cache. If the file cannot be loaded, the returned spec lists the
+    # problems.
+    def GetSpec(self, testFileName):
+        if self.Specs is None:
+            self.LoadCache()
+
+        testFile = open(testFileName, 'rb')
+        text = testFile.read()
+        testFile.close()
+        fileHash = hashlib.sha1(text).hexdigest()
+        isManifest = FaultInjectionManifest.IsManifestFile(testFileName)
+
+        try:
+            if fileHash not in self.Specs:
+                if isManifest:
+                    self.Specs[fileHash] = self.ReadManifestSpec(text, testFileName)
+                else:
+                    self.CheckModule(text.replace("\r\n", "\n"), testFileName)
+                    self.Specs[fileHash] = self.ImportSpec(testFileName)
+                self.IsCacheChanged = True
+            values = self.Specs[fileHash]
+
+            if isManifest:
+                patchPlan = self.PlanCache.GetPlan(fileHash, lambda: FaultInjectionManifest.CompileManifest(FaultInjectionManifest.LoadManifest(text, testFileName), testFileName))
+            else:
+                patchPlan = self.PlanCache.GetPlan(fileHash, lambda: FaultInjectionManifest.CompileDictionary(values["FileModificationsDictionary"]))
+        except Exception as UnexpectedError:
+            self.Specs.pop(fileHash, None)
+            return FaultInjectionTestSpec(testFileName, fileHash, Problems = ["Unable to load %s: %s" % (testFileName, UnexpectedError)])
+
+        spec = FaultInjectionTestSpec(testFileName, fileHash, values["TargetMode"], values["FileModificationsDictionary"], values["TestTags"], values["ExpectedFault"])
+        spec.PatchPlan = patchPlan
+        return spec
+
+    #-------------------------------------------------------------------------
+    # Return the specs of the specified fault injection script and manifest
+    # files (all of the ones in the specified folder if none are specified).
+    # The cache files are saved if anything had to be loaded. When the whole
+    # folder is discovered, the specs of old file contents are dropped.
+    def Discover(self, testFileNames = None, testFolder = "."):
+        isWholeFolder = not testFileNames
+        if isWholeFolder:
+            testFileNames = sorted(glob.glob(os.path.join(testFolder, FAULT_INJECTION_SCRIPT_FILE_PATTERN)) + \
+                                   glob.glob(os.path.join(testFolder, FaultInjectionManifest.MANIFEST_FILE_PATTERN)))
+        specs = [self.GetSpec(testFileName) for testFileName in testFileNames]
+        if isWholeFolder:
+            fileHashes = set([spec.Hash for spec in specs])
+            for fileHash in self.Specs.keys():
+                if fileHash not in fileHashes:
+                    del self.Specs[fileHash]
+                    self.IsCacheChanged = True
+            self.PlanCache.Prune(fileHashes)
+        self.SaveCache()
+        self.PlanCache.Save()
+        return specs
+
+    #-------------------------------------------------------------------------
+    # Return the specs that have all of the specified tags.
+    def FilterByTags(self, specs, tags):
+        return [spec for spec in specs if set(tags).issubset(spec.TestTags)]
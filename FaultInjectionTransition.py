@@ -0,0 +1,105 @@
+#/////////////////////////////////////////////////////////////////////////////
+#/// @file FaultInjectionTransition.py
+#///
+#/// This script file contains the planner of the delta transitions between
+#/// the fault injection script files of a campaign (see the --delta option
+#/// of FaultInjectionBatchRunner.py). Without them, every script checks out
+#/// and modifies all of its files and undoes all of the checkouts at the
+#/// end, so two scripts that modify the same files the same way still
+#/// rewrite them, and make compiles them again.
+#///
+#/// The state of a script is the state of every file it modifies: the hash
+#/// of the file's compiled blocks (see FaultInjectionManifest.py). In a
+#/// delta campaign, the checkouts of a script are kept for the next one,
+#/// which only:
+#///   - undoes the checkouts of the files it does not modify,
+#///   - writes back the unmodified text of the files it modifies
+#///     differently and modifies them again,
+#///   - checks out and modifies the files that are not modified yet,
+#/// and leaves the files it modifies the same way as they are. The last
+#/// script (or a script that fails) undoes every checkout.
+#///
+#/// The planner orders the scripts so that consecutive scripts differ in as
+#/// few files as possible. Finding the best order is a travelling salesman
+#/// problem, so the order is built greedily: starting from the unmodified
+#/// view, the next script is always the one that differs in the fewest files
+#/// from the previous one (the first one in campaign order on a tie).
+#///
+#/// @if REVISION_HISTORY_INCLUDED
+#/// @par Edit History
+#/// agent    18-OCT-2026 Created.
+#/// agent    18-OCT-2026 The Apex makefile is no longer part of the state of
+#///                      a script, since it is no longer modified.
+#/// @endif
+#///
+#/// @par Copyright (c) 2026 Rockwell Automation Technologies, Inc.  All rights reserved.
+#///
+#/////////////////////////////////////////////////////////////////////////////
+
+#-----------------------------------------------------------------------------
+import FaultInjectionManifest    # For GetBlocksHash
+import NextGenFaultInjectionUtils # For TARGET_MODE_EDIT_FOLDERS
+
+#-----------------------------------------------------------------------------
+# Return the state a fault injection script file puts the files in: the
+# hash of the compiled blocks of each file it modifies, by edit folder and
+# file name.
+def GetFileStates(targetMode, patchPlan):
+    editFolder = NextGenFaultInjectionUtils.TARGET_MODE_EDIT_FOLDERS.get(targetMode, "")
+    fileStates = {}
+    for filename in patchPlan.keys():
+        fileStates[(editFolder, filename.lower())] = FaultInjectionManifest.GetBlocksHash(patchPlan[filename])
+    return fileStates
+
+#-----------------------------------------------------------------------------
+# Return the number of files that have to be changed to go from one state to
+# another: the files that are in only one of them or in different states.
+def CountChangedFiles(fileStatesA, fileStatesB):
+    changedFileCount = 0
+    for fileKey in set(fileStatesA.keys()) | set(fileStatesB.keys()):
+        if fileStatesA.get(fileKey) != fileStatesB.get(fileKey):
+            changedFileCount += 1
+    return changedFileCount
+
+# FaultInjectionTransitionPlanner class
+# This class is used to order the fault injection script files of a
+# campaign so that consecutive scripts differ in as few files as possible.
+class FaultInjectionTransitionPlanner:
+
+    def __init__(self):
+        # The name and the file states of each script, in campaign order.
+        self.Tests = []
+
+    #-------------------------------------------------------------------------
+    # Add a fault injection script file (its patch plan, see
+    # FaultInjectionManifest) to the campaign.
+    def AddTest(self, testName, targetMode, patchPlan):
+        self.Tests.append((testName, GetFileStates(targetMode, patchPlan)))
+
+    #-------------------------------------------------------------------------
+    # Return the number of files changed to run the scripts (by index) in an
+    # order, starting from and going back to the unmodified view.
+    def CountOrderChangedFiles(self, testIndexes):
+        changedFileCount = 0
+        previousFileStates = {}
+        for testIndex in testIndexes:
+            changedFileCount += CountChangedFiles(previousFileStates, self.Tests[testIndex][1])
+            previousFileStates = self.Tests[testIndex][1]
+        return changedFileCount + CountChangedFiles(previousFileStates, {})
+
+    #-------------------------------------------------------------------------
+    # Return the names of the scripts in the order they should be run, and
+    # the number of files changed to run them in campaign order and in that
+    # order.
+    def GetOrder(self):
+        remainingIndexes = range(len(self.Tests))
+        orderedIndexes = []
+        previousFileStates = {}
+        while len(remainingIndexes) != 0:
+            nextIndex = min(remainingIndexes, key = lambda testIndex: CountChangedFiles(previousFileStates, self.Tests[testIndex][1]))
+            remainingIndexes.remove(nextIndex)
+            orderedIndexes.append(nextIndex)
+            previousFileStates = self.Tests[nextIndex][1]
+        return ([self.Tests[testIndex][0] for testIndex in orderedIndexes],
+                self.CountOrderChangedFiles(range(len(self.Tests))),
+                self.CountOrderChangedFiles(orderedIndexes))
@@ -0,0 +1,148 @@
+#/////////////////////////////////////////////////////////////////////////////
+#/// @file FaultInjectionTrash.py
+#///
+#/// This script file contains the trash used to delete the files and
+#/// folders of the previous build before building (see
+#/// LegacyFaultInjectionUtils.py). Deleting the object folders of the
+#/// Workbench projects one after the other takes minutes, and the build
+#/// could not start until they were gone.
+#///
+#/// Instead, each file or folder is renamed into the trash folder of its
+#/// parent folder for this run (FaultInjectionTrash.<process ID>), which is
+#/// on the same volume, so the rename is immediate and the build can start
+#/// at once. The trash is then deleted by a reaper: FIT_TRASH_THREADS (4 by
+#/// default) background threads that each delete one trashed file or folder
+#/// at a time, while the build runs. The trash folders left by an earlier
+#/// run that was stopped are deleted too.
+#///
+#/// A file or folder that cannot be renamed (for example because it is in
+#/// use) is deleted in place instead. The files that could not be deleted
+#/// are reported when waiting for the reaper, instead of being ignored.
+#///
+#/// @if REVISION_HISTORY_INCLUDED
+#/// @par Edit History
+#/// agent    18-OCT-2026 Created.
+#/// @endif
+#///
+#/// @par Copyright (c) 2026 Rockwell Automation Technologies, Inc.  All rights reserved.
+#///
+#/////////////////////////////////////////////////////////////////////////////
+
+#-----------------------------------------------------------------------------
+import os         # For path, rename, remove, rmdir, getpid, environ
+import glob       # For the trash folders of earlier runs
+import shutil     # For rmtree
+import threading  # For Lock
+import multiprocessing.pool # For ThreadPool
+
+# Define constants that should not change.
+TRASH_FOLDER_NAME                       = "FaultInjectionTrash"
+
+TRASH_THREADS_ENVIRONMENT_VARIABLE      = "FIT_TRASH_THREADS"
+
+DEFAULT_TRASH_THREADS                   = 4
+
+# Seconds to wait for the reaper (Python 2 only lets Ctrl-C interrupt a
+# wait that has a timeout).
+TRASH_WAIT_TIMEOUT                      = 7 * 24 * 3600
+
+# FaultInjectionTrash class
+# This class is used to move files and folders to the trash and delete the
+# trash in the background.
+class FaultInjectionTrash:
+
+    def __init__(self, ThreadCount = None):
+        if ThreadCount is None:
+            ThreadCount = int(os.environ.get(TRASH_THREADS_ENVIRONMENT_VARIABLE, DEFAULT_TRASH_THREADS))
+        self.ThreadCount = max(1, ThreadCount)
+        self.Pool = None
+
+        # The trash folders of this run and the deletions submitted to the
+        # reaper.
+        self.TrashFolders = []
+        self.Deletions = []
+        self.TrashedCount = 0
+
+        # The files and folders that could not be deleted, and why.
+        self.Errors = []
+        self.Lock = threading.Lock()
+
+    #-------------------------------------------------------------------------
+    # Return the trash folder of this run for the files and folders of a
+    # parent folder.
+    def GetTrashFolder(self, parentFolder):
+        return os.path.join(parentFolder, "%s.%d" % (TRASH_FOLDER_NAME, os.getpid()))
+
+    #-------------------------------------------------------------------------
+    # Record that a file or folder could not be deleted (called on the
+    # threads of the reaper).
+    def AddError(self, function, path, excinfo):
+        self.Lock.acquire()
+        try:
+            self.Errors.append("%s: %s" % (path, excinfo[1]))
+        finally:
+            self.Lock.release()
+
+    #-------------------------------------------------------------------------
+    # Delete a file or folder, recording what could not be deleted.
+    def Delete(self, path):
+        if os.path.isdir(path) and not os.path.islink(path):
+            shutil.rmtree(path, False, self.AddError)
+        else:
+            try:
+                os.remove(path)
+            except OSError as DeleteError:
+                self.AddError(os.remove, path, (OSError, DeleteError, None))
+
+    #-------------------------------------------------------------------------
+    # Have a file or folder deleted by the reaper.
+    def SubmitDeletion(self, path):
+        if self.Pool is None:
+            self.Pool = multiprocessing.pool.ThreadPool(self.ThreadCount)
+        self.Deletions.append(self.Pool.apply_async(self.Delete, (path,)))
+
+    #-------------------------------------------------------------------------
+    # Move a file or folder to the trash, to be deleted in the background.
+    # A file or folder that cannot be moved is deleted at once. Returns False
+    # if there was nothing to delete.
+    def Discard(self, path):
+        if not os.path.lexists(path):
+            return False
+
+        parentFolder = os.path.dirname(os.path.abspath(path))
+        trashFolder = self.GetTrashFolder(parentFolder)
+        try:
+            if trashFolder not in self.TrashFolders:
+                # The trash folders of earlier runs were not deleted.
+                for oldTrashFolder in glob.glob(os.path.join(parentFolder, TRASH_FOLDER_NAME + ".*")):
+                    if oldTrashFolder != trashFolder:
+                        self.SubmitDeletion(oldTrashFolder)
+                if not os.path.isdir(trashFolder):
+                    os.makedirs(trashFolder)
+                self.TrashFolders.append(trashFolder)
+            self.TrashedCount += 1
+            trashedPath = os.path.join(trashFolder, "%d_%s" % (self.TrashedCount, os.path.basename(path)))
+            os.rename(path, trashedPath)
+        except OSError:
+            self.Delete(path)
+            return True
+        self.SubmitDeletion(trashedPath)
+        return True
+
+    #-------------------------------------------------------------------------
+    # Wait for the reaper to delete the trash and remove the trash folders of
+    # this run. Returns the files and folders that could not be deleted, and
+    # why.
+    def Wait(self):
+        for deletion in self.Deletions:
+            deletion.get(TRASH_WAIT_TIMEOUT)
+        self.Deletions = []
+        for trashFolder in self.TrashFolders:
+            try:
+                os.rmdir(trashFolder)
+            except OSError as DeleteError:
+                self.AddError(os.rmdir, trashFolder, (OSError, DeleteError, None))
+        self.TrashFolders = []
+        errors = self.Errors
+        self.Errors = []
+        return errors
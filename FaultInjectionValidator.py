@@ -0,0 +1,180 @@
+#/////////////////////////////////////////////////////////////////////////////
+#/// @file FaultInjectionValidator.py
+#///
+#/// This script file contains the preflight validator for the fault
+#/// injection script files. Every fault injection script file's target mode
+#/// and file modifications dictionary are read through
+#/// FaultInjectionTestDiscovery without building anything, and every file
+#/// and marker that the script modifies is resolved against the view. All
+#/// of the problems found are reported in one run, before any file is
+#/// checked out or any firmware is built.
+#///
+#/// The source files are read through one shared source cache, so a file
+#/// that is modified by many scripts (for example ApexDiagnostic.cpp) is
+#/// only read and scanned once.
+#///
+#/// Usage (from the FIT folder of the view):
+#///     python FaultInjectionValidator.py [--report-only] [script files]
+#/// The exit code is 1 if any problem is found, unless --report-only is
+#/// given. The report is also saved to the build results folder, where it is
+#/// used to skip the broken scripts when FIT_SKIP_BROKEN_TESTS is set.
+#///
+#/// @if REVISION_HISTORY_INCLUDED
+#/// @par Edit History
+#/// agent    18-OCT-2026 Created.
+#/// agent    18-OCT-2026 The fault injection script files are now read
+#///                      through FaultInjectionTestDiscovery.
+#/// agent    18-OCT-2026 Blocks are now checked from the compiled patch plan.
+#/// @endif
+#///
+#/// @par Copyright (c) 2026 Rockwell Automation Technologies, Inc.  All rights reserved.
+#///
+#/////////////////////////////////////////////////////////////////////////////
+
+#-----------------------------------------------------------------------------
+import os         # For path, getcwd, environ
+import sys        # For argv, exit
+import json       # For the report file
+import datetime   # For date
+import FaultInjectionPatchEngine # For PlanFile, FaultInjectionSourceCache
+import FaultInjectionTestDiscovery # For TARGET_MODE_NAME
+import NextGenFaultInjectionUtils # For TARGET_MODE_EDIT_FOLDERS
+
+# Define constants that should not change.
+VALIDATION_REPORT_FILE_NAME             = "FaultInjectionValidation.json"
+
+VALIDATE_MODE                           = "validate"
+
+SKIP_BROKEN_TESTS_ENVIRONMENT_VARIABLE  = "FIT_SKIP_BROKEN_TESTS"
+
+# FaultInjectionValidator class
+# This class is used to check fault injection script files against a view.
+class FaultInjectionValidator:
+
+    def __init__(self, ViewPath, Catalog, SourceCache = None):
+        self.ViewPath = ViewPath
+        self.Catalog = Catalog
+        if SourceCache is None:
+            SourceCache = FaultInjectionPatchEngine.FaultInjectionSourceCache()
+        self.SourceCache = SourceCache
+        self.Engine = FaultInjectionPatchEngine.FaultInjectionPatchEngine()
+
+    #-------------------------------------------------------------------------
+    # Check the compiled blocks of one file of a fault injection script
+    # file's patch plan and return the list of problems found.
+    def ValidateFile(self, editFolder, filename, compiledBlocks):
+        fileNameWithPath = self.Catalog.FindFile(editFolder, filename)
+        if fileNameWithPath is None:
+            return ["File '%s' was not found in %s" % (filename, editFolder)]
+
+        text = self.SourceCache.GetText(fileNameWithPath)
+        markerIndex = self.SourceCache.GetMarkerIndex(fileNameWithPath, self.Catalog.GetMarkers(fileNameWithPath))
+
+        # Check each block on its own first so every missing or ambiguous
+        # marker is reported, then check the blocks together for overlaps.
+        problems = []
+        for compiledBlock in compiledBlocks:
+            try:
+                self.Engine.PlanFile(text, [compiledBlock], fileNameWithPath, markerIndex)
+            except (RuntimeError, IndexError) as UnexpectedError:
+                problems.append(str(UnexpectedError))
+        if len(problems) == 0:
+            try:
+                self.Engine.PlanFile(text, compiledBlocks, fileNameWithPath, markerIndex)
+            except RuntimeError as UnexpectedError:
+                problems.append(str(UnexpectedError))
+        return problems
+
+    #-------------------------------------------------------------------------
+    # Check the spec of a fault injection script file (see
+    # FaultInjectionTestDiscovery) and return the list of problems found.
+    def ValidateSpec(self, spec):
+        if len(spec.Problems) != 0:
+            return spec.Problems
+
+        if spec.TargetMode not in NextGenFaultInjectionUtils.TARGET_MODE_EDIT_FOLDERS:
+            return ["Invalid %s '%s'" % (FaultInjectionTestDiscovery.TARGET_MODE_NAME, spec.TargetMode)]
+
+        if spec.PatchPlan is None:
+            return ["No %s found" % FaultInjectionTestDiscovery.FILE_MODIFICATIONS_DICTIONARY_NAME]
+
+        editFolder = self.ViewPath + "\\" + NextGenFaultInjectionUtils.TARGET_MODE_EDIT_FOLDERS[spec.TargetMode]
+        problems = []
+        for filename in sorted(spec.PatchPlan.keys()):
+            problems.extend(self.ValidateFile(editFolder, filename, spec.PatchPlan[filename]))
+        return problems
+
+    #-------------------------------------------------------------------------
+    # Check the specs of fault injection script files. Returns a dictionary
+    # of script file name -> list of problems found.
+    def ValidateSpecs(self, specs):
+        report = {}
+        for spec in specs:
+            report[spec.TestName] = self.ValidateSpec(spec)
+        return report
+
+#-----------------------------------------------------------------------------
+# Return the path of the validation report file.
+def GetReportFileName():
+    return NextGenFaultInjectionUtils.BUILD_RESULTS_FOLDER_NAME + "\\" + VALIDATION_REPORT_FILE_NAME
+
+#-----------------------------------------------------------------------------
+# Save the validation report to the build results folder.
+def SaveReport(report):
+    if not os.path.exists(NextGenFaultInjectionUtils.BUILD_RESULTS_FOLDER_NAME):
+        os.makedirs(NextGenFaultInjectionUtils.BUILD_RESULTS_FOLDER_NAME)
+    reportFile = open(GetReportFileName(), 'w')
+    json.dump({"Date": str(datetime.date.today()), "Tests": report}, reportFile, indent = 4, sort_keys = True)
+    reportFile.close()
+
+#-----------------------------------------------------------------------------
+# Return True if broken scripts are to be skipped and today's validation
+# report lists problems for the specified fault injection script file.
+def IsTestToBeSkipped(TestName):
+    if not os.environ.get(SKIP_BROKEN_TESTS_ENVIRONMENT_VARIABLE):
+        return False
+    if not os.path.exists(GetReportFileName()):
+        return False
+    reportFile = open(GetReportFileName())
+    report = json.load(reportFile)
+    reportFile.close()
+    if report.get("Date") != str(datetime.date.today()):
+        return False
+    return len(report["Tests"].get(os.path.basename(TestName), [])) != 0
+
+#-----------------------------------------------------------------------------
+# Validate the fault injection script files against the view that contains
+# the current folder, print the problems found and optionally save the
+# report. Returns the number of scripts with problems.
+def ValidateAndReport(testFileNames = None, saveReport = True):
+    utils = NextGenFaultInjectionUtils.FaultInjectionUtils()
+    viewPath = utils.FindViewPath(os.getcwd())[0]
+    catalog = utils.CreateCatalog(viewPath)
+    catalog.Load()
+
+    specs = utils.CreateTestDiscovery().Discover(testFileNames)
+    report = FaultInjectionValidator(viewPath, catalog).ValidateSpecs(specs)
+    if saveReport:
+        SaveReport(report)
+
+    brokenTestCount = 0
+    for testName in sorted(report.keys()):
+        if len(report[testName]) == 0:
+            print "OK     %s" % testName
+        else:
+            brokenTestCount += 1
+            print "FAILED %s" % testName
+            for problem in report[testName]:
+                print "           %s" % problem
+    print "%d of %d fault injection script files have problems." % (brokenTestCount, len(report))
+    return brokenTestCount
+
+#-----------------------------------------------------------------------------
+if __name__ == "__main__":
+    arguments = sys.argv[1:]
+    reportOnly = "--report-only" in arguments
+    if reportOnly:
+        arguments.remove("--report-only")
+
+    if ValidateAndReport(arguments) and not reportOnly:
+        sys.exit(1)
@@ -0,0 +1,210 @@
+#/////////////////////////////////////////////////////////////////////////////
+#/// @file FaultInjectionVcs.py
+#///
+#/// This script file contains the version control backends of the fault
+#/// injection utilities. Without them, the utilities call the ClearCase
+#/// module's isCheckedOut(), checkout() and uncheckout() one file at a time,
+#/// each a cleartool round trip that waits for the previous one, and the
+#/// utilities cannot even be imported (for example to validate or analyze
+#/// the fault injection script files) where the ClearCase module is not
+#/// installed.
+#///
+#/// A backend works on batches of files:
+#///   - GetStatus() returns whether each file is checked out,
+#///   - CheckOut() checks the files out,
+#///   - UndoCheckOut() undoes their checkouts,
+#/// and the last two return the error of each file that failed, so every
+#/// file of a batch is tried and all of the failures can be reported.
+#///
+#/// FIT_VCS_BACKEND selects the backend:
+#///   - clearcase (the default) runs the ClearCase commands of a batch
+#///     concurrently on a bounded thread pool: the orchestrator's VCS
+#///     threads (see FaultInjectionOrchestrator.py), or FIT_VCS_THREADS (4
+#///     by default) threads of its own. The ClearCase module is only
+#///     imported by the first command.
+#///   - local checks files out of a plain folder: a checkout saves a copy
+#///     of the file in FIT_VCS_LOCAL_FOLDER (Build_Cache\Checkouts by
+#///     default) and makes the file writable, and undoing it puts the copy
+#///     back (keeping the modified file as <file>.keep when asked to, as
+#///     ClearCase does). It is for machines without ClearCase, for example
+#///     to run the harness on a copy of the view.
+#///
+#/// @if REVISION_HISTORY_INCLUDED
+#/// @par Edit History
+#/// agent    18-OCT-2026 Created.
+#/// @endif
+#///
+#/// @par Copyright (c) 2026 Rockwell Automation Technologies, Inc.  All rights reserved.
+#///
+#/////////////////////////////////////////////////////////////////////////////
+
+#-----------------------------------------------------------------------------
+import os         # For path, environ, chmod, remove, makedirs
+import stat       # For S_IREAD, S_IWRITE
+import shutil     # For copy2
+import hashlib    # For sha1
+import importlib  # For importing the ClearCase module when it is first used
+import threading  # For Lock
+import multiprocessing.pool # For ThreadPool
+import FaultInjectionOrchestrator # For VCS_THREADS_ENVIRONMENT_VARIABLE, DEFAULT_VCS_THREADS, OPERATION_TIMEOUT
+
+# Define constants that should not change.
+VCS_BACKEND_ENVIRONMENT_VARIABLE        = "FIT_VCS_BACKEND"
+
+VCS_LOCAL_FOLDER_ENVIRONMENT_VARIABLE   = "FIT_VCS_LOCAL_FOLDER"
+
+VCS_BACKEND_CLEARCASE                   = "clearcase"
+
+VCS_BACKEND_LOCAL                       = "local"
+
+VCS_LOCAL_FOLDER_NAME                   = "Build_Cache\\Checkouts"
+
+CHECKOUT_COMMENT                        = "Temporary Checkout for Fault Injection Test."
+
+KEEP_FILE_EXTENSION                     = ".keep"
+
+#-----------------------------------------------------------------------------
+# Return the version control backend selected by FIT_VCS_BACKEND.
+# ClearCaseModuleName is the name the utilities import the ClearCase module
+# by, and Pool the thread pool to run the ClearCase commands on (None for
+# a pool of the backend's own).
+def GetVcsBackend(ClearCaseModuleName, Pool = None):
+    backendName = os.environ.get(VCS_BACKEND_ENVIRONMENT_VARIABLE, VCS_BACKEND_CLEARCASE).lower()
+    if backendName == VCS_BACKEND_CLEARCASE:
+        return FaultInjectionClearCaseBackend(ClearCaseModuleName, Pool)
+    if backendName == VCS_BACKEND_LOCAL:
+        return FaultInjectionLocalBackend()
+    UnexpectedError = "Unknown version control backend '%s' in %s (expected %s or %s)!" % (backendName, VCS_BACKEND_ENVIRONMENT_VARIABLE, VCS_BACKEND_CLEARCASE, VCS_BACKEND_LOCAL)
+    raise RuntimeError, UnexpectedError
+
+# FaultInjectionClearCaseBackend class
+# This class is used to run the ClearCase commands of a batch of files
+# concurrently on a bounded thread pool.
+class FaultInjectionClearCaseBackend:
+
+    def __init__(self, ModuleName, Pool = None):
+        self.ModuleName = ModuleName
+        self.Module = None
+        self.Pool = Pool
+        self.Lock = threading.Lock()
+
+    #-------------------------------------------------------------------------
+    # Return the ClearCase module, importing it (and creating the thread
+    # pool, if none was given) the first time.
+    def GetModule(self):
+        self.Lock.acquire()
+        try:
+            if self.Module is None:
+                self.Module = importlib.import_module(self.ModuleName)
+            if self.Pool is None:
+                ThreadCount = int(os.environ.get(FaultInjectionOrchestrator.VCS_THREADS_ENVIRONMENT_VARIABLE, FaultInjectionOrchestrator.DEFAULT_VCS_THREADS))
+                self.Pool = multiprocessing.pool.ThreadPool(max(1, ThreadCount))
+        finally:
+            self.Lock.release()
+        return self.Module
+
+    #-------------------------------------------------------------------------
+    # Run a function on each file of a batch on the thread pool and return
+    # its results, in order.
+    def Map(self, function, filesWithPath):
+        if len(filesWithPath) == 0:
+            return []
+        self.GetModule()
+        return self.Pool.map_async(function, filesWithPath).get(FaultInjectionOrchestrator.OPERATION_TIMEOUT)
+
+    #-------------------------------------------------------------------------
+    # Return the file -> error dictionary of the files whose ClearCase
+    # command failed (returned something or raised an exception).
+    def RunCommand(self, command, filesWithPath):
+        def RunFileCommand(fileNameWithPath):
+            try:
+                return command(fileNameWithPath)
+            except Exception as UnexpectedError:
+                return str(UnexpectedError)
+        errors = {}
+        for fileNameWithPath, error in zip(filesWithPath, self.Map(RunFileCommand, filesWithPath)):
+            if error != None:
+                errors[fileNameWithPath] = error
+        return errors
+
+    #-------------------------------------------------------------------------
+    # Return the file -> True if it is checked out dictionary of a batch of
+    # files.
+    def GetStatus(self, filesWithPath):
+        return dict(zip(filesWithPath, self.Map(lambda fileNameWithPath: bool(self.Module.isCheckedOut(fileNameWithPath)), filesWithPath)))
+
+    #-------------------------------------------------------------------------
+    # Check out a batch of files. Returns the file -> error dictionary of the
+    # files that could not be checked out.
+    def CheckOut(self, filesWithPath, Comment = CHECKOUT_COMMENT):
+        return self.RunCommand(lambda fileNameWithPath: self.Module.checkout(fileNameWithPath, False, Comment), filesWithPath)
+
+    #-------------------------------------------------------------------------
+    # Undo the checkouts of a batch of files, keeping the checked out files
+    # as .keep files if Keep is set. Returns the file -> error dictionary of
+    # the files whose checkout could not be undone.
+    def UndoCheckOut(self, filesWithPath, Keep = True):
+        return self.RunCommand(lambda fileNameWithPath: self.Module.uncheckout(fileNameWithPath, keep = Keep), filesWithPath)
+
+# FaultInjectionLocalBackend class
+# This class is used to check files out of a plain folder, by saving a copy
+# of each checked out file.
+class FaultInjectionLocalBackend:
+
+    def __init__(self, CheckoutFolder = None):
+        if CheckoutFolder is None:
+            CheckoutFolder = os.environ.get(VCS_LOCAL_FOLDER_ENVIRONMENT_VARIABLE, VCS_LOCAL_FOLDER_NAME)
+        self.CheckoutFolder = CheckoutFolder
+
+    #-------------------------------------------------------------------------
+    # Return the name of the copy of a checked out file.
+    def GetCheckoutFileName(self, fileNameWithPath):
+        return os.path.join(self.CheckoutFolder, hashlib.sha1(os.path.normcase(os.path.abspath(fileNameWithPath))).hexdigest())
+
+    #-------------------------------------------------------------------------
+    # Return the file -> True if it is checked out dictionary of a batch of
+    # files.
+    def GetStatus(self, filesWithPath):
+        return dict([(fileNameWithPath, os.path.isfile(self.GetCheckoutFileName(fileNameWithPath))) for fileNameWithPath in filesWithPath])
+
+    #-------------------------------------------------------------------------
+    # Check out a batch of files. Returns the file -> error dictionary of the
+    # files that could not be checked out.
+    def CheckOut(self, filesWithPath, Comment = CHECKOUT_COMMENT):
+        errors = {}
+        for fileNameWithPath in filesWithPath:
+            checkoutFileName = self.GetCheckoutFileName(fileNameWithPath)
+            if os.path.isfile(checkoutFileName):
+                errors[fileNameWithPath] = "Already checked out"
+                continue
+            try:
+                if not os.path.isdir(self.CheckoutFolder):
+                    os.makedirs(self.CheckoutFolder)
+                shutil.copy2(fileNameWithPath, checkoutFileName)
+                os.chmod(fileNameWithPath, os.stat(fileNameWithPath).st_mode | stat.S_IWRITE)
+            except (IOError, OSError) as UnexpectedError:
+                errors[fileNameWithPath] = str(UnexpectedError)
+        return errors
+
+    #-------------------------------------------------------------------------
+    # Undo the checkouts of a batch of files, keeping the checked out files
+    # as .keep files if Keep is set. Returns the file -> error dictionary of
+    # the files whose checkout could not be undone.
+    def UndoCheckOut(self, filesWithPath, Keep = True):
+        errors = {}
+        for fileNameWithPath in filesWithPath:
+            checkoutFileName = self.GetCheckoutFileName(fileNameWithPath)
+            if not os.path.isfile(checkoutFileName):
+                errors[fileNameWithPath] = "Not checked out"
+                continue
+            try:
+                if Keep:
+                    shutil.copy2(fileNameWithPath, fileNameWithPath + KEEP_FILE_EXTENSION)
+                # The unmodified file keeps its time, so make does not
+                # rebuild what depends on it.
+                os.chmod(fileNameWithPath, stat.S_IREAD | stat.S_IWRITE)
+                shutil.copy2(checkoutFileName, fileNameWithPath)
+                os.remove(checkoutFileName)
+            except (IOError, OSError) as UnexpectedError:
+                errors[fileNameWithPath] = str(UnexpectedError)
+        return errors
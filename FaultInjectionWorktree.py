@@ -0,0 +1,236 @@
+#/////////////////////////////////////////////////////////////////////////////
+#/// @file FaultInjectionWorktree.py
+#///
+#/// This script file contains the worktrees used to run fault injection
+#/// script files in parallel (see FaultInjectionBatchRunner.py).
+#///
+#/// A worktree is a private copy of the folders of the view that the Apex and
+#/// Blackfin builds use (including their Release folders), laid out like the
+#/// view so that the build scripts can be run with the worktree's folder as
+#/// their view path. A fault injection script file run in a worktree
+#/// modifies and builds the worktree's files instead of checking out and
+#/// modifying the view's files, so any number of them can run at once.
+#///
+#/// The view's folders are copied once to a baseline, which is brought up to
+#/// date (by file size and time) at the start of every parallel campaign.
+#/// A worktree is a hard link farm of the baseline: every source file is a
+#/// hard link to the baseline's file, so creating a worktree costs one link
+#/// per file and almost no disk. Only the build output (Release) folders are
+#/// copied, since the builds write into them. The files of the baseline are
+#/// read-only, so a write through one of the links fails instead of changing
+#/// the baseline and every other worktree. A file that is to be modified is
+#/// first replaced by a private copy (copied to a temporary file that is
+#/// then renamed over the link), and only private copies may be modified.
+#/// Where hard links are not supported, the files are copied instead.
+#///
+#/// The baseline and the worktrees are kept in the FIT_WORKTREE_FOLDER
+#/// folder (Build_Cache\Worktrees by default), which must be on one volume.
+#///
+#/// @if REVISION_HISTORY_INCLUDED
+#/// @par Edit History
+#/// agent    18-OCT-2026 Created.
+#/// agent    18-OCT-2026 Worktrees are now hard link farms of a baseline
+#///                      copy of the view's folders.
+#/// @endif
+#///
+#/// @par Copyright (c) 2026 Rockwell Automation Technologies, Inc.  All rights reserved.
+#///
+#/////////////////////////////////////////////////////////////////////////////
+
+#-----------------------------------------------------------------------------
+import os         # For path, walk, environ, chmod, rename, remove
+import stat       # For S_IREAD, S_IWRITE
+import json       # For the baseline manifest file
+import shutil     # For copy2, rmtree
+import FaultInjectionBuildCache  # For LinkFile
+
+# Define constants that should not change.
+WORKTREE_FOLDER_NAME                    = "Build_Cache\\Worktrees"
+
+WORKTREE_FOLDER_ENVIRONMENT_VARIABLE    = "FIT_WORKTREE_FOLDER"
+
+WORKTREE_BASELINE_FOLDER_NAME           = "Baseline"
+
+WORKTREE_BASELINE_MANIFEST_FILE_NAME    = "Baseline.json"
+
+WORKTREE_BASELINE_MANIFEST_VERSION      = 1
+
+WORKTREE_TEMPORARY_EXTENSION            = ".private"
+
+#-----------------------------------------------------------------------------
+# Make a file read-only or writable.
+def SetReadOnly(fileNameWithPath, isReadOnly):
+    if isReadOnly:
+        os.chmod(fileNameWithPath, stat.S_IREAD)
+    else:
+        os.chmod(fileNameWithPath, stat.S_IREAD | stat.S_IWRITE)
+
+# FaultInjectionWorktree class
+# This class describes one worktree (or the baseline). BranchPath and
+# ViewPath are the worktree's equivalents of the view's paths (see
+# NextGenFaultInjectionUtils.FindViewPath).
+class FaultInjectionWorktree:
+
+    def __init__(self, Folder, BranchPath, ViewPath, Baseline = None):
+        self.Folder = Folder
+        self.BranchPath = BranchPath
+        self.ViewPath = ViewPath
+        self.Baseline = Baseline
+
+        # The files that were replaced by private copies.
+        self.PrivateFiles = set()
+
+        self.LinkedFileCount = 0
+        self.CopiedFileCount = 0
+
+    #-------------------------------------------------------------------------
+    # Return the baseline's file that a file of the worktree is linked to.
+    def GetBaselineFile(self, fileNameWithPath):
+        return self.Baseline.ViewPath + fileNameWithPath[len(self.ViewPath):]
+
+    #-------------------------------------------------------------------------
+    # Remove a file of the worktree that may be a link to a read-only
+    # baseline file. The read-only attribute belongs to the file, not to the
+    # link, so it is set again on the baseline's file afterwards.
+    def RemoveLinkedFile(self, fileNameWithPath):
+        SetReadOnly(fileNameWithPath, False)
+        os.remove(fileNameWithPath)
+        if self.Baseline is not None and os.path.isfile(self.GetBaselineFile(fileNameWithPath)):
+            SetReadOnly(self.GetBaselineFile(fileNameWithPath), True)
+
+    #-------------------------------------------------------------------------
+    # Replace a file of the worktree by a writable private copy before it is
+    # modified, so the baseline and the other worktrees are not changed.
+    def PrepareFileForWriting(self, fileNameWithPath):
+        if fileNameWithPath in self.PrivateFiles:
+            return
+        temporaryFileName = fileNameWithPath + WORKTREE_TEMPORARY_EXTENSION
+        shutil.copy2(fileNameWithPath, temporaryFileName)
+        SetReadOnly(temporaryFileName, False)
+        self.RemoveLinkedFile(fileNameWithPath)
+        os.rename(temporaryFileName, fileNameWithPath)
+        self.PrivateFiles.add(fileNameWithPath)
+
+    #-------------------------------------------------------------------------
+    # Make sure that a file of the worktree is a private copy before it is
+    # written.
+    def CheckFileIsPrivate(self, fileNameWithPath):
+        if fileNameWithPath not in self.PrivateFiles:
+            UnexpectedError = "File %s of worktree %s is shared with the baseline and must not be written" % (fileNameWithPath, self.Folder)
+            raise RuntimeError, UnexpectedError
+
+# FaultInjectionWorktreeFactory class
+# This class is used to keep the baseline of a view up to date and to create
+# and remove the worktrees of the view.
+class FaultInjectionWorktreeFactory:
+
+    def __init__(self, ViewPath, BranchPath, SourceFolderNames, OutputFolderNames, WorktreesFolder = None):
+        if WorktreesFolder is None:
+            WorktreesFolder = os.environ.get(WORKTREE_FOLDER_ENVIRONMENT_VARIABLE, WORKTREE_FOLDER_NAME)
+        self.ViewPath = ViewPath
+        self.BranchPath = BranchPath
+        self.SourceFolderNames = SourceFolderNames
+        self.OutputFolderNames = [os.path.normcase(name) for name in OutputFolderNames]
+        self.WorktreesFolder = os.path.abspath(WorktreesFolder)
+        self.Baseline = self.CreateWorktreeObject(WORKTREE_BASELINE_FOLDER_NAME)
+
+    #-------------------------------------------------------------------------
+    # Return the description of a worktree (or of the baseline) of the view.
+    def CreateWorktreeObject(self, name, baseline = None):
+        # The view path is below the branch path (for example
+        # M:\view\Analog\NextGen below M:\view), and so is the worktree's.
+        folder = os.path.join(self.WorktreesFolder, name)
+        return FaultInjectionWorktree(folder, folder, folder + self.ViewPath[len(self.BranchPath):], baseline)
+
+    #-------------------------------------------------------------------------
+    # Return True if a path relative to a view path is in a build output folder.
+    def IsOutputFile(self, relativeFileName):
+        folderNames = os.path.normcase(os.path.dirname(relativeFileName)).replace("/", "\\").split("\\")
+        return len(set(folderNames) & set(self.OutputFolderNames)) != 0
+
+    #-------------------------------------------------------------------------
+    # Return the relative path of every file in the source folders below a
+    # view path.
+    def GetRelativeFileNames(self, viewPath):
+        relativeFileNames = []
+        for sourceFolderName in self.SourceFolderNames:
+            for path, folderNames, fileNames in os.walk(os.path.join(viewPath, sourceFolderName)):
+                for filename in fileNames:
+                    relativeFileNames.append(os.path.join(path, filename)[len(viewPath):].lstrip("\\/"))
+        return relativeFileNames
+
+    #-------------------------------------------------------------------------
+    # Bring the baseline up to date with the view: copy the files whose size
+    # or time changed and remove the files that are no longer in the view.
+    # Must not be called while worktrees are being created. Returns the
+    # number of files copied.
+    def UpdateBaseline(self):
+        manifestFileName = os.path.join(self.Baseline.Folder, WORKTREE_BASELINE_MANIFEST_FILE_NAME)
+        manifest = {}
+        if os.path.exists(manifestFileName):
+            try:
+                manifestFile = open(manifestFileName)
+                baselineManifest = json.load(manifestFile)
+                manifestFile.close()
+                if baselineManifest.get("Version") == WORKTREE_BASELINE_MANIFEST_VERSION and baselineManifest.get("ViewPath") == self.ViewPath:
+                    manifest = baselineManifest["Files"]
+            except ValueError:
+                # A corrupt manifest only means that everything is copied again.
+                manifest = {}
+
+        copiedFileCount = 0
+        viewFiles = {}
+        for relativeFileName in self.GetRelativeFileNames(self.ViewPath):
+            fileStat = os.stat(os.path.join(self.ViewPath, relativeFileName))
+            viewFiles[relativeFileName] = [fileStat.st_size, fileStat.st_mtime]
+            baselineFileName = os.path.join(self.Baseline.ViewPath, relativeFileName)
+            if manifest.get(relativeFileName) == viewFiles[relativeFileName] and os.path.isfile(baselineFileName):
+                continue
+            if os.path.isfile(baselineFileName):
+                SetReadOnly(baselineFileName, False)
+            elif not os.path.exists(os.path.dirname(baselineFileName)):
+                os.makedirs(os.path.dirname(baselineFileName))
+            shutil.copy2(os.path.join(self.ViewPath, relativeFileName), baselineFileName)
+            SetReadOnly(baselineFileName, not self.IsOutputFile(relativeFileName))
+            copiedFileCount += 1
+
+        for relativeFileName in self.GetRelativeFileNames(self.Baseline.ViewPath):
+            if relativeFileName not in viewFiles:
+                baselineFileName = os.path.join(self.Baseline.ViewPath, relativeFileName)
+                SetReadOnly(baselineFileName, False)
+                os.remove(baselineFileName)
+
+        manifestFile = open(manifestFileName, 'w')
+        json.dump({"Version": WORKTREE_BASELINE_MANIFEST_VERSION, "ViewPath": self.ViewPath, "Files": viewFiles}, manifestFile)
+        manifestFile.close()
+        return copiedFileCount
+
+    #-------------------------------------------------------------------------
+    # Create a worktree with the specified name from the baseline, replacing
+    # any worktree left with that name.
+    def Create(self, name):
+        worktree = self.CreateWorktreeObject(name, self.Baseline)
+        if os.path.exists(worktree.Folder):
+            self.Remove(worktree)
+
+        for relativeFileName in self.GetRelativeFileNames(self.Baseline.ViewPath):
+            baselineFileName = os.path.join(self.Baseline.ViewPath, relativeFileName)
+            worktreeFileName = os.path.join(worktree.ViewPath, relativeFileName)
+            if not os.path.exists(os.path.dirname(worktreeFileName)):
+                os.makedirs(os.path.dirname(worktreeFileName))
+            if not self.IsOutputFile(relativeFileName) and FaultInjectionBuildCache.LinkFile(baselineFileName, worktreeFileName):
+                worktree.LinkedFileCount += 1
+            else:
+                shutil.copy2(baselineFileName, worktreeFileName)
+                SetReadOnly(worktreeFileName, False)
+                worktree.PrivateFiles.add(worktreeFileName)
+                worktree.CopiedFileCount += 1
+        return worktree
+
+    #-------------------------------------------------------------------------
+    # Remove a worktree.
+    def Remove(self, worktree):
+        def RemoveReadOnlyFile(function, path, excinfo):
+            if function is os.remove:
+                worktree.RemoveLinkedFile(path)
+        shutil.rmtree(worktree.Folder, False, RemoveReadOnlyFile)
@@ -23,6 +23,25 @@
 #/// @if REVISION_HISTORY_INCLUDED
 #/// @par Edit History
 #/// tnhaley  14-JAN-2013 Created.
+#/// agent    18-OCT-2026 ModifyFile() now applies all blocks for a file in
+#///                      one pass through FaultInjectionPatchEngine and
+#///                      rejects ambiguous or overlapping blocks.
+#/// agent    18-OCT-2026 The Workbench commands are run through
+#///                      FaultInjectionBuildExecutor, which streams their
+#///                      output to the log files and stops them when they
+#///                      hang.
+#/// agent    18-OCT-2026 The files and folders to be deleted before building
+#///                      are now moved to the trash (see
+#///                      FaultInjectionTrash.py), which is deleted in the
+#///                      background while building, and the ones that could
+#///                      not be deleted are reported.
+#/// agent    18-OCT-2026 The files are checked out and their checkouts undone
+#///                      in batches through the version control backend of
+#///                      FaultInjectionVcs.py, which imports the ClearCase
+#///                      module only when it is first used.
+#/// agent    18-OCT-2026 Made the stray Safeboot continuation line of
+#///                      CNZ_PV_BSP_DKM_PARTIAL_IMAGE_OBJECTS_FOLDER a
+#///                      comment, so the module imports again.
 #/// @endif
 #///
 #/// @par Copyright (c) 2016 Rockwell Automation Technologies, Inc.  All rights reserved.
@@ -30,11 +49,14 @@
 #/////////////////////////////////////////////////////////////////////////////
 
 #-----------------------------------------------------------------------------
-import ClearCase  # For isCheckedOut, checkout, uncheckout
 import os         # For path
 import datetime   # For date
 import shutil     # For Copy
 import msvcrt     # For getch
+import FaultInjectionPatchEngine # For ModifyFile
+import FaultInjectionBuildExecutor # For FaultInjectionBuildExecutor
+import FaultInjectionTrash       # For FaultInjectionTrash
+import FaultInjectionVcs         # For GetVcsBackend
 
 # Define constants that need to be confirmed/modified at run time.
 # The order of projects in ENZTR_PROJECT_NAME and CNZ_PROJECT_NAME is
@@ -70,7 +92,8 @@ CNZ_MAIN_VIP_PROJECT_DEFAULT_FOLDER           = "\\LNX\\NetLinxUCS\\Proj_ICE2_CN
 ENZTR_PV_BSP_DKM_PARTIAL_IMAGE_OBJECTS_FOLDER = "\\LNX\\Platform\\BSP\\Board\\Ice2_ENzT\\PV\\Proj_ENzTR_PV_BSP_DKM\\ARMARCH7gnu\\Proj_ENzTR_PV_BSP_DKM_partialImage\\NonDebug\\Objects"
 
 CNZ_PV_BSP_DKM_PARTIAL_IMAGE_OBJECTS_FOLDER   = "\\LNX\\Platform\\BSP\\Board\\Ice2_CNz\\PV\\Proj_CNzR_PV_BSP_DKM\\ARMARCH7gnu\\Proj_CNzR_PV_BSP_DKM_partialImage\\NonDebug\\Objects"
-                                                "\\LNX\\Platform\\BSP\\Board\\Ice2_CNz\\PV\\Proj_CNzR-Safeboot_PV_BSP_DKM\\ARMARCH7gnu\\Proj_CNzR-Safeboot_PV_BSP_DKM_partialImage\\NonDebug\\Objects"
+# The Safeboot build of the CNz BSP is in
+#                                               "\\LNX\\Platform\\BSP\\Board\\Ice2_CNz\\PV\\Proj_CNzR-Safeboot_PV_BSP_DKM\\ARMARCH7gnu\\Proj_CNzR-Safeboot_PV_BSP_DKM_partialImage\\NonDebug\\Objects"
 
 WRWB_WORKSPACE = "C:\\workspaces\\workspace_diagnostics_fault_injection_testing_3.9.9"
 
@@ -88,11 +111,11 @@ VXWORKS_VERSION                               = "vxworks-6.9"
 
 WORKBENCH_ENVIRONMENT_COMMAND                 = "\\wrenv -p"
 
-WORKBENCH_BUILD_COMMAND                       = "\\x86-win32\\bin\\wrws_update.bat -data %s -f 0 -j %s -b build >> \"%s\\%s\" 2>>&1"
+WORKBENCH_BUILD_COMMAND                       = "\\x86-win32\\bin\\wrws_update.bat -data %s -f 0 -j %s -b build"
 
 HYPERVISOR_VERSION                            = " ICE2_HV_2.0 "
 
-WORKBENCH_MAKE_WORKSPACE_COMMAND              = "cscript /nologo %s\\LNX\\Platform\\Tools\\MakeWorkspace\\MakeWorkspace.wsf %s\\LNX %s %s  >> \"%s\\%s\" 2>>&1"
+WORKBENCH_MAKE_WORKSPACE_COMMAND              = "cscript /nologo %s\\LNX\\Platform\\Tools\\MakeWorkspace\\MakeWorkspace.wsf %s\\LNX %s %s"
 
 
 # Define constants that should not change.
@@ -187,6 +210,12 @@ class ProductSelectionOptions:
 # This class is used to process the fault injection script file.
 class FaultInjectionUtils:
 
+    def __init__(self):
+
+        # The version control backend the files are checked out with (the
+        # ClearCase module is only imported when a file is checked out).
+        self.Vcs = FaultInjectionVcs.GetVcsBackend("ClearCase")
+
     #-------------------------------------------------------------------------
     # Print a message to both the screen and the specified log file.
     def PrintToScreenAndFile(self, Message, PrintToScreen):
@@ -309,36 +338,14 @@ class FaultInjectionUtils:
     #-------------------------------------------------------------------------
     # Modify the file as specified in the fault injection script file's dictionary.
     def ModifyFile(self, fileModificationsDictionary, filename):
-        self.PrintToScreenAndFile("Modifying file %s" % self.FileToEditWithPath[self.currentFileToEditIndex], True)
-        fileToEdit = open(self.FileToEditWithPath[self.currentFileToEditIndex])
-        text = fileToEdit.read()
-        fileToEdit.close()
-        for newblock in fileModificationsDictionary[filename]:
-            newblock = newblock.strip()
-            patternStart = newblock.split('\n')[0]
-            patternEnd   = newblock.split('\n')[1]
-            patternEnd   = patternEnd.strip()
-            newblock_woPattern = newblock.replace(patternStart,'')
-            newblock_woPattern = newblock_woPattern.replace(patternEnd,'')
-            newblock_woPattern = newblock_woPattern.strip()
-            try:
-                start = text.index(patternStart)
-            except ValueError:
-                UnexpectedError = "Search pattern '%s' not found in %s" % (patternStart, self.FileToEditWithPath[self.currentFileToEditIndex])
-                self.PrintToScreenAndFile(UnexpectedError, False)
-                raise RuntimeError, UnexpectedError
-            try:
-                end = text.index(patternEnd, start) + len(patternEnd)
-            except ValueError:
-                UnexpectedError = "Search pattern '%s' not found in %s" % (patternEnd, self.FileToEditWithPath[self.currentFileToEditIndex])
-                self.PrintToScreenAndFile(UnexpectedError, False)
-                raise RuntimeError, UnexpectedError
-            result = text[start:end]
-            text = text.replace(result,newblock_woPattern)
-        fileToEdit = open(self.FileToEditWithPath[self.currentFileToEditIndex],'w')
-        fileToEdit.write(text)
-        fileToEdit.close()
-        self.PrintToScreenAndFile("File %s has been Modified" % self.FileToEditWithPath[self.currentFileToEditIndex], True)
+        fileNameWithPath = self.FileToEditWithPath[self.currentFileToEditIndex]
+        self.PrintToScreenAndFile("Modifying file %s" % fileNameWithPath, True)
+        try:
+            FaultInjectionPatchEngine.FaultInjectionPatchEngine().ModifyFile(fileNameWithPath, fileModificationsDictionary[filename])
+        except RuntimeError as UnexpectedError:
+            self.PrintToScreenAndFile(str(UnexpectedError), False)
+            raise
+        self.PrintToScreenAndFile("File %s has been Modified" % fileNameWithPath, True)
 
     #-------------------------------------------------------------------------
     # Process all of the file names in the fault injection script file's dictionary,
@@ -358,24 +365,31 @@ class FaultInjectionUtils:
                 raise RuntimeError, UnexpectedError
             filenameArray[self.FileToEditIndex] = filename
 
-        # Loop through all of the files to edit and process each one.
-        for self.currentFileToEditIndex in range(0, self.FileToEditIndex + 1):
-            # Check if the file is already checked out.
-            self.PrintToScreenAndFile("Checking if file %s is already checked out..." % self.FileToEditWithPath[self.currentFileToEditIndex], True)
-            if ClearCase.isCheckedOut(self.FileToEditWithPath[self.currentFileToEditIndex]):
-                UnexpectedError = "File %s already Checked Out!" % self.FileToEditWithPath[self.currentFileToEditIndex]
-                self.PrintToScreenAndFile(UnexpectedError, False)
-                raise RuntimeError, UnexpectedError
-            self.PrintToScreenAndFile("File %s is not already checked out" % self.FileToEditWithPath[self.currentFileToEditIndex], True)
-
-            # Check the file out.
-            self.PrintToScreenAndFile("Checking out file %s" % self.FileToEditWithPath[self.currentFileToEditIndex], True)
-            if ClearCase.checkout(self.FileToEditWithPath[self.currentFileToEditIndex], False, 'Temporary Checkout for Fault Injection Test.') != None:
-                UnexpectedError = "Error while trying to checkout file %s!" % self.FileToEditWithPath[self.currentFileToEditIndex]
+        # Check if the files are already checked out.
+        FilesToEditWithPath = self.FileToEditWithPath[0:self.FileToEditIndex + 1]
+        self.PrintToScreenAndFile("Checking if files %s are already checked out..." % ", ".join(FilesToEditWithPath), True)
+        Statuses = self.Vcs.GetStatus(FilesToEditWithPath)
+        for fileNameWithPath in FilesToEditWithPath:
+            if Statuses[fileNameWithPath]:
+                UnexpectedError = "File %s already Checked Out!" % fileNameWithPath
                 self.PrintToScreenAndFile(UnexpectedError, False)
                 raise RuntimeError, UnexpectedError
-            self.PrintToScreenAndFile("File %s has been checked out." % self.FileToEditWithPath[self.currentFileToEditIndex], True)
+        self.PrintToScreenAndFile("Files are not already checked out", True)
+
+        # Check the files out, as one batch.
+        self.PrintToScreenAndFile("Checking out files %s" % ", ".join(FilesToEditWithPath), True)
+        Errors = self.Vcs.CheckOut(FilesToEditWithPath)
+        for fileNameWithPath in FilesToEditWithPath:
+            if fileNameWithPath in Errors:
+                self.PrintToScreenAndFile("Error while trying to checkout file %s: %s" % (fileNameWithPath, Errors[fileNameWithPath]), False)
+            else:
+                self.PrintToScreenAndFile("File %s has been checked out." % fileNameWithPath, True)
+        if len(Errors) != 0:
+            UnexpectedError = "Error while trying to checkout files %s!" % ", ".join(sorted(Errors.keys()))
+            raise RuntimeError, UnexpectedError
 
+        # Loop through all of the files to edit and process each one.
+        for self.currentFileToEditIndex in range(0, self.FileToEditIndex + 1):
             # Modify the file.
             self.ModifyFile(fileModificationsDictionary, filenameArray[self.currentFileToEditIndex])
 
@@ -434,9 +448,12 @@ class FaultInjectionUtils:
                 else:
                     print("Invalid entry.")
             self.PrintToScreenAndFile("Making workspace %s..." % self.Workspace, True)
-            if os.system((WORKBENCH_PATH + WORKBENCH_ENVIRONMENT_COMMAND + " " + VXWORKS_VERSION + " " + WORKBENCH_MAKE_WORKSPACE_COMMAND \
-               % (self.ViewPath, self.ViewPath, HYPERVISOR_VERSION, self.Workspace, self.BuildResultsSubFolderName, MAKE_WORKSPACE_LOG_FILE_NAME))):
-                UnexpectedError = "Error while making the workspace! See %s\\%s for the errors!" % (self.BuildResultsSubFolderName, BUILD_LOG_FILE_NAME)
+            buildExecutor = FaultInjectionBuildExecutor.FaultInjectionBuildExecutor(self.BuildResultsSubFolderName + "\\" + MAKE_WORKSPACE_LOG_FILE_NAME)
+            result = buildExecutor.Run(WORKBENCH_PATH + WORKBENCH_ENVIRONMENT_COMMAND + " " + VXWORKS_VERSION + " " + WORKBENCH_MAKE_WORKSPACE_COMMAND \
+                                       % (self.ViewPath, self.ViewPath, HYPERVISOR_VERSION, self.Workspace))
+            self.PrintToScreenAndFile("Making workspace: %s" % result.GetSummary(), True)
+            if not result.IsSuccess():
+                UnexpectedError = "Error while making the workspace! See %s\\%s for the errors!" % (self.BuildResultsSubFolderName, MAKE_WORKSPACE_LOG_FILE_NAME)
                 self.PrintToScreenAndFile(UnexpectedError, False)
                 raise RuntimeError, UnexpectedError
             self.PrintToScreenAndFile("Workspace %s has been successfully created." % self.Workspace, True)
@@ -455,25 +472,27 @@ class FaultInjectionUtils:
         self.PrintToScreenAndFile("Building Modified Firmware...", True)
         self.PrintToScreenAndFile("For details, see build log file %s." % self.BuildResultsSubFolderName + "\\" + BUILD_LOG_FILE_NAME, True)
 
-        # Delete the old files and folders to be deleted before building.
+        # Move the old files and folders to be deleted before building to the
+        # trash, which is deleted in the background while building.
+        trash = FaultInjectionTrash.FaultInjectionTrash()
         for k in range(self.NumberOfFilesAndFoldersToDelete):
-            if os.path.exists(self.FilesAndFoldersToDeleteBeforeBuilding[k]):
-                try:
-                    # If it is a directory, use shutil.rmtree(). Otherwise, use os.remove().
-                    if os.path.isdir(self.FilesAndFoldersToDeleteBeforeBuilding[k]):
-                        shutil.rmtree(self.FilesAndFoldersToDeleteBeforeBuilding[k])
-                    else:
-                        os.remove(self.FilesAndFoldersToDeleteBeforeBuilding[k])
-                except:
-                    pass
+            trash.Discard(self.FilesAndFoldersToDeleteBeforeBuilding[k])
 
         # Perform the build.
-        for i in range(len(self.ProjectName)):
-            if os.system((WORKBENCH_PATH + WORKBENCH_ENVIRONMENT_COMMAND + " " + VXWORKS_VERSION + " " + WORKBENCH_PATH + WORKBENCH_VERSION + WORKBENCH_BUILD_COMMAND \
-                          % (self.Workspace, self.ProjectName[i], self.BuildResultsSubFolderName, BUILD_LOG_FILE_NAME))):
-                UnexpectedError = "Error while building the modified code! See %s\\%s for the errors!" % (self.BuildResultsSubFolderName, BUILD_LOG_FILE_NAME)
-                self.PrintToScreenAndFile(UnexpectedError, False)
-                raise RuntimeError, UnexpectedError
+        try:
+            buildExecutor = FaultInjectionBuildExecutor.FaultInjectionBuildExecutor(self.BuildResultsSubFolderName + "\\" + BUILD_LOG_FILE_NAME)
+            for i in range(len(self.ProjectName)):
+                result = buildExecutor.Run(WORKBENCH_PATH + WORKBENCH_ENVIRONMENT_COMMAND + " " + VXWORKS_VERSION + " " + WORKBENCH_PATH + WORKBENCH_VERSION + WORKBENCH_BUILD_COMMAND \
+                                           % (self.Workspace, self.ProjectName[i]))
+                self.PrintToScreenAndFile("Building %s: %s" % (self.ProjectName[i], result.GetSummary()), True)
+                if not result.IsSuccess():
+                    UnexpectedError = "Error while building the modified code! See %s\\%s for the errors!" % (self.BuildResultsSubFolderName, BUILD_LOG_FILE_NAME)
+                    self.PrintToScreenAndFile(UnexpectedError, False)
+                    raise RuntimeError, UnexpectedError
+        finally:
+            # Wait for the trash to be deleted and report what could not be.
+            for DeleteError in trash.Wait():
+                self.PrintToScreenAndFile("Could not delete %s" % DeleteError, True)
 
         # If the product build main binary file does not exist under the product build folder, return an error.
         if not os.path.exists(self.ViewPath + PRODUCTS_PATH + self.MainHipProject + BUILD_FILES_FOLDER_NAME + MAIN_BUILT_BINARY_FILE_NAME):
@@ -501,14 +520,20 @@ class FaultInjectionUtils:
     # dictionary that were checked out.
     def UndoCheckouts(self):
         self.PrintToScreenAndFile("Undoing Checkouts...", True)
-        for currentFileToEditIndex in range(0, self.FileToEditIndex + 1):
-            if ClearCase.isCheckedOut(self.FileToEditWithPath[currentFileToEditIndex]):
-                self.PrintToScreenAndFile("Undoing checkout of file %s..." % self.FileToEditWithPath[currentFileToEditIndex], True)
-                if ClearCase.uncheckout(self.FileToEditWithPath[currentFileToEditIndex], keep = True) != None:
-                    UnexpectedError = "Error while trying to uncheckout file %s!" % self.FileToEditWithPath[currentFileToEditIndex]
-                    self.PrintToScreenAndFile(UnexpectedError, False)
-                    raise RuntimeError, UnexpectedError
-                self.PrintToScreenAndFile("File %s has been unchecked out" % self.FileToEditWithPath[currentFileToEditIndex], True)
+        FilesToEditWithPath = self.FileToEditWithPath[0:self.FileToEditIndex + 1]
+        Statuses = self.Vcs.GetStatus(FilesToEditWithPath)
+        CheckedOutFilesWithPath = [fileNameWithPath for fileNameWithPath in FilesToEditWithPath if Statuses[fileNameWithPath]]
+        for fileNameWithPath in CheckedOutFilesWithPath:
+            self.PrintToScreenAndFile("Undoing checkout of file %s..." % fileNameWithPath, True)
+        Errors = self.Vcs.UndoCheckOut(CheckedOutFilesWithPath, Keep = True)
+        for fileNameWithPath in CheckedOutFilesWithPath:
+            if fileNameWithPath in Errors:
+                self.PrintToScreenAndFile("Error while trying to uncheckout file %s: %s" % (fileNameWithPath, Errors[fileNameWithPath]), False)
+            else:
+                self.PrintToScreenAndFile("File %s has been unchecked out" % fileNameWithPath, True)
+        if len(Errors) != 0:
+            UnexpectedError = "Error while trying to uncheckout files %s!" % ", ".join(sorted(Errors.keys()))
+            raise RuntimeError, UnexpectedError
 
     #-----------------------------------------------------------------------------
     # Merge the specified dictionaries into a new dictionary.
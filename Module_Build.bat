@@ -9,13 +9,25 @@ set PROJ_FOLDER_NAME=%2
 set PROJ_NAME=%3
 set APEX_DEST=%VIEW_PATH%\Analog\NextGen\apex\Release\apexbin.h
 
+rem Run the compiler through the fault injection compiler cache, if enabled
+IF DEFINED FIT_COMPILER_CACHE_SHIMS SET PATH=%FIT_COMPILER_CACHE_SHIMS%;%PATH%
+
+rem Run as many make jobs as the fault injection job server allows, if set
+SET MAKE_JOBS=
+IF DEFINED FIT_MAKE_JOBS SET MAKE_JOBS=-j%FIT_MAKE_JOBS%
+
+rem Define FIT_ID for a fault injection variant build, for the makefiles
+rem that add $(FIT_DEFINES) to the compiler flags
+SET FIT_DEFINES=
+IF DEFINED FIT_VARIANT_ID SET FIT_DEFINES=FIT_DEFINES=-DFIT_ID=%FIT_VARIANT_ID%
+
 rem Double check that the needed library does exist
 IF NOT EXIST %APEX_DEST% (
      EXIT 1
 )
 pushd %VIEW_PATH%\Analog\NextGen\Blackfin\%PROJ_FOLDER_NAME%
 
-"C:\Program Files\Analog Devices\VisualDSP 5.0\gmake-378" %PROJ_NAME%
+"C:\Program Files\Analog Devices\VisualDSP 5.0\gmake-378" %MAKE_JOBS% %FIT_DEFINES% %PROJ_NAME%
 
 popd
 
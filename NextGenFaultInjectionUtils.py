@@ -23,6 +23,101 @@
 #/// @if REVISION_HISTORY_INCLUDED
 #/// @par Edit History
 #/// tnhaley  14-JAN-2016 Created.
+#/// agent    18-OCT-2026 ModifyFile() now applies all blocks for a file in
+#///                      one pass through FaultInjectionPatchEngine and
+#///                      rejects ambiguous or overlapping blocks.
+#/// agent    18-OCT-2026 Files and markers are now resolved through the
+#///                      FaultInjectionCatalog index of the view's source
+#///                      folders.
+#/// agent    18-OCT-2026 Added FindViewPath(), CreateCatalog() and
+#///                      TARGET_MODE_EDIT_FOLDERS for use by
+#///                      FaultInjectionValidator.py.
+#/// agent    18-OCT-2026 Added FaultInjectionSession so
+#///                      FaultInjectionBatchRunner.py can share the view
+#///                      paths and catalog between scripts, and the
+#///                      TargetMode parameter of
+#///                      ModifyAndBuildFaultInjectionFile().
+#/// agent    18-OCT-2026 Added CreateTestDiscovery().
+#/// agent    18-OCT-2026 Files are now modified from a compiled patch plan
+#///                      (see FaultInjectionManifest.py), so fault injection
+#///                      manifest files can be built too.
+#/// agent    18-OCT-2026 Builds are now skipped when the same build inputs
+#///                      are in FaultInjectionBuildCache.
+#/// agent    18-OCT-2026 The compilers are now run through
+#///                      FaultInjectionCompilerCache and its statistics are
+#///                      logged for every test.
+#/// agent    18-OCT-2026 Added the incremental build mode (see
+#///                      FaultInjectionIncrementalBuild.py), which does not
+#///                      run the clean targets or modify the Apex makefile.
+#/// agent    18-OCT-2026 Apex is no longer built when it is not modified and
+#///                      the pristine Apex build of the session can be
+#///                      reused, the Blackfin project is built without the
+#///                      clean target when only apexbin.h changed, and only
+#///                      the changed binary files are copied to the build
+#///                      results folder.
+#/// agent    18-OCT-2026 Added FaultInjectionSession.Worktree: the files of a
+#///                      fault injection script file run in parallel with
+#///                      others are modified and built in its worktree
+#///                      instead of being checked out in the view.
+#/// agent    18-OCT-2026 The build output folders are copied and the other
+#///                      files linked to the worktree baseline, and only
+#///                      private copies are modified in a worktree.
+#/// agent    18-OCT-2026 The build commands are run with the job slots of
+#///                      FaultInjectionJobServer.
+#/// agent    18-OCT-2026 The Apex and Blackfin build steps wait for a seat of
+#///                      their resource pool (see
+#///                      FaultInjectionResourcePool.py).
+#/// agent    18-OCT-2026 The build commands are run through
+#///                      FaultInjectionBuildExecutor, which streams their
+#///                      output to BuildOutput.log and stops them when they
+#///                      hang.
+#/// agent    18-OCT-2026 Split the modifying, building and saving of a fault
+#///                      injection build into separate methods for the
+#///                      pipelined campaigns.
+#/// agent    18-OCT-2026 ModifyAndBuildFaultInjectionFile() now runs the
+#///                      script on a test thread of a
+#///                      FaultInjectionOrchestrator, which also runs the
+#///                      ClearCase commands and folder copies and publishes
+#///                      progress events.
+#/// agent    18-OCT-2026 Added ModifyAndBuildFaultInjectionVariants(), which
+#///                      checks out and modifies the files of a compile-time
+#///                      variant image once and builds it once per variant
+#///                      with FIT_ID set.
+#/// agent    18-OCT-2026 The builds now start from the baseline snapshots of
+#///                      the output folders (see FaultInjectionBaseline.py)
+#///                      instead of the clean targets, and the view's output
+#///                      folders are restored from them when the checkouts
+#///                      are undone.
+#/// agent    18-OCT-2026 Added the delta campaigns (see
+#///                      FaultInjectionTransition.py), in which the checkouts
+#///                      of a script are kept for the next one and only the
+#///                      files whose compiled blocks differ are modified
+#///                      again.
+#/// agent    18-OCT-2026 The output folders of a worktree build are now moved
+#///                      to the build results folder instead of copied.
+#/// agent    18-OCT-2026 The Apex makefile is no longer checked out and
+#///                      modified: the stale build artifacts of
+#///                      APEX_STALE_ARTIFACT_GLOBS are deleted on the file
+#///                      threads before the clean target instead.
+#/// agent    18-OCT-2026 The files are checked out and their checkouts undone
+#///                      in batches through the version control backend of
+#///                      FaultInjectionVcs.py, which imports the clearcase
+#///                      module only when it is first used.
+#/// agent    18-OCT-2026 The compiler cache is enabled in the environment of
+#///                      the build commands (see GetBuildEnvironment())
+#///                      instead of in the harness's, so concurrent tests
+#///                      keep their own statistics and later builds do not
+#///                      inherit it.
+#/// agent    18-OCT-2026 The builds set FIT_COMPILER_CACHE_ROOT to the folder
+#///                      being built.
+#/// agent    18-OCT-2026 Variant builds that did not compile their modified
+#///                      files with FIT_ID now fail.
+#/// agent    18-OCT-2026 Removed the unused msvcrt import, which is only on
+#///                      Windows.
+#/// agent    18-OCT-2026 Built the baseline snapshots under their lock, once
+#///                      per parallel campaign.
+#/// agent    18-OCT-2026 The patch plan of a script file run on its own is
+#///                      now taken from the patch plan cache.
 #/// @endif
 #///
 #/// @par Copyright (c) 2016 Rockwell Automation Technologies, Inc.  All rights reserved.
@@ -30,13 +125,28 @@
 #/////////////////////////////////////////////////////////////////////////////
 
 #-----------------------------------------------------------------------------
-import clearcase  # For isCheckedOut, checkout, uncheckout
 import os         # For path
 import datetime   # For date
 import shutil     # For Copy
-import msvcrt     # For getch
 import sys
 import importlib
+import copy       # For copying a session for a worktree
+import glob       # For the stale build artifacts
+import hashlib    # For sha1
+import FaultInjectionPatchEngine # For ModifyFile
+import FaultInjectionCatalog     # For FindFile, GetMarkers
+import FaultInjectionTestDiscovery # For FaultInjectionTestDiscovery
+import FaultInjectionManifest    # For CompileDictionary
+import FaultInjectionBuildCache  # For FaultInjectionBuildCache
+import FaultInjectionCompilerCache # For InstallShims, SummarizeStatistics
+import FaultInjectionIncrementalBuild # For FaultInjectionIncrementalBuild
+import FaultInjectionWorktree    # For FaultInjectionWorktreeFactory
+import FaultInjectionJobServer   # For FaultInjectionJobServer
+import FaultInjectionResourcePool # For FaultInjectionResourcePools
+import FaultInjectionBuildExecutor # For FaultInjectionBuildExecutor
+import FaultInjectionOrchestrator # For FaultInjectionOrchestrator
+import FaultInjectionBaseline    # For FaultInjectionBaseline
+import FaultInjectionVcs         # For GetVcsBackend
 
 
 # FaultInjectionUtils class
@@ -91,6 +201,41 @@ APEX_MAKE_CMD                                    = "all"
 APEX_BUILD_SCRIPT                                = "APEX2_Build_Test.bat"
 
 APEX_BUILD_FILES_FOLDER_NAME                     = "\\ApexRelease\\"
+
+APEX_BINARY_HEADER_FILE_NAME                     = "apexbin.h"
+
+# The build artifacts of Apex that its clean target leaves behind, relative
+# to its Release folder. They are deleted before the clean target is run.
+APEX_STALE_ARTIFACT_GLOBS                        = [APEX_BINARY_HEADER_FILE_NAME,
+                                                    "._2",
+                                                    "._4",
+                                                    "apex.*",
+                                                    "*.bin",
+                                                    "*.o",
+                                                    "*.d",
+                                                    "OS\\*.o",
+                                                    "OS\\*.d",
+                                                    "ControlBus\\*.o",
+                                                    "ControlBus\\*.d",
+                                                    "Utility\\*.o",
+                                                    "Utility\\*.d"]
+
+BLACKFIN_TOOLCHAIN_FOLDER                        = "C:\\Program Files\\Analog Devices\\VisualDSP 5.0"
+
+APEX_TOOLCHAIN_FOLDER                            = "C:\\Program Files\\ARM\\bin\\win_32-pentium"
+
+BLACKFIN_COMPILER                                = BLACKFIN_TOOLCHAIN_FOLDER + "\\ccblkfn.exe"
+
+APEX_COMPILER                                    = APEX_TOOLCHAIN_FOLDER + "\\armcc.exe"
+
+BLACKFIN_ASSEMBLER                               = BLACKFIN_TOOLCHAIN_FOLDER + "\\easmblkfn.exe"
+
+APEX_ASSEMBLER                                   = APEX_TOOLCHAIN_FOLDER + "\\armasm.exe"
+
+# Resource pools (see FaultInjectionResourcePool.py) of the build steps.
+BLACKFIN_RESOURCE_POOL_NAME                      = "vdsp_gmake"
+
+APEX_RESOURCE_POOL_NAME                          = "arm_cc"
 # Define constants that should not change.
 SEARCH_VOB_STR                                            = "\\FIT"
 
@@ -98,6 +243,39 @@ SEARCH_BRANCH_STR                                         = "\\Analog\NextGen\\F
 
 BUILD_RESULTS_FOLDER_NAME                                 = "Build_Results"
 
+PRISTINE_APEX_FOLDER_NAME                                 = "Build_Cache\\PristineApex"
+
+# Source folders (relative to the view path) indexed by the fault injection
+# point catalog, and the build output folders that are not indexed.
+CATALOG_SOURCE_ROOTS                                      = [APEX_PRODUCT_FOLDER,
+                                                             BLACKFIN_PRODUCT_FOLDER + "\\" + BLACKFIN_DIAG_PATH,
+                                                             BLACKFIN_PRODUCT_FOLDER + "\\" + BLACKFIN_OS_PATH,
+                                                             BLACKFIN_PRODUCT_FOLDER + "\\" + BLACKFIN_TOOLKIT_PATH,
+                                                             BLACKFIN_PRODUCT_FOLDER + "\\" + BLACKFIN_PROJECT_FOLDER_IF8I,
+                                                             BLACKFIN_PRODUCT_FOLDER + "\\" + BLACKFIN_PROJECT_FOLDER_IRT8I]
+
+CATALOG_SKIPPED_FOLDER_NAMES                              = [APEX_PROJECT_FOLDER, BLACKFIN_BUILD_TYPE_FOLDER]
+
+# Folders (relative to the view path) that are copied to the worktree of a
+# fault injection script file run in parallel with others.
+WORKTREE_SOURCE_FOLDER_NAMES                              = [APEX_PRODUCT_FOLDER, BLACKFIN_PRODUCT_FOLDER]
+
+# Build results subfolders saved in the build cache.
+BUILD_CACHE_OUTPUT_FOLDER_NAMES                           = [BLACKFIN_BUILD_FILES_FOLDER_NAME.strip("\\"), APEX_BUILD_FILES_FOLDER_NAME.strip("\\")]
+
+# Build output folders of the worktree source folders, which are copied
+# instead of linked to the worktree baseline.
+WORKTREE_OUTPUT_FOLDER_NAMES                              = [APEX_PROJECT_FOLDER, BLACKFIN_BUILD_TYPE_FOLDER]
+
+# Folder (relative to the view path) of the source files that are modified in
+# each build target (command line parameter).
+TARGET_MODE_EDIT_FOLDERS                                  = {"BlackfinDiag"         : BLACKFIN_PRODUCT_FOLDER + "\\" + BLACKFIN_DIAG_PATH,
+                                                             "BlackfinOS"           : BLACKFIN_PRODUCT_FOLDER + "\\" + BLACKFIN_OS_PATH,
+                                                             "BlackfinToolkit"      : BLACKFIN_PRODUCT_FOLDER + "\\" + BLACKFIN_TOOLKIT_PATH,
+                                                             "BlackfinProjectIRT8I" : BLACKFIN_PRODUCT_FOLDER + "\\" + BLACKFIN_PROJECT_FOLDER_IRT8I,
+                                                             "BlackfinProjectIF8I"  : BLACKFIN_PRODUCT_FOLDER + "\\" + BLACKFIN_PROJECT_FOLDER_IF8I,
+                                                             "ApexDiag"             : APEX_PRODUCT_FOLDER + "\\" + APEX_DIAG_PATH,
+                                                             "ApexOS"               : APEX_PRODUCT_FOLDER + "\\" + APEX_OS_PATH}
 
 MAX_NUMBER_OF_SRC_FOLDERS_ALLOWED_TO_BE_MODIFIED          = 100
 
@@ -107,11 +285,123 @@ MAX_NUMBER_OF_FILES_AND_FOLDERS_TO_DELETE_BEFORE_BUILDING = 100
 
 MAX_NUMBER_OF_BUILDS_PER_SCRIPT_PER_PRODUCT_PER_DAY       = 50
 
-class FaultInjectionUtils:
+#-----------------------------------------------------------------------------
+# Delete a file. Returns False if it could not be deleted.
+def DeleteFile(fileNameWithPath):
+    try:
+        os.remove(fileNameWithPath)
+        return True
+    except OSError:
+        return False
+
+# FaultInjectionSession class
+# This class holds the state that is shared by all of the fault injection
+# script files that are run in one process (see FaultInjectionBatchRunner.py),
+# so that it is only determined once per campaign instead of once per script.
+class FaultInjectionSession:
 
     def __init__(self):
 
-        pass
+        self.ViewPath = None
+
+        self.BranchPath = None
+
+        self.Catalog = None
+
+        self.SourceCache = FaultInjectionPatchEngine.FaultInjectionSourceCache()
+
+        self.BuildCache = None
+
+        self.IsCompilerCacheInstalled = False
+
+        self.IncrementalBuild = None
+
+        # Product build folder -> the modified files (and for the Blackfin
+        # project, the apexbin.h) that its objects were last built from.
+        self.ProductBuildKeys = {}
+
+        self.PristineApexFolder = None
+
+        # Product binary folder -> the build results folder it was last
+        # copied to and the size and time of each of its files.
+        self.BinaryFolderCopies = {}
+
+        # The worktree the files are modified and built in (see
+        # FaultInjectionWorktree.py), or None to use the view itself.
+        self.Worktree = None
+
+        self.IncrementalBuildStateFileName = BUILD_RESULTS_FOLDER_NAME + "\\" + FaultInjectionIncrementalBuild.INCREMENTAL_BUILD_STATE_FILE_NAME
+
+        self.PristineApexFolderName = PRISTINE_APEX_FOLDER_NAME
+
+        # The job slots shared with the other processes of the campaign.
+        self.JobServer = None
+
+        # The license seats shared with the other processes of the campaign,
+        # and the priority of this process's build steps (lowest first).
+        self.ResourcePools = None
+
+        self.SchedulingPriority = 0
+
+        # The thread pools and the event bus of the session.
+        self.Orchestrator = None
+
+        # The baseline snapshots of the output folders.
+        self.Baseline = None
+
+        # The version control backend the files are checked out with.
+        self.Vcs = None
+
+        # Set for a delta campaign (see FaultInjectionTransition.py), in which
+        # the checkouts of a fault injection script file are kept for the
+        # next one.
+        self.IsDeltaTransition = False
+
+        # File kept checked out and modified for the next fault injection
+        # script file -> the hash of its compiled blocks and its unmodified
+        # text.
+        self.PatchedFileStates = {}
+
+    #-------------------------------------------------------------------------
+    # Return a session for a fault injection script file run in a worktree.
+    # It shares everything with this session except what is known about the
+    # build folders, which are the worktree's.
+    def CreateWorktreeSession(self, worktree, SchedulingPriority):
+        session = copy.copy(self)
+        session.Worktree = worktree
+        session.SchedulingPriority = SchedulingPriority
+        session.IncrementalBuild = None
+        session.IncrementalBuildStateFileName = os.path.join(worktree.Folder, FaultInjectionIncrementalBuild.INCREMENTAL_BUILD_STATE_FILE_NAME)
+        session.ProductBuildKeys = {}
+        session.BinaryFolderCopies = {}
+        session.IsDeltaTransition = False
+        session.PatchedFileStates = {}
+        return session
+
+class FaultInjectionUtils:
+
+    def __init__(self, Session = None):
+
+        if Session is None:
+            Session = FaultInjectionSession()
+        self.Session = Session
+
+        self.Catalog = None
+
+        # Set for the builds of a compile-time variant image (see
+        # FaultInjectionMultiFault.py), which are built with FIT_ID set to
+        # the variant ID.
+        self.IsVariantBuild = False
+
+        self.VariantId = None
+
+        # The environment variables that run the compilers of the build
+        # commands through the compiler cache (see EnableCompilerCache()).
+        self.CompilerCacheEnvironment = {}
+
+        # The key of the baseline snapshots the builds start from, or None if
+        # they do not start from a baseline snapshot.
+        self.BaselineKey = None
 
 	#-------------------------------------------------------------------------
     # Print a message to both the screen and the specified log file.
@@ -169,6 +459,13 @@ class FaultInjectionUtils:
         LogFilePathAndName = self.BuildResultsSubFolderName + "\\" + JustFileName + ".log"
         self.LogFile = open(LogFilePathAndName,'w')
 
+        # The ClearCase commands and the folder copies are run on the
+        # orchestrator's thread pools.
+        self.LoadOrchestrator()
+
+        # The output of the build commands is saved next to the log file.
+        self.BuildExecutor = FaultInjectionBuildExecutor.FaultInjectionBuildExecutor(self.BuildResultsSubFolderName + "\\" + FaultInjectionBuildExecutor.BUILD_OUTPUT_FILE_NAME)
+
         # Print a separator line to make screen output easier to read.
         self.PrintToScreenAndFile("-----------------------------------------------------------", True)
 
@@ -177,41 +474,86 @@ class FaultInjectionUtils:
         self.PrintToScreenAndFile("self.BuildResultsSubFolderName = %s" % self.BuildResultsSubFolderName, True)
         self.PrintToScreenAndFile("LogFilePathAndName = %s" % LogFilePathAndName, True)
 
-        # Extract the view path from the current working directory.
-        vobStrIndex = cwdStr.find(SEARCH_VOB_STR)
-
-        # Search for SEARCH_VOB_STR in the current working directory.
-        if vobStrIndex < 0:
-            UnexpectedError = "Search VOB string '%s' not in current working directory (%s)" % (SEARCH_VOB_STR, cwdStr)
-            self.PrintToScreenAndFile(UnexpectedError, False)
-            raise RuntimeError, UnexpectedError
-
-        vobBranchPathIndex = cwdStr.find(SEARCH_BRANCH_STR)
-        if vobBranchPathIndex < 0:
-            UnexpectedError = "Search VOB string '%s' not in current working directory (%s)" % (vobBranchPathIndex, cwdStr)
-            self.PrintToScreenAndFile(UnexpectedError, False)
-            raise RuntimeError, UnexpectedError
-
+        # Extract the view path from the current working directory (only once
+        # per session).
+        if self.Session.ViewPath is None:
+            try:
+                self.Session.ViewPath, self.Session.BranchPath = self.FindViewPath(cwdStr)
+            except RuntimeError as UnexpectedError:
+                self.PrintToScreenAndFile(str(UnexpectedError), False)
+                raise
+        self.ViewPath = self.Session.ViewPath
+        BranchPath = self.Session.BranchPath
 
-        # SEARCH_VOB_STR was found so the view path is the current working directory truncated at the VOB string index.
-        self.ViewPath = cwdStr[:vobStrIndex]
         self.PrintToScreenAndFile("self.ViewPath = %s" % self.ViewPath, True)
-        BranchPath = cwdStr[:vobBranchPathIndex]
 
         self.PrintToScreenAndFile("BranchPath = %s" % self.ViewPath, True)
 
+        # Modify and build the files in the session's worktree (if any)
+        # instead of in the view. The view path is still used to find the
+        # files in the fault injection point catalog.
+        self.Worktree = self.Session.Worktree
+        if self.Worktree is None:
+            self.BuildViewPath = self.ViewPath
+        else:
+            self.BuildViewPath = self.Worktree.ViewPath
+            BranchPath = self.Worktree.BranchPath
+            self.PrintToScreenAndFile("Building in worktree %s" % self.Worktree.Folder, True)
+
         self.BlackfinCleanBuildCmd = ".\\" + BLACKFIN_BUILD_SCRIPT + " " + BranchPath + " " + self.BlackfinProjectFolder + " " + self.BlackfinMakeCleanCmd
 		
         self.BlackfinBuildExecutableCmd = ".\\" + BLACKFIN_BUILD_SCRIPT + " " + BranchPath + " " + self.BlackfinProjectFolder + " " + self.BlackfinMakeCmd
 
-        self.BlackfinResultsOfBuildFolder = self.ViewPath + "\\" + BLACKFIN_PRODUCT_FOLDER + "\\"  + self.BlackfinProjectFolder + "\\" + BLACKFIN_BUILD_TYPE_FOLDER
+        self.BlackfinResultsOfBuildFolder = self.BuildViewPath + "\\" + BLACKFIN_PRODUCT_FOLDER + "\\"  + self.BlackfinProjectFolder + "\\" + BLACKFIN_BUILD_TYPE_FOLDER
 
         self.ApexCleanBuildCmd = ".\\" + APEX_BUILD_SCRIPT + " " + BranchPath + " " + APEX_MAKE_CLEAN_CMD
 		
         self.ApexBuildExecutableCmd = ".\\" + APEX_BUILD_SCRIPT + " " + BranchPath + " " + APEX_MAKE_CMD
 
-        self.ApexResultsOfBuildFolder = self.ViewPath + "\\" + APEX_PRODUCT_FOLDER + "\\"  + APEX_PROJECT_FOLDER
+        self.ApexResultsOfBuildFolder = self.BuildViewPath + "\\" + APEX_PRODUCT_FOLDER + "\\"  + APEX_PROJECT_FOLDER
+
+        # The folders the build scripts run make in (see APEX2_Build_Test.bat
+        # and Module_Build.bat), which the dependency files are relative to.
+        self.ApexMakeFolder = self.ApexResultsOfBuildFolder
 
+        # The folder the Apex binary files are copied from, which is the
+        # pristine Apex build of the session when Apex is not built.
+        self.ApexBinaryFolder = self.ApexResultsOfBuildFolder
+
+        self.BlackfinMakeFolder = self.BuildViewPath + "\\" + BLACKFIN_PRODUCT_FOLDER + "\\"  + self.BlackfinProjectFolder
+
+        try:
+            self.IsIncrementalBuild = FaultInjectionIncrementalBuild.IsIncrementalBuildMode()
+        except RuntimeError as UnexpectedError:
+            self.PrintToScreenAndFile(str(UnexpectedError), False)
+            raise
+
+        # The incremental build state does not know which objects depend on
+        # FIT_ID, so the variants are built with the clean targets.
+        if self.IsIncrementalBuild and self.IsVariantBuild:
+            self.PrintToScreenAndFile("The incremental build mode is not used for the variant builds", True)
+            self.IsIncrementalBuild = False
+
+        self.PrintToScreenAndFile("self.IsIncrementalBuild = %s" % self.IsIncrementalBuild, True)
+
+
+    #-------------------------------------------------------------------------
+    # Extract the view path and the branch path from the specified folder,
+    # which must be inside the FIT folder of a view.
+    def FindViewPath(self, cwdStr):
+        # Search for SEARCH_VOB_STR in the current working directory.
+        vobStrIndex = cwdStr.find(SEARCH_VOB_STR)
+        if vobStrIndex < 0:
+            UnexpectedError = "Search VOB string '%s' not in current working directory (%s)" % (SEARCH_VOB_STR, cwdStr)
+            raise RuntimeError, UnexpectedError
+
+        vobBranchPathIndex = cwdStr.find(SEARCH_BRANCH_STR)
+        if vobBranchPathIndex < 0:
+            UnexpectedError = "Search VOB string '%s' not in current working directory (%s)" % (SEARCH_BRANCH_STR, cwdStr)
+            raise RuntimeError, UnexpectedError
+
+        # SEARCH_VOB_STR was found so the view path is the current working directory truncated at the VOB string index.
+        return (cwdStr[:vobStrIndex], cwdStr[:vobBranchPathIndex])
 
     def IsFileFoundInPath( self, path, filename ):
         isFileFound = False
@@ -225,12 +567,273 @@ class FaultInjectionUtils:
        
         return isFileFound
 
+    #-------------------------------------------------------------------------
+    # Create the fault injection point catalog of a view's source folders.
+    def CreateCatalog(self, ViewPath):
+        return FaultInjectionCatalog.FaultInjectionCatalog(ViewPath, CATALOG_SOURCE_ROOTS, \
+                                                           BUILD_RESULTS_FOLDER_NAME + "\\" + FaultInjectionCatalog.CATALOG_INDEX_FILE_NAME, \
+                                                           CATALOG_SKIPPED_FOLDER_NAMES)
+
+    #-------------------------------------------------------------------------
+    # Create the discovery of the fault injection script files, which caches
+    # the script files' specs and patch plans in the build results folder.
+    def CreateTestDiscovery(self):
+        return FaultInjectionTestDiscovery.FaultInjectionTestDiscovery(BUILD_RESULTS_FOLDER_NAME + "\\" + FaultInjectionTestDiscovery.TEST_SPEC_CACHE_FILE_NAME, \
+                                                                       BUILD_RESULTS_FOLDER_NAME + "\\" + FaultInjectionManifest.PATCH_PLAN_CACHE_FILE_NAME)
+
+    #-------------------------------------------------------------------------
+    # Return the patch plan of a fault injection script file's dictionary.
+    # The plan is taken from the patch plan cache of the discovery, keyed by
+    # the hash of the script file's contents, and is only compiled (and
+    # saved to the cache) when the script file has changed.
+    def GetPatchPlan(self, fileModificationsDictionary, TestName):
+        compileFunction = lambda: FaultInjectionManifest.CompileDictionary(fileModificationsDictionary)
+        if not os.path.isfile(TestName):
+            return compileFunction()
+        testFile = open(TestName, 'rb')
+        fileHash = hashlib.sha1(testFile.read()).hexdigest()
+        testFile.close()
+        planCache = self.CreateTestDiscovery().PlanCache
+        PatchPlan = planCache.GetPlan(fileHash, compileFunction)
+        planCache.Save()
+        return PatchPlan
+
+    #-------------------------------------------------------------------------
+    # Create the factory of the worktrees of a view.
+    def CreateWorktreeFactory(self, ViewPath, BranchPath):
+        return FaultInjectionWorktree.FaultInjectionWorktreeFactory(ViewPath, BranchPath, WORKTREE_SOURCE_FOLDER_NAMES, WORKTREE_OUTPUT_FOLDER_NAMES)
+
+    #-------------------------------------------------------------------------
+    # Load the fault injection point catalog of the view's source folders
+    # (only once per session).
+    def LoadCatalog(self):
+        if self.Session.Catalog is None:
+            self.Session.Catalog = self.CreateCatalog(self.ViewPath)
+            self.Session.Catalog.Load()
+            self.PrintToScreenAndFile("Fault injection point catalog loaded (%d files, %d rescanned)" % (len(self.Session.Catalog.Files), self.Session.Catalog.ScannedFileCount), True)
+        self.Catalog = self.Session.Catalog
+
+    #-------------------------------------------------------------------------
+    # Load the build cache (only once per session).
+    def LoadBuildCache(self):
+        if self.Session.BuildCache is None:
+            # The index is loaded by every restore and store, with the index locked.
+            self.Session.BuildCache = FaultInjectionBuildCache.FaultInjectionBuildCache()
+        self.BuildCache = self.Session.BuildCache
+
+    #-------------------------------------------------------------------------
+    # Load the job server of the build commands (only once per session).
+    def LoadJobServer(self):
+        if self.Session.JobServer is None:
+            self.Session.JobServer = FaultInjectionJobServer.FaultInjectionJobServer()
+        self.JobServer = self.Session.JobServer
+
+    #-------------------------------------------------------------------------
+    # Load the resource pools of the build steps (only once per session).
+    def LoadResourcePools(self):
+        if self.Session.ResourcePools is None:
+            self.Session.ResourcePools = FaultInjectionResourcePool.FaultInjectionResourcePools()
+        self.ResourcePools = self.Session.ResourcePools
+
+    #-------------------------------------------------------------------------
+    # Load the orchestrator (only once per session).
+    def LoadOrchestrator(self):
+        if self.Session.Orchestrator is None:
+            self.Session.Orchestrator = FaultInjectionOrchestrator.FaultInjectionOrchestrator()
+        self.Orchestrator = self.Session.Orchestrator
+
+        # The ClearCase commands of a batch of files are run on the VCS
+        # threads.
+        if self.Session.Vcs is None:
+            self.Session.Vcs = FaultInjectionVcs.GetVcsBackend("clearcase", self.Orchestrator.VcsPool)
+        self.Vcs = self.Session.Vcs
+
+    #-------------------------------------------------------------------------
+    # Load the baseline snapshots (only once per session).
+    def LoadBaseline(self):
+        if self.Session.Baseline is None:
+            self.Session.Baseline = FaultInjectionBaseline.FaultInjectionBaseline()
+        self.Baseline = self.Session.Baseline
+
+    #-------------------------------------------------------------------------
+    # Determine the key of the baseline snapshots: the fingerprint of the
+    # pristine source files, the build scripts, the make targets and the
+    # toolchains.
+    def GetBaselineKey(self):
+        self.LoadBuildCache()
+        baselineInputs = {"Fingerprint"   : self.Catalog.GetFingerprint(),
+                          "BuildScripts"  : [FaultInjectionBuildCache.GetFileHash(APEX_BUILD_SCRIPT), FaultInjectionBuildCache.GetFileHash(BLACKFIN_BUILD_SCRIPT)],
+                          "MakeTargets"   : [APEX_MAKE_CLEAN_CMD, APEX_MAKE_CMD, self.BlackfinProjectFolder, self.BlackfinMakeCleanCmd, self.BlackfinMakeCmd],
+                          "Toolchains"    : [self.BuildCache.GetToolchainIdentity(APEX_TOOLCHAIN_FOLDER), self.BuildCache.GetToolchainIdentity(BLACKFIN_TOOLCHAIN_FOLDER)]}
+        return self.BuildCache.GetKey(baselineInputs)
+
+    #-------------------------------------------------------------------------
+    # Return the name of an output folder relative to the build view path,
+    # which is the name of its baseline snapshot.
+    def GetOutputFolderName(self, ResultsOfBuildFolder):
+        return ResultsOfBuildFolder[len(self.BuildViewPath):].strip("\\")
+
+    #-------------------------------------------------------------------------
+    # Make sure that the baseline snapshots of Apex and of the Blackfin
+    # project exist, building the products that have none from the
+    # unmodified files first. Must be called before the files are modified.
+    # The incremental build mode does not use the baseline snapshots.
+    def PrepareBaseline(self):
+        self.BaselineKey = None
+        self.LoadBaseline()
+        if not self.Baseline.IsEnabled() or self.IsIncrementalBuild:
+            return
+        BaselineKey = self.GetBaselineKey()
+
+        # Apex is first since the Blackfin project needs its apexbin.h.
+        Products = [(self.ApexCleanBuildCmd, self.ApexBuildExecutableCmd, APEX_RESOURCE_POOL_NAME, self.ApexResultsOfBuildFolder),
+                    (self.BlackfinCleanBuildCmd, self.BlackfinBuildExecutableCmd, BLACKFIN_RESOURCE_POOL_NAME, self.BlackfinResultsOfBuildFolder)]
+        OutputFolderNames = [self.GetOutputFolderName(Product[3]) for Product in Products]
+        if all([self.Baseline.HasSnapshot(BaselineKey, OutputFolderName) for OutputFolderName in OutputFolderNames]):
+            self.BaselineKey = BaselineKey
+            return
+
+        # The worker processes of a parallel campaign build the baseline
+        # once: the first one builds it while the others wait for the lock,
+        # and then find its snapshots.
+        self.Baseline.Lock()
+        try:
+            if not all([self.Baseline.HasSnapshot(BaselineKey, OutputFolderName) for OutputFolderName in OutputFolderNames]):
+                self.BuildBaseline(BaselineKey, Products)
+        finally:
+            self.Baseline.Unlock()
+        self.BaselineKey = BaselineKey
+
+    #-------------------------------------------------------------------------
+    # Build the products that have no baseline snapshot for a key from the
+    # unmodified files and save their snapshots. The baseline snapshots must
+    # be locked.
+    def BuildBaseline(self, BaselineKey, Products):
+        self.PrintToScreenAndFile("Building the baseline snapshots (%s) from the unmodified files..." % BaselineKey, True)
+        # The files kept modified by the previous script are not unmodified.
+        self.RevertPatchedFiles([])
+        self.LoadJobServer()
+        self.LoadResourcePools()
+        self.EnableCompilerCache()
+        try:
+            for CleanBuildCmd, BuildExecutableCmd, ResourcePoolName, ResultsOfBuildFolder in Products:
+                OutputFolderName = self.GetOutputFolderName(ResultsOfBuildFolder)
+                self.Session.ProductBuildKeys.pop(ResultsOfBuildFolder, None)
+                if self.Orchestrator.RunFileOperation(self.Baseline.Restore, BaselineKey, ResultsOfBuildFolder, OutputFolderName) is not None:
+                    continue
+                if not self.RunCleanBuildStep(CleanBuildCmd, ResourcePoolName, ResultsOfBuildFolder) or not self.RunBuildStep(BuildExecutableCmd, ResourcePoolName):
+                    UnexpectedError = "Error while building the baseline of %s from the unmodified files!" % OutputFolderName
+                    self.PrintToScreenAndFile(UnexpectedError, False)
+                    raise RuntimeError, UnexpectedError
+                SavedCount = self.Orchestrator.RunFileOperation(self.Baseline.Save, BaselineKey, ResultsOfBuildFolder, OutputFolderName)
+                self.PrintToScreenAndFile("Saved the baseline snapshot of %s (%d files)" % (OutputFolderName, SavedCount), True)
+            self.Orchestrator.RunFileOperation(self.Baseline.Evict)
+        finally:
+            self.ReportCompilerCache()
+
+    #-------------------------------------------------------------------------
+    # Restore an output folder from its baseline snapshot. Returns False if
+    # the builds do not start from a baseline snapshot.
+    def RestoreBaselineSnapshot(self, ResultsOfBuildFolder):
+        if self.BaselineKey is None or not self.Orchestrator.RunFileOperation(self.Baseline.Touch, self.BaselineKey):
+            return False
+        Counts = self.Orchestrator.RunFileOperation(self.Baseline.Restore, self.BaselineKey, ResultsOfBuildFolder, self.GetOutputFolderName(ResultsOfBuildFolder))
+        if Counts is None:
+            return False
+        self.PrintToScreenAndFile("Restored %s from its baseline snapshot (%d files copied, %d deleted)" % (ResultsOfBuildFolder, Counts[0], Counts[1]), True)
+        return True
+
+    #-------------------------------------------------------------------------
+    # Publish an event of the fault injection script file on the event bus
+    # of the orchestrator.
+    def PublishEvent(self, EventName, **Data):
+        self.Orchestrator.EventBus.Publish(EventName, self.TestName, **Data)
+
+    #-------------------------------------------------------------------------
+    # Load the incremental build state (only once per session).
+    def LoadIncrementalBuild(self):
+        if self.Session.IncrementalBuild is None:
+            self.Session.IncrementalBuild = FaultInjectionIncrementalBuild.FaultInjectionIncrementalBuild(self.Session.IncrementalBuildStateFileName)
+            self.Session.IncrementalBuild.Load()
+        self.IncrementalBuild = self.Session.IncrementalBuild
+
+    #-------------------------------------------------------------------------
+    # Determine the build cache key of the modified code: the patched files,
+    # the pristine source files, the build scripts, the make targets and the
+    # toolchains.
+    def GetBuildCacheKey(self):
+        patchedFiles = []
+        for currentFileToEditIndex in range(0, self.FileToEditIndex + 1):
+            fileNameWithPath = self.FileToEditWithPath[currentFileToEditIndex]
+            patchedFiles.append([os.path.normcase(fileNameWithPath[len(self.BuildViewPath):]), FaultInjectionBuildCache.GetFileHash(fileNameWithPath)])
+
+        buildInputs = {"PatchedFiles"  : sorted(patchedFiles),
+                       "Fingerprint"   : self.Catalog.GetFingerprint(),
+                       "BuildScripts"  : [FaultInjectionBuildCache.GetFileHash(APEX_BUILD_SCRIPT), FaultInjectionBuildCache.GetFileHash(BLACKFIN_BUILD_SCRIPT)],
+                       "MakeTargets"   : [APEX_MAKE_CLEAN_CMD, APEX_MAKE_CMD, self.BlackfinProjectFolder, self.BlackfinMakeCleanCmd, self.BlackfinMakeCmd],
+                       "Toolchains"    : [self.BuildCache.GetToolchainIdentity(APEX_TOOLCHAIN_FOLDER), self.BuildCache.GetToolchainIdentity(BLACKFIN_TOOLCHAIN_FOLDER)]}
+        if self.VariantId is not None:
+            buildInputs["VariantId"] = self.VariantId
+        return self.BuildCache.GetKey(buildInputs)
+
+    #-------------------------------------------------------------------------
+    # Build the modified code, unless the same build is in the build cache,
+    # in which case its binary folders are copied to the build results
+    # subfolder instead.
+    def BuildOrRestoreModifiedCode(self):
+        self.BuildCacheKey = None
+        self.IsBuildRestored = False
+
+        self.LoadBuildCache()
+        if not self.BuildCache.IsEnabled():
+            self.BuildModifiedCode()
+            return
+
+        self.BuildCacheKey = self.GetBuildCacheKey()
+        if self.BuildCache.Restore(self.BuildCacheKey, self.BuildResultsSubFolderName, BUILD_CACHE_OUTPUT_FOLDER_NAMES):
+            self.PrintToScreenAndFile("Build cache hit (%s), the binary files folders were restored from the build cache" % self.BuildCacheKey, True)
+            self.IsBuildRestored = True
+            self.PublishEvent(FaultInjectionOrchestrator.EVENT_BUILD_RESTORED, BuildCacheKey = self.BuildCacheKey)
+        else:
+            self.PrintToScreenAndFile("Build cache miss (%s)" % self.BuildCacheKey, True)
+            self.BuildModifiedCode()
+
+    #-------------------------------------------------------------------------
+    # Copy the product build binary folders of the modified code to the build
+    # results subfolder and save them in the build cache (unless they were
+    # restored from it).
+    def SaveModifiedCodeBuild(self):
+        if not self.IsBuildRestored:
+            self.CopyBinaryFolder()
+            if self.BuildCacheKey is not None:
+                self.BuildCache.Store(self.BuildCacheKey, self.BuildResultsSubFolderName, BUILD_CACHE_OUTPUT_FOLDER_NAMES)
+        if self.BuildCache.IsEnabled():
+            self.PrintToScreenAndFile(self.BuildCache.GetStatistics(), True)
+
+    #-------------------------------------------------------------------------
+    # Close the log file of the fault injection script file.
+    def CloseLogFile(self):
+        if hasattr(self, "LogFile") and not self.LogFile.closed:
+            self.LogFile.close()
+
     #-------------------------------------------------------------------------
     # Check if the file found is in the list of folders allowed to be modified.
     def IsFileFoundInDiagnosticSourceFileFolder(self, filename):
         self.SourceFileName = filename
 
-        return self.IsFileFoundInPath( self.DiagEditPath, filename )
+        if self.Catalog is None:
+            return self.IsFileFoundInPath( self.DiagEditPath, filename )
+
+        FileToEditWithPath = self.Catalog.FindFile(self.DiagEditPath, filename)
+        if FileToEditWithPath is None:
+            return False
+
+        # Modify the worktree's copy of the file (if building in a worktree).
+        FileToEditWithPath = self.BuildViewPath + FileToEditWithPath[len(self.ViewPath):]
+
+        self.FileToEditIndex += 1
+        self.FileToEditWithPath[self.FileToEditIndex] = FileToEditWithPath
+        return True
 
     #-------------------------------------------------------------------------
     # Check if the file found is in the list of folders allowed to be modified.
@@ -253,49 +856,135 @@ class FaultInjectionUtils:
         return False
 
     #-------------------------------------------------------------------------
-    # Modify the file as specified in the fault injection script file's dictionary.
-    def ModifyFile(self, fileModificationsDictionary, filename, fileNameWithPath):
+    # Modify the file as specified in the fault injection script file's patch
+    # plan (the compiled dictionary, see FaultInjectionManifest).
+    def ModifyFile(self, patchPlan, filename, fileNameWithPath):
         self.PrintToScreenAndFile("Modifying file %s" % fileNameWithPath, True)
-        fileToEdit = open(fileNameWithPath)
-        text = fileToEdit.read()
-        fileToEdit.close()
-        for newblock in fileModificationsDictionary[filename]:
-            newblock = newblock.strip()
-            patternStart = newblock.split('\n')[0]
-            patternEnd   = newblock.split('\n')[1]
-            patternEnd   = patternEnd.strip()
-            newblock_woPattern = newblock.replace(patternStart,'')
-            newblock_woPattern = newblock_woPattern.replace(patternEnd,'')
-            newblock_woPattern = newblock_woPattern.strip()
-            try:
-                start = text.index(patternStart)
-            except ValueError:
-                UnexpectedError = "Search pattern '%s' not found in %s" % (patternStart, fileNameWithPath)
+        markers = None
+        if self.Catalog is not None:
+            # A worktree's files are copies of the view's, so they have the same markers.
+            markers = self.Catalog.GetMarkers(self.ViewPath + fileNameWithPath[len(self.BuildViewPath):])
+        try:
+            if self.Worktree is not None:
+                # Never write through a link to the worktree baseline.
+                self.Worktree.CheckFileIsPrivate(fileNameWithPath)
+            FaultInjectionPatchEngine.FaultInjectionPatchEngine().ModifyFileWithCompiledBlocks(fileNameWithPath, patchPlan[filename], markers)
+        except RuntimeError as UnexpectedError:
+            self.PrintToScreenAndFile(str(UnexpectedError), False)
+            raise
+        self.PrintToScreenAndFile("File %s has been Modified" % fileNameWithPath, True)
+        self.PublishEvent(FaultInjectionOrchestrator.EVENT_FILE_MODIFIED, FileName = fileNameWithPath)
+
+    #-------------------------------------------------------------------------
+    # Check out the files to be modified, as one batch. In a worktree, the
+    # files are replaced by private copies instead.
+    def CheckOutFiles(self, filesWithPath):
+        if self.Worktree is not None:
+            for fileNameWithPath in filesWithPath:
+                self.Worktree.PrepareFileForWriting(fileNameWithPath)
+            return
+        if len(filesWithPath) == 0:
+            return
+
+        # Check if the files are already checked out.
+        self.PrintToScreenAndFile("Checking if files %s are already checked out..." % ", ".join(filesWithPath), True)
+        Statuses = self.Vcs.GetStatus(filesWithPath)
+        for fileNameWithPath in filesWithPath:
+            if Statuses[fileNameWithPath]:
+                UnexpectedError = "File %s already Checked Out!" % fileNameWithPath
                 self.PrintToScreenAndFile(UnexpectedError, False)
                 raise RuntimeError, UnexpectedError
+        self.PrintToScreenAndFile("Files are not already checked out", True)
+
+        # Check the files out.
+        self.PrintToScreenAndFile("Checking out files %s" % ", ".join(filesWithPath), True)
+        Errors = self.Vcs.CheckOut(filesWithPath)
+        for fileNameWithPath in filesWithPath:
+            if fileNameWithPath in Errors:
+                self.PrintToScreenAndFile("Error while trying to checkout file %s: %s" % (fileNameWithPath, Errors[fileNameWithPath]), False)
+            else:
+                self.PrintToScreenAndFile("File %s has been checked out." % fileNameWithPath, True)
+        if len(Errors) != 0:
+            UnexpectedError = "Error while trying to checkout files %s!" % ", ".join(sorted(Errors.keys()))
+            raise RuntimeError, UnexpectedError
+
+    #-------------------------------------------------------------------------
+    # Undo the checkouts of files that are checked out, as one batch.
+    # Returns the file -> error dictionary of the files whose checkout could
+    # not be undone.
+    def UndoCheckOutFiles(self, filesWithPath, Description = ""):
+        Statuses = self.Vcs.GetStatus(filesWithPath)
+        CheckedOutFilesWithPath = [fileNameWithPath for fileNameWithPath in filesWithPath if Statuses[fileNameWithPath]]
+        for fileNameWithPath in CheckedOutFilesWithPath:
+            self.PrintToScreenAndFile("Undoing checkout of file %s%s..." % (fileNameWithPath, Description), True)
+        Errors = self.Vcs.UndoCheckOut(CheckedOutFilesWithPath, Keep = True)
+        for fileNameWithPath in CheckedOutFilesWithPath:
+            if fileNameWithPath in Errors:
+                self.PrintToScreenAndFile("Error while trying to uncheckout file %s: %s" % (fileNameWithPath, Errors[fileNameWithPath]), False)
+            else:
+                self.PrintToScreenAndFile("File %s has been unchecked out" % fileNameWithPath, True)
+        return Errors
+
+    #-------------------------------------------------------------------------
+    # Modify a file checked out by CheckOutFiles(). In a delta campaign (see
+    # FaultInjectionTransition.py), a file kept checked out by the previous
+    # script is not checked out again: it is left as it is if it is modified
+    # the same way, and modified again from its unmodified text otherwise.
+    def CheckOutAndModifyFile(self, patchPlan, filename, fileNameWithPath):
+        FileState = FaultInjectionManifest.GetBlocksHash(patchPlan[filename])
+        PatchedFileState = self.Session.PatchedFileStates.get(fileNameWithPath)
+        if PatchedFileState is not None and PatchedFileState[0] == FileState:
+            self.PrintToScreenAndFile("File %s is already modified by the previous test" % fileNameWithPath, True)
+            return
+
+        if PatchedFileState is not None:
+            UnmodifiedText = PatchedFileState[1]
+            self.PrintToScreenAndFile("Restoring the unmodified text of file %s" % fileNameWithPath, True)
+            modifiedFile = open(fileNameWithPath, 'wb')
             try:
-                end = text.index(patternEnd, start) + len(patternEnd)
-            except ValueError:
-                UnexpectedError = "Search pattern '%s' not found in %s" % (patternEnd, fileNameWithPath)
-                self.PrintToScreenAndFile(UnexpectedError, False)
-                raise RuntimeError, UnexpectedError
-            result = text[start:end]
-            text = text.replace(result,newblock_woPattern)
-        fileToEdit = open(fileNameWithPath,'w')
-        fileToEdit.write(text)
-        fileToEdit.close()
-        self.PrintToScreenAndFile("File %s has been Modified" % fileNameWithPath, True)
+                modifiedFile.write(UnmodifiedText)
+            finally:
+                modifiedFile.close()
+        else:
+            UnmodifiedText = None
+            if self.Session.IsDeltaTransition and self.Worktree is None:
+                unmodifiedFile = open(fileNameWithPath, 'rb')
+                try:
+                    UnmodifiedText = unmodifiedFile.read()
+                finally:
+                    unmodifiedFile.close()
+
+        self.ModifyFile(patchPlan, filename, fileNameWithPath)
+        if UnmodifiedText is not None:
+            self.Session.PatchedFileStates[fileNameWithPath] = (FileState, UnmodifiedText)
+
+    #-------------------------------------------------------------------------
+    # Undo the checkouts kept for a delta campaign of the files that are not
+    # in KeptFilesWithPath.
+    def RevertPatchedFiles(self, KeptFilesWithPath):
+        RevertedFilesWithPath = []
+        for fileNameWithPath in sorted(self.Session.PatchedFileStates.keys()):
+            if fileNameWithPath in KeptFilesWithPath:
+                continue
+            del self.Session.PatchedFileStates[fileNameWithPath]
+            RevertedFilesWithPath.append(fileNameWithPath)
+        if len(RevertedFilesWithPath) == 0:
+            return
+        Errors = self.UndoCheckOutFiles(RevertedFilesWithPath, " kept by the previous test")
+        if len(Errors) != 0:
+            UnexpectedError = "Error while trying to uncheckout files %s!" % ", ".join(sorted(Errors.keys()))
+            raise RuntimeError, UnexpectedError
 
     #-------------------------------------------------------------------------
     # Process all of the file names in the fault injection script file's dictionary,
     # check the files out, modify the files and copy the files to the build results folder.
-    def ProcessFileModificationsDictionary(self, fileModificationsDictionary):
+    def ProcessFileModificationsDictionary(self, patchPlan):
         self.FileToEditWithPath = range(MAX_NUMBER_OF_SRC_FILES_ALLOWED_TO_BE_MODIFIED)
         filenameArray = range(MAX_NUMBER_OF_SRC_FILES_ALLOWED_TO_BE_MODIFIED)
         self.FileToEditIndex = -1
 
         # Determine the paths to all of the files to be modified.
-        for filename in fileModificationsDictionary.keys():
+        for filename in patchPlan.keys():
             self.PrintToScreenAndFile("filename = %s" % filename, True)
             # Check if the file exists in one of the allowed folders. If not, return an error.
             if not self.IsFileFoundInDiagnosticSourceFileFolder(filename):
@@ -304,26 +993,18 @@ class FaultInjectionUtils:
                 raise RuntimeError, UnexpectedError
             filenameArray[self.FileToEditIndex] = filename
  
-        # Loop through all of the files to edit and process each one.
-        for self.currentFileToEditIndex in range(0, self.FileToEditIndex + 1):
-            # Check if the file is already checked out.
-            self.PrintToScreenAndFile("Checking if file %s is already checked out..." % self.FileToEditWithPath[self.currentFileToEditIndex], True)
-            if clearcase.isCheckedOut(self.FileToEditWithPath[self.currentFileToEditIndex]):
-                UnexpectedError = "File %s already Checked Out!" % self.FileToEditWithPath[self.currentFileToEditIndex]
-                self.PrintToScreenAndFile(UnexpectedError, False)
-                raise RuntimeError, UnexpectedError
-            self.PrintToScreenAndFile("File %s is not already checked out" % self.FileToEditWithPath[self.currentFileToEditIndex], True)
+        # Undo the checkouts kept by the previous script (in a delta
+        # campaign) of the files this one does not modify.
+        self.RevertPatchedFiles(self.FileToEditWithPath[0:self.FileToEditIndex + 1])
 
-            # Check the file out.
-            self.PrintToScreenAndFile("Checking out file %s" % self.FileToEditWithPath[self.currentFileToEditIndex], True)
-            if clearcase.checkout(self.FileToEditWithPath[self.currentFileToEditIndex], False, 'Temporary Checkout for Fault Injection Test.') != None:
-                UnexpectedError = "Error while trying to checkout file %s!" % self.FileToEditWithPath[self.currentFileToEditIndex]
-                self.PrintToScreenAndFile(UnexpectedError, False)
-                raise RuntimeError, UnexpectedError
-            self.PrintToScreenAndFile("File %s has been checked out." % self.FileToEditWithPath[self.currentFileToEditIndex], True)
+        # Check out (or make the worktree's copies writable) all of the files
+        # that the previous script did not keep checked out, as one batch.
+        self.CheckOutFiles([fileNameWithPath for fileNameWithPath in self.FileToEditWithPath[0:self.FileToEditIndex + 1] if fileNameWithPath not in self.Session.PatchedFileStates])
 
-            # Modify the file.
-            self.ModifyFile(fileModificationsDictionary, filenameArray[self.currentFileToEditIndex], self.FileToEditWithPath[self.currentFileToEditIndex])
+        # Loop through all of the files to edit and process each one.
+        for self.currentFileToEditIndex in range(0, self.FileToEditIndex + 1):
+            # Modify the file, unless the previous script already did.
+            self.CheckOutAndModifyFile(patchPlan, filenameArray[self.currentFileToEditIndex], self.FileToEditWithPath[self.currentFileToEditIndex])
 
             # Copy the modified file to the build results folder.
             self.PrintToScreenAndFile("Copying modified file %s" % self.FileToEditWithPath[self.currentFileToEditIndex], True)
@@ -333,90 +1014,428 @@ class FaultInjectionUtils:
                 raise RuntimeError, UnexpectedError
             self.PrintToScreenAndFile("Modified file %s has been copied as %s" % (self.FileToEditWithPath[self.currentFileToEditIndex], filenameArray[self.currentFileToEditIndex] + ".modified"), True)
 
+    #-------------------------------------------------------------------------
+    # Install the compiler cache shims (only once per session). Returns the
+    # shims folder.
+    def InstallCompilerCache(self):
+        ShimsFolder = os.path.abspath(FaultInjectionCompilerCache.COMPILER_CACHE_SHIMS_FOLDER_NAME)
+        if not self.Session.IsCompilerCacheInstalled:
+            FaultInjectionCompilerCache.InstallShims(ShimsFolder, [APEX_COMPILER, BLACKFIN_COMPILER, APEX_ASSEMBLER, BLACKFIN_ASSEMBLER])
+            self.Session.IsCompilerCacheInstalled = True
+        return ShimsFolder
+
+    #-------------------------------------------------------------------------
+    # Run the compilers of the builds through the compiler cache (if enabled,
+    # or if a variant is built, since the wrapper defines FIT_ID) and start
+    # the compiler cache statistics of this build. The compiler cache is only
+    # enabled in the environment of this build's commands, so it is not
+    # shared with the builds of other tests or left enabled for later builds.
+    def EnableCompilerCache(self):
+        self.CompilerCacheStatisticsFileName = None
+        self.CompilerCacheEnvironment = {}
+        compilerCache = FaultInjectionCompilerCache.FaultInjectionCompilerCache()
+        if not compilerCache.IsEnabled() and not self.IsVariantBuild:
+            return
+
+        ShimsFolder = self.InstallCompilerCache()
+
+        self.CompilerCacheStatisticsFileName = self.BuildResultsSubFolderName + "\\CompilerCache.log"
+        if os.path.exists(self.CompilerCacheStatisticsFileName):
+            os.remove(self.CompilerCacheStatisticsFileName)
+
+        self.CompilerCacheEnvironment = {FaultInjectionCompilerCache.COMPILER_CACHE_FOLDER_ENVIRONMENT_VARIABLE : os.path.abspath(compilerCache.CacheFolder),
+                                         FaultInjectionCompilerCache.COMPILER_CACHE_SHIMS_ENVIRONMENT_VARIABLE  : ShimsFolder,
+                                         FaultInjectionCompilerCache.COMPILER_CACHE_STATS_ENVIRONMENT_VARIABLE  : os.path.abspath(self.CompilerCacheStatisticsFileName),
+                                         FaultInjectionCompilerCache.COMPILER_CACHE_ROOT_ENVIRONMENT_VARIABLE   : os.path.abspath(self.BuildViewPath)}
+
+    #-------------------------------------------------------------------------
+    # Print the compiler cache statistics of this build and keep the compiler
+    # cache within its size budget.
+    def ReportCompilerCache(self):
+        self.CompilerCacheEnvironment = {}
+        if self.CompilerCacheStatisticsFileName is None:
+            return
+        self.PrintToScreenAndFile(FaultInjectionCompilerCache.SummarizeStatistics(self.CompilerCacheStatisticsFileName), True)
+        compilerCache = FaultInjectionCompilerCache.FaultInjectionCompilerCache()
+        if not compilerCache.IsEnabled():
+            return
+        EvictedCount = compilerCache.Evict()
+        if EvictedCount:
+            self.PrintToScreenAndFile("Compiler cache: %d least recently used objects removed" % EvictedCount, True)
+
     #-------------------------------------------------------------------------
     # Build the modified code.
     def BuildModifiedCode(self):
         #os.chdir(self.PathToBuildImageFrom)
 
-        if os.system(self.ApexCleanBuildCmd) :
-            UnexpectedError = "Error while doing a 'clean' build the modified code! "
-            self.PrintToScreenAndFile(UnexpectedError, False)
-            raise RuntimeError, UnexpectedError
+        # Run the compilers through the compiler cache (if enabled).
+        self.EnableCompilerCache()
+        try:
+            self.RunBuildCommands()
+        finally:
+            self.ReportCompilerCache()
+        self.VerifyVariantCompiles()
 
-        if os.system(self.ApexBuildExecutableCmd) :
-            UnexpectedError = "Error while doing a build the modified code!"
+    #-------------------------------------------------------------------------
+    # Make sure that a variant build compiled the modified source files of
+    # the products it built through the compiler cache shims, which define
+    # FIT_ID. A compiler run by its full path instead (or by a makefile that
+    # does not add FIT_DEFINES to its flags) compiles the #else of every
+    # variant, so the build would silently hold no fault.
+    def VerifyVariantCompiles(self):
+        if self.VariantId is None or self.CompilerCacheStatisticsFileName is None:
+            return
+        CompiledFileNames = FaultInjectionCompilerCache.GetVariantCompiledFileNames(self.CompilerCacheStatisticsFileName, self.VariantId)
+        BuiltFolders = [ResultsOfBuildFolder for BuildExecutableCmd, ResourcePoolName, MakeFolder, ResultsOfBuildFolder in self.BuiltProducts]
+        ApexPatchedFiles, BlackfinPatchedFiles = self.GetPatchedFilesByProduct()
+        PatchedFiles = []
+        if self.ApexResultsOfBuildFolder in BuiltFolders:
+            PatchedFiles.extend(ApexPatchedFiles)
+        if self.BlackfinResultsOfBuildFolder in BuiltFolders:
+            PatchedFiles.extend(BlackfinPatchedFiles)
+        if len(PatchedFiles) == 0:
+            return
+
+        SourceFileExtensions = FaultInjectionCompilerCache.COMPILER_CACHE_SOURCE_FILE_EXTENSIONS + FaultInjectionCompilerCache.ASSEMBLER_SOURCE_FILE_EXTENSIONS
+        SourceFileNames = [os.path.basename(relativeFileName).lower() for relativeFileName, fileHash in PatchedFiles if os.path.splitext(relativeFileName)[1].lower() in SourceFileExtensions]
+        MissingFileNames = [fileName for fileName in SourceFileNames if fileName not in CompiledFileNames]
+        if len(MissingFileNames) != 0 or len(CompiledFileNames) == 0:
+            UnexpectedError = "The variant build did not compile %s with %s = %d through the compiler cache shims!" % \
+                              (", ".join(MissingFileNames) or "any file", FaultInjectionCompilerCache.VARIANT_ID_MACRO_NAME, self.VariantId)
             self.PrintToScreenAndFile(UnexpectedError, False)
             raise RuntimeError, UnexpectedError
 
-        if os.system(self.BlackfinCleanBuildCmd) :
+    #-------------------------------------------------------------------------
+    # Run the clean and build commands of Apex and of the Blackfin project. In
+    # the incremental build mode, the clean commands are not run and only the
+    # objects that depend on changed files are deleted instead.
+    #
+    # Apex does not depend on the Blackfin project, so it is not built again
+    # when none of its files are modified and the view (or the pristine Apex
+    # build of the session) already holds that build. The Blackfin project
+    # only depends on Apex through apexbin.h, so it is built without the
+    # clean target when neither its last build nor this one modify any of its
+    # files (only the objects that include apexbin.h are compiled again).
+    def RunBuildCommands(self):
+        if self.IsIncrementalBuild:
+            self.LoadIncrementalBuild()
+        self.LoadJobServer()
+        self.LoadResourcePools()
+        self.BuiltProducts = []
+
+        ApexPatchedFiles, BlackfinPatchedFiles = self.GetPatchedFilesByProduct()
+
+        # Apex is built first since the Blackfin project needs its apexbin.h.
+        ApexBuildKey = {"PatchedFiles"  : ApexPatchedFiles,
+                        "VariantId"     : self.GetProductVariantId(ApexPatchedFiles)}
+        if self.Session.ProductBuildKeys.get(self.ApexResultsOfBuildFolder) == ApexBuildKey:
+            self.PrintToScreenAndFile("Apex is not modified since its last build, reusing it", True)
+        elif len(ApexPatchedFiles) == 0 and self.Session.PristineApexFolder is not None:
+            self.RestorePristineApexBuild()
+        else:
+            self.RunProductBuildCommands(self.ApexCleanBuildCmd, self.ApexBuildExecutableCmd, APEX_RESOURCE_POOL_NAME, self.ApexMakeFolder, self.ApexResultsOfBuildFolder, ApexBuildKey)
+            if len(ApexPatchedFiles) == 0:
+                self.SavePristineApexBuild()
+
+        BlackfinBuildKey = {"PatchedFiles"      : BlackfinPatchedFiles,
+                            "VariantId"         : self.GetProductVariantId(BlackfinPatchedFiles),
+                            "ApexBinaryHeader"  : FaultInjectionBuildCache.GetFileHash(os.path.join(self.ApexResultsOfBuildFolder, APEX_BINARY_HEADER_FILE_NAME))}
+        if self.Session.ProductBuildKeys.get(self.BlackfinResultsOfBuildFolder) == BlackfinBuildKey:
+            self.PrintToScreenAndFile("The Blackfin project is not modified since its last build, reusing it", True)
+        else:
+            self.RunProductBuildCommands(self.BlackfinCleanBuildCmd, self.BlackfinBuildExecutableCmd, BLACKFIN_RESOURCE_POOL_NAME, self.BlackfinMakeFolder, self.BlackfinResultsOfBuildFolder, BlackfinBuildKey)
+        self.PrintToScreenAndFile("Building Modified Firmware...", True)
+
+        if self.IsIncrementalBuild and len(self.BuiltProducts) != 0 and self.IncrementalBuild.CountBuild():
+            self.VerifyIncrementalBuild()
+
+    #-------------------------------------------------------------------------
+    # Return the relative paths and hashes of the modified Apex files and of
+    # the modified Blackfin files.
+    def GetPatchedFilesByProduct(self):
+        ApexPatchedFiles = []
+        BlackfinPatchedFiles = []
+        for currentFileToEditIndex in range(0, self.FileToEditIndex + 1):
+            fileNameWithPath = self.FileToEditWithPath[currentFileToEditIndex]
+            relativeFileName = os.path.normcase(fileNameWithPath[len(self.BuildViewPath):]).lstrip("\\")
+            patchedFile = [relativeFileName, FaultInjectionBuildCache.GetFileHash(fileNameWithPath)]
+            if relativeFileName.startswith(os.path.normcase(APEX_PRODUCT_FOLDER + "\\")):
+                ApexPatchedFiles.append(patchedFile)
+            else:
+                BlackfinPatchedFiles.append(patchedFile)
+        return (sorted(ApexPatchedFiles), sorted(BlackfinPatchedFiles))
+
+    #-------------------------------------------------------------------------
+    # Return the variant ID a product is built for, which is None when none
+    # of its files are modified, since only the modified files use FIT_ID.
+    def GetProductVariantId(self, PatchedFiles):
+        if len(PatchedFiles) == 0:
+            return None
+        return self.VariantId
+
+    #-------------------------------------------------------------------------
+    # Return the environment variables the build commands are run with.
+    def GetBuildEnvironment(self):
+        Environment = dict(self.CompilerCacheEnvironment)
+        if self.VariantId is not None:
+            Environment[FaultInjectionCompilerCache.VARIANT_ID_ENVIRONMENT_VARIABLE] = str(self.VariantId)
+        if len(Environment) == 0:
+            return None
+        return Environment
+
+    #-------------------------------------------------------------------------
+    # Run a build command once a seat of its resource pool is free, with no
+    # more make jobs than the seats it was given. Returns True if the command
+    # succeeded.
+    def RunBuildStep(self, BuildCmd, ResourcePoolName):
+        StartTime = datetime.datetime.now()
+        Seats = self.ResourcePools.Acquire(ResourcePoolName, self.Session.SchedulingPriority, self.JobServer.GetMaxJobCount())
+        WaitTime = datetime.datetime.now() - StartTime
+        if WaitTime.seconds != 0:
+            self.PrintToScreenAndFile("Waited %d seconds for %d %s seats" % (WaitTime.seconds, Seats, ResourcePoolName), True)
+        self.PublishEvent(FaultInjectionOrchestrator.EVENT_BUILD_STEP_STARTED, Command = BuildCmd, ResourcePoolName = ResourcePoolName, Seats = Seats)
+        try:
+            Result = self.JobServer.RunBuildCommand(self.BuildExecutor, BuildCmd, Seats, self.GetBuildEnvironment())
+        finally:
+            self.ResourcePools.Release(ResourcePoolName, Seats)
+        self.PrintToScreenAndFile("%s: %s" % (BuildCmd, Result.GetSummary()), True)
+        self.PublishEvent(FaultInjectionOrchestrator.EVENT_BUILD_STEP_FINISHED, Command = BuildCmd, IsSuccess = Result.IsSuccess(), Summary = Result.GetSummary())
+        return Result.IsSuccess()
+
+    #-------------------------------------------------------------------------
+    # Return the stale build artifacts of a product build folder (see
+    # APEX_STALE_ARTIFACT_GLOBS).
+    def GetStaleArtifacts(self, ResultsOfBuildFolder):
+        StaleArtifacts = set()
+        if ResultsOfBuildFolder == self.ApexResultsOfBuildFolder:
+            for StaleArtifactGlob in APEX_STALE_ARTIFACT_GLOBS:
+                StaleArtifacts.update(glob.glob(os.path.join(ResultsOfBuildFolder, StaleArtifactGlob)))
+        return sorted(StaleArtifacts)
+
+    #-------------------------------------------------------------------------
+    # Delete the stale build artifacts of a product build folder and run its
+    # clean command. The artifacts are deleted on the file threads of the
+    # orchestrator; one that cannot be deleted is left for the clean command.
+    # Returns False if the clean command failed.
+    def RunCleanBuildStep(self, CleanBuildCmd, ResourcePoolName, ResultsOfBuildFolder):
+        StaleArtifacts = self.GetStaleArtifacts(ResultsOfBuildFolder)
+        if len(StaleArtifacts) != 0:
+            Deleted = self.Orchestrator.WaitFor([self.Orchestrator.SubmitFileOperation(DeleteFile, StaleArtifact) for StaleArtifact in StaleArtifacts])
+            self.PrintToScreenAndFile("Deleted %d of the %d stale build artifacts of %s" % (Deleted.count(True), len(StaleArtifacts), ResultsOfBuildFolder), True)
+        return self.RunBuildStep(CleanBuildCmd, ResourcePoolName)
+
+    #-------------------------------------------------------------------------
+    # Run the clean (or incremental preparation) and build commands of one
+    # product and remember which modified files it was built from. The clean
+    # command is skipped when both the last build of the product in this
+    # session and this one are built from unmodified files, and replaced by
+    # the restore of the product's baseline snapshot when there is one.
+    def RunProductBuildCommands(self, CleanBuildCmd, BuildExecutableCmd, ResourcePoolName, MakeFolder, ResultsOfBuildFolder, ProductBuildKey):
+        # Until the build succeeds, it is not known what the objects were built from.
+        LastProductBuildKey = self.Session.ProductBuildKeys.pop(ResultsOfBuildFolder, None)
+
+        if self.IsIncrementalBuild:
+            DeletedCount, KeptCount = self.IncrementalBuild.Prepare(MakeFolder, ResultsOfBuildFolder)
+            self.PrintToScreenAndFile("Incremental build of %s: %d objects to rebuild, %d objects kept" % (ResultsOfBuildFolder, DeletedCount, KeptCount), True)
+        elif LastProductBuildKey is not None and len(LastProductBuildKey["PatchedFiles"]) == 0 and len(ProductBuildKey["PatchedFiles"]) == 0:
+            self.PrintToScreenAndFile("%s was last built from unmodified files, building it without the 'clean' target" % ResultsOfBuildFolder, True)
+        elif self.RestoreBaselineSnapshot(ResultsOfBuildFolder):
+            self.PrintToScreenAndFile("Building %s from its baseline snapshot without the 'clean' target" % ResultsOfBuildFolder, True)
+        elif not self.RunCleanBuildStep(CleanBuildCmd, ResourcePoolName, ResultsOfBuildFolder) :
             UnexpectedError = "Error while doing a 'clean' build the modified code! "
             self.PrintToScreenAndFile(UnexpectedError, False)
             raise RuntimeError, UnexpectedError
 
-        if os.system(self.BlackfinBuildExecutableCmd) :
+        if not self.RunBuildStep(BuildExecutableCmd, ResourcePoolName) :
             UnexpectedError = "Error while doing a build the modified code!"
             self.PrintToScreenAndFile(UnexpectedError, False)
             raise RuntimeError, UnexpectedError
-        self.PrintToScreenAndFile("Building Modified Firmware...", True)
+
+        if self.IsIncrementalBuild:
+            self.IncrementalBuild.Update(MakeFolder, ResultsOfBuildFolder)
+
+        self.Session.ProductBuildKeys[ResultsOfBuildFolder] = ProductBuildKey
+        self.BuiltProducts.append((BuildExecutableCmd, ResourcePoolName, MakeFolder, ResultsOfBuildFolder))
+
+    #-------------------------------------------------------------------------
+    # Save the Apex build folder of an Apex build from unmodified files as the
+    # pristine Apex build of the session.
+    def SavePristineApexBuild(self):
+        PristineApexFolder = os.path.abspath(self.Session.PristineApexFolderName)
+        if os.path.exists(PristineApexFolder):
+            shutil.rmtree(PristineApexFolder)
+        self.PrintToScreenAndFile("Saving the pristine Apex build to %s" % PristineApexFolder, True)
+        self.Orchestrator.RunFileOperation(shutil.copytree, self.ApexResultsOfBuildFolder, PristineApexFolder)
+        self.Session.PristineApexFolder = PristineApexFolder
+
+    #-------------------------------------------------------------------------
+    # Use the pristine Apex build of the session instead of building Apex:
+    # its apexbin.h is copied to the view for the Blackfin project and its
+    # binary files are the ones copied to the build results folder.
+    def RestorePristineApexBuild(self):
+        self.PrintToScreenAndFile("Apex is not modified, reusing the pristine Apex build (%s)" % self.Session.PristineApexFolder, True)
+        shutil.copyfile(os.path.join(self.Session.PristineApexFolder, APEX_BINARY_HEADER_FILE_NAME), os.path.join(self.ApexResultsOfBuildFolder, APEX_BINARY_HEADER_FILE_NAME))
+
+        # The Apex objects in the view no longer match its apexbin.h.
+        self.Session.ProductBuildKeys.pop(self.ApexResultsOfBuildFolder, None)
+        self.ApexBinaryFolder = self.Session.PristineApexFolder
+
+    #-------------------------------------------------------------------------
+    # Verify the incremental build: build the products that were built again
+    # from scratch and compare their object files with the ones of the
+    # incremental build. The outputs of the full build are the ones kept for
+    # the test.
+    def VerifyIncrementalBuild(self):
+        self.PrintToScreenAndFile("Verifying the incremental build against a full clean build...", True)
+        Differences = []
+        for BuildExecutableCmd, ResourcePoolName, MakeFolder, ResultsOfBuildFolder in self.BuiltProducts:
+            IncrementalHashes = self.IncrementalBuild.GetObjectHashes(MakeFolder, ResultsOfBuildFolder)
+            self.IncrementalBuild.Clean(MakeFolder, ResultsOfBuildFolder)
+            if not self.RunBuildStep(BuildExecutableCmd, ResourcePoolName) :
+                UnexpectedError = "Error while doing a full build to verify the incremental build!"
+                self.PrintToScreenAndFile(UnexpectedError, False)
+                raise RuntimeError, UnexpectedError
+            self.IncrementalBuild.Update(MakeFolder, ResultsOfBuildFolder)
+            for Difference in FaultInjectionIncrementalBuild.CompareObjectHashes(IncrementalHashes, self.IncrementalBuild.GetObjectHashes(MakeFolder, ResultsOfBuildFolder)):
+                Differences.append(ResultsOfBuildFolder + "\\" + Difference)
+
+        if len(Differences) != 0:
+            for Difference in Differences:
+                self.PrintToScreenAndFile(Difference, True)
+            UnexpectedError = "The incremental build differs from the full clean build in %d object files!" % len(Differences)
+            self.PrintToScreenAndFile(UnexpectedError, False)
+            raise RuntimeError, UnexpectedError
+        self.PrintToScreenAndFile("The incremental build matches the full clean build.", True)
 
     #-------------------------------------------------------------------------
-    # Copy the product build binary folder to the build results subfolder.
+    # Save the product build binary folders to the build results subfolder,
+    # both at once.
     def CopyBinaryFolder(self):
-        TestBuildResultsFolder = self.BuildResultsSubFolderName + BLACKFIN_BUILD_FILES_FOLDER_NAME
-        
-        # If a previous binary files folder already exists under the fault injection build results folder, delete it since copytree will fail if it already exists.
-        if os.path.exists(TestBuildResultsFolder):
-            shutil.rmtree(TestBuildResultsFolder)
+        self.Orchestrator.WaitFor([self.Orchestrator.SubmitFileOperation(self.SaveProductBinaryFolder, self.BlackfinResultsOfBuildFolder, self.BuildResultsSubFolderName + BLACKFIN_BUILD_FILES_FOLDER_NAME),
+                                   self.Orchestrator.SubmitFileOperation(self.SaveProductBinaryFolder, self.ApexBinaryFolder, self.BuildResultsSubFolderName + APEX_BUILD_FILES_FOLDER_NAME)])
 
-        # Copy the binary files folder to the build results folder.
-        self.PrintToScreenAndFile("Copying the binary files folder (%s) to the build results folder (%s)." % (self.BlackfinResultsOfBuildFolder, TestBuildResultsFolder), True)
-        shutil.copytree(self.BlackfinResultsOfBuildFolder, TestBuildResultsFolder)
-        self.PrintToScreenAndFile("Copy the binary files folder to the build results folder.", True)
+    #-------------------------------------------------------------------------
+    # Return True if a product build binary folder is a scratch folder of
+    # this fault injection script file, which is not built again: an output
+    # folder of its worktree (which is removed afterwards), except for the
+    # variant builds, which all build in the same folders.
+    def IsScratchBinaryFolder(self, ResultsOfBuildFolder):
+        return self.Worktree is not None and not self.IsVariantBuild and \
+               ResultsOfBuildFolder in [self.ApexResultsOfBuildFolder, self.BlackfinResultsOfBuildFolder]
+
+    #-------------------------------------------------------------------------
+    # Save one product build binary folder to the build results subfolder.
+    # A scratch folder (see IsScratchBinaryFolder()) is moved there, which is
+    # one rename, and the other folders are copied. A scratch folder that
+    # cannot be renamed there (because it is on another volume) is copied.
+    def SaveProductBinaryFolder(self, ResultsOfBuildFolder, TestBuildResultsFolder):
+        if self.IsScratchBinaryFolder(ResultsOfBuildFolder):
+            if os.path.exists(TestBuildResultsFolder):
+                shutil.rmtree(TestBuildResultsFolder)
+            try:
+                os.rename(ResultsOfBuildFolder, TestBuildResultsFolder)
+            except OSError as RenameError:
+                self.PrintToScreenAndFile("Could not move the binary files folder (%s) to the build results folder (%s), copying it: %s" % (ResultsOfBuildFolder, TestBuildResultsFolder, RenameError), True)
+            else:
+                # Nothing is left of the build in the worktree.
+                self.Session.ProductBuildKeys.pop(ResultsOfBuildFolder, None)
+                self.PrintToScreenAndFile("Moved the binary files folder (%s) to the build results folder (%s)." % (ResultsOfBuildFolder, TestBuildResultsFolder), True)
+                self.PublishEvent(FaultInjectionOrchestrator.EVENT_FOLDER_MOVED, FolderName = TestBuildResultsFolder)
+                return
+        self.CopyProductBinaryFolder(ResultsOfBuildFolder, TestBuildResultsFolder)
 
-        TestBuildResultsFolder = self.BuildResultsSubFolderName + APEX_BUILD_FILES_FOLDER_NAME
-        
-        # If a previous binary files folder already exists under the fault injection build results folder, delete it since copytree will fail if it already exists.
+    #-------------------------------------------------------------------------
+    # Copy one product build binary folder to the build results subfolder.
+    # Only the files that changed since the folder was last copied are
+    # copied, the others are hard linked to the previous copy when possible.
+    def CopyProductBinaryFolder(self, ResultsOfBuildFolder, TestBuildResultsFolder):
+        # If a previous binary files folder already exists under the fault injection build results folder, delete it.
         if os.path.exists(TestBuildResultsFolder):
             shutil.rmtree(TestBuildResultsFolder)
 
         # Copy the binary files folder to the build results folder.
-        self.PrintToScreenAndFile("Copying the binary files folder (%s) to the build results folder (%s)." % (self.ApexResultsOfBuildFolder, TestBuildResultsFolder), True)
-        shutil.copytree(self.ApexResultsOfBuildFolder, TestBuildResultsFolder)
-        self.PrintToScreenAndFile("Copy the binary files folder to the build results folder.", True)
+        self.PrintToScreenAndFile("Copying the binary files folder (%s) to the build results folder (%s)." % (ResultsOfBuildFolder, TestBuildResultsFolder), True)
+        PreviousCopyFolder, PreviousFileStats = self.Session.BinaryFolderCopies.get(ResultsOfBuildFolder, (None, {}))
+        FileStats = {}
+        CopiedCount = 0
+        LinkedCount = 0
+        for path, folderNames, fileNames in os.walk(ResultsOfBuildFolder):
+            DestinationFolder = TestBuildResultsFolder + path[len(ResultsOfBuildFolder):]
+            os.makedirs(DestinationFolder)
+            for filename in fileNames:
+                relativeFileName = os.path.join(path[len(ResultsOfBuildFolder):], filename).lstrip("\\/")
+                fileStat = os.stat(os.path.join(path, filename))
+                FileStats[relativeFileName] = [fileStat.st_size, fileStat.st_mtime]
+                if PreviousFileStats.get(relativeFileName) == FileStats[relativeFileName] and \
+                   os.path.isfile(os.path.join(PreviousCopyFolder, relativeFileName)) and \
+                   FaultInjectionBuildCache.LinkFile(os.path.join(PreviousCopyFolder, relativeFileName), os.path.join(DestinationFolder, filename)):
+                    LinkedCount += 1
+                else:
+                    shutil.copy2(os.path.join(path, filename), os.path.join(DestinationFolder, filename))
+                    CopiedCount += 1
+        self.Session.BinaryFolderCopies[ResultsOfBuildFolder] = (TestBuildResultsFolder, FileStats)
+        self.PrintToScreenAndFile("Copied the binary files folder to the build results folder (%d files copied, %d unchanged files linked)." % (CopiedCount, LinkedCount), True)
+        self.PublishEvent(FaultInjectionOrchestrator.EVENT_FOLDER_COPIED, FolderName = TestBuildResultsFolder, CopiedCount = CopiedCount, LinkedCount = LinkedCount)
 
     #-----------------------------------------------------------------------------
     # Undo the check out of all of the files in the fault injection script file's
     # dictionary that were checked out.
     def UndoCheckouts(self):
+        # Nothing is checked out in a worktree, it is removed instead.
+        if self.Worktree is not None:
+            return
+
         FailureToUncheckAll = False
 
-        if self.MakeFileWithPath != "" :
-            if clearcase.isCheckedOut(self.MakeFileWithPath):
-                self.PrintToScreenAndFile("Undoing makefile checkout", True)
-                if clearcase.uncheckout(self.MakeFileWithPath):
-                    UnexpectedError = "Error while trying to uncheckout makefile"
-                    self.PrintToScreenAndFile(UnexpectedError,False)
-                    FailureToUncheckAll = True
-        
         self.PrintToScreenAndFile("Undoing Checkouts...", True)
-        for currentFileToEditIndex in range(0, self.FileToEditIndex + 1):
-            if clearcase.isCheckedOut(self.FileToEditWithPath[currentFileToEditIndex]):
-                self.PrintToScreenAndFile("Undoing checkout of file %s..." % self.FileToEditWithPath[currentFileToEditIndex], True)
-                if clearcase.uncheckout(self.FileToEditWithPath[currentFileToEditIndex], keep = True) != None:
-                    UnexpectedError = "Error while trying to uncheckout file %s!" % self.FileToEditWithPath[currentFileToEditIndex]
-                    self.PrintToScreenAndFile(UnexpectedError, False)
-                    FailureToUncheckAll = True
-                else:
-                    self.PrintToScreenAndFile("File %s has been unchecked out" % self.FileToEditWithPath[currentFileToEditIndex], True)
+        if len(self.UndoCheckOutFiles(self.FileToEditWithPath[0:self.FileToEditIndex + 1])) != 0:
+            FailureToUncheckAll = True
+        try:
+            self.RevertPatchedFiles([])
+        except RuntimeError:
+            FailureToUncheckAll = True
+        self.Session.PatchedFileStates = {}
+
+        # Leave the view's output folders as they were built from the
+        # unmodified files, so the next build in the view is not a clean one.
+        for ResultsOfBuildFolder in [self.ApexResultsOfBuildFolder, self.BlackfinResultsOfBuildFolder]:
+            if self.RestoreBaselineSnapshot(ResultsOfBuildFolder):
+                self.Session.ProductBuildKeys.pop(ResultsOfBuildFolder, None)
+
         if FailureToUncheckAll == True:
             raise RuntimeError, "Unable to Checkout All Files"
+
+    #-------------------------------------------------------------------------
+    # Keep the checkouts of a fault injection script file that was built for
+    # the next one in a delta campaign (see FaultInjectionTransition.py), or
+    # undo them.
+    def KeepOrUndoCheckouts(self):
+        if self.Session.IsDeltaTransition and self.Worktree is None:
+            self.PrintToScreenAndFile("Keeping the checkouts of %d files for the next test" % len(self.Session.PatchedFileStates), True)
+            return
+        self.UndoCheckouts()
+
+    #-------------------------------------------------------------------------
+    # Load the catalog, make sure the baseline snapshots exist and process
+    # all of the file names in the fault injection script file's dictionary:
+    # check the files out, modify the files and copy the files to the build
+    # results folder.
+    def ModifyFaultInjectionFiles(self, patchPlan):
+        # Load the fault injection point catalog used to find the files and markers.
+        self.LoadCatalog()
+
+        # The baseline snapshots are built from the unmodified files.
+        self.PrepareBaseline()
+
+        self.ProcessFileModificationsDictionary(patchPlan)
+
     #-------------------------------------------------------------------------
     # Each fault injection script file calls into this method and passes in a
     # dictionary of the files to be modified by this script as well as the
     # fault injection script file's name.  The dictionary passed in includes
     # the blocks of new code (the first two lines of the block are text to
     # search for) for each of the modified files.
-    def ModifyFileBuildFaultInjectionTest(self, fileModificationsDictionary, TestName):
+    def ModifyFileBuildFaultInjectionTest(self, patchPlan, TestName):
         # Note: To run multiple scripts using a batch file:
         #     1. Check out this file.
         #     2. Comment out the call to self.GetProductSelection() below.
@@ -437,15 +1456,13 @@ class FaultInjectionUtils:
         # or more files have been checked out so checkouts can be undone
         # before exiting due to the exception.
         try:
-            # Process all of the file names in the fault injection script file's dictionary,
-            # check the files out, modify the files and copy the files to the build results folder.
-            self.ProcessFileModificationsDictionary(fileModificationsDictionary)
+            # Check out and modify the files.
+            self.ModifyFaultInjectionFiles(patchPlan)
 
-            # Build the modified code.
-            self.BuildModifiedCode()
-
-            # Copy the product build binary folder to the build results subfolder.
-            self.CopyBinaryFolder()
+            # Build the modified code and copy the product build binary folder to
+            # the build results subfolder (or restore both from the build cache).
+            self.BuildOrRestoreModifiedCode()
+            self.SaveModifiedCodeBuild()
             
         except:
             # If an exception was detected, undo all of the checkouts that were
@@ -454,51 +1471,105 @@ class FaultInjectionUtils:
             self.UndoCheckouts()
             raise
 
-        # Undo the file checkouts.
-        self.UndoCheckouts()
+        # Undo the file checkouts (or keep them for the next script).
+        self.KeepOrUndoCheckouts()
 
         # Print a message indicating successful completion.
         self.PrintToScreenAndFile("faultInjectionUtils.FaultInjectionUtils().ModifyAndBuildFaultInjectionFile() completed successfully!", True)
 
-    def ModifyAndBuildFaultInjectionFile(self, fileModificationsDictionary, TestName):
-        makefileModificationsDictionaryRM = { \
-			'makefile': [ \
-			# # # # # # # # # # # # # # # # # # # # # # # # #
-			'''
-            # Start Fault Injection Point 1
-            # End Fault Injection Point 1
-            # Fault Injection Code Start
-RM :=cmd /C del /F /Q
-            # Fault Injection Code End
-		    '''
-			]
-        }
-        makefileModificationsDictionaryDEL = { \
-			'makefile':[ \
-			# # # # # # # # # # # # # # # # # # # # # # # # # 
-			''' 
-            # Start Fault Injection Point 2
-            # End Fault Injection Point 2
-            # Fault Injection Code Start
-	-$(RM) ".\\apexbin.h"
-	-$(RM) ".\\._2"
-	-$(RM) ".\\._4"
-	-$(RM) ".\\apex.*"
-	-$(RM) ".\\*.bin"
-	-$(RM) ".\\OS\\*.o"
-	-$(RM) ".\\OS\\*.d"
-	-$(RM) ".\\*.o"
-	-$(RM) ".\\*.d"
-	-$(RM) ".\\ControlBus\\*.o"
-	-$(RM) ".\\ControlBus\\*.d"
-	-$(RM) ".\\OS\\*.o"
-	-$(RM) ".\\OS\\*.d"
-	-$(RM) ".\\Utility\\*.o"
-	-$(RM) ".\\Utility\\*.d"
-            # Fault Injection Code End
-		    '''
-			]
-        }
+    #-------------------------------------------------------------------------
+    # Modify and build the fault injection script file for the specified build
+    # target (TargetMode). If no build target is specified, the command line
+    # parameter is used. If no patch plan is specified (see
+    # FaultInjectionManifest), the dictionary is compiled into one.
+    #
+    # The fault injection script file is run on a test thread of the
+    # orchestrator, and this method waits for it.
+    def ModifyAndBuildFaultInjectionFile(self, fileModificationsDictionary, TestName, TargetMode = None, PatchPlan = None):
+        self.LoadOrchestrator()
+        self.Orchestrator.WaitForTest(self.Orchestrator.SubmitTest(os.path.basename(TestName), self.RunFaultInjectionFile, fileModificationsDictionary, TestName, TargetMode, PatchPlan))
+
+    #-------------------------------------------------------------------------
+    # Modify and build the fault injection script file (see
+    # ModifyAndBuildFaultInjectionFile()).
+    def RunFaultInjectionFile(self, fileModificationsDictionary, TestName, TargetMode = None, PatchPlan = None):
+        PatchPlan = self.InitFaultInjectionFile(fileModificationsDictionary, TestName, TargetMode, PatchPlan)
+        self.ModifyFileBuildFaultInjectionTest(PatchPlan, TestName)
+
+    #-------------------------------------------------------------------------
+    # Modify the files of a compile-time variant image (see
+    # FaultInjectionMultiFault.py) once and build it once per variant, with
+    # FIT_ID set to the variant ID, undoing the checkouts only at the end.
+    # Variants is a list of (variant ID, fault injection script file name).
+    # The build of each variant is saved to a subfolder of the image's build
+    # results folder named after its script. Returns the error of each
+    # variant (None if it was built), in the order of Variants.
+    #
+    # The image is built on a test thread of the orchestrator, and this
+    # method waits for it.
+    def ModifyAndBuildFaultInjectionVariants(self, PatchPlan, ImageName, TargetMode, Variants):
+        self.LoadOrchestrator()
+        return self.Orchestrator.WaitForTest(self.Orchestrator.SubmitTest(ImageName, self.RunFaultInjectionVariants, PatchPlan, ImageName, TargetMode, Variants))
+
+    #-------------------------------------------------------------------------
+    # Modify and build a compile-time variant image (see
+    # ModifyAndBuildFaultInjectionVariants()).
+    def RunFaultInjectionVariants(self, PatchPlan, ImageName, TargetMode, Variants):
+        self.IsVariantBuild = True
+        PatchPlan = self.InitFaultInjectionFile({}, ImageName, TargetMode, PatchPlan)
+        ImageBuildResultsSubFolderName = self.BuildResultsSubFolderName
+        VariantErrors = []
+        try:
+            # Check out and modify the files once for every variant.
+            self.ModifyFaultInjectionFiles(PatchPlan)
+
+            for VariantId, VariantTestName in Variants:
+                VariantErrors.append(self.BuildVariant(ImageBuildResultsSubFolderName, VariantId, VariantTestName))
+        except:
+            self.PrintToScreenAndFile("Exception detected!", True)
+            self.UndoCheckouts()
+            raise
+        finally:
+            self.VariantId = None
+            self.BuildResultsSubFolderName = ImageBuildResultsSubFolderName
+
+        self.UndoCheckouts()
+        self.PrintToScreenAndFile("%d of %d variants of %s were built" % (VariantErrors.count(None), len(Variants), ImageName), True)
+        return VariantErrors
+
+    #-------------------------------------------------------------------------
+    # Build one variant of the modified files (or restore it from the build
+    # cache) and save it to its subfolder of the image's build results
+    # folder. Returns the error of the build, or None if it succeeded. Only
+    # a stop request (Ctrl-C) ends the variants of the image early.
+    def BuildVariant(self, ImageBuildResultsSubFolderName, VariantId, VariantTestName):
+        self.VariantId = VariantId
+        self.BuildResultsSubFolderName = ImageBuildResultsSubFolderName + "\\" + os.path.splitext(os.path.basename(VariantTestName))[0]
+        if not os.path.exists(self.BuildResultsSubFolderName):
+            os.makedirs(self.BuildResultsSubFolderName)
+        self.PrintToScreenAndFile("Building variant %s = %d (%s)..." % (FaultInjectionCompilerCache.VARIANT_ID_MACRO_NAME, VariantId, VariantTestName), True)
+        try:
+            self.BuildOrRestoreModifiedCode()
+            self.SaveModifiedCodeBuild()
+        except RuntimeError as UnexpectedError:
+            if FaultInjectionBuildExecutor.StopEvent.is_set():
+                raise
+            self.PrintToScreenAndFile("Variant %d (%s) failed: %s" % (VariantId, VariantTestName, UnexpectedError), True)
+            return str(UnexpectedError)
+        return None
+
+    #-------------------------------------------------------------------------
+    # Initialize the build of the fault injection script file for the
+    # specified build target (see ModifyAndBuildFaultInjectionFile()).
+    # Returns the patch plan.
+    def InitFaultInjectionFile(self, fileModificationsDictionary, TestName, TargetMode = None, PatchPlan = None):
+        if TargetMode is None and len(sys.argv) > 1 :
+
+            TargetMode = sys.argv[1]
+
+        if PatchPlan is None :
+
+            PatchPlan = self.GetPatchPlan(fileModificationsDictionary, TestName)
 
         if len(sys.argv) != 0 :
 
@@ -508,49 +1579,41 @@ RM :=cmd /C del /F /Q
 
             self.BlackfinMakeCmd       = BLACKFIN_MAKE_CMD_IRT8I
 
-            if sys.argv[1] == "BlackfinDiag" :
+            if TargetMode == "BlackfinDiag" :
 
                 self.ProductName = BLACKFIN_PRODUCT_NAME
 
                 self.Init(TestName)
 
-                self.DiagEditPath      = self.ViewPath + "\\" + BLACKFIN_PRODUCT_FOLDER +  "\\" + BLACKFIN_DIAG_PATH
-		
-                self.MakeFileWithPath = ""
+                self.DiagEditPath      = self.ViewPath + "\\" + TARGET_MODE_EDIT_FOLDERS["BlackfinDiag"]
 
-            elif sys.argv[1] == "BlackfinOS" :
+            elif TargetMode == "BlackfinOS" :
 
                 self.ProductName = BLACKFIN_PRODUCT_NAME
 
                 self.Init(TestName)
 
-                self.DiagEditPath      = self.ViewPath + "\\" + BLACKFIN_PRODUCT_FOLDER + "\\" + BLACKFIN_OS_PATH
-		
-                self.MakeFileWithPath = ""
+                self.DiagEditPath      = self.ViewPath + "\\" + TARGET_MODE_EDIT_FOLDERS["BlackfinOS"]
 
 
-            elif sys.argv[1] == "BlackfinToolkit" :
+            elif TargetMode == "BlackfinToolkit" :
 
                 self.ProductName = BLACKFIN_PRODUCT_NAME
 
                 self.Init(TestName)
 
-                self.DiagEditPath      = self.ViewPath + "\\" + BLACKFIN_PRODUCT_FOLDER + "\\" + BLACKFIN_TOOLKIT_PATH
-		
-                self.MakeFileWithPath = ""
+                self.DiagEditPath      = self.ViewPath + "\\" + TARGET_MODE_EDIT_FOLDERS["BlackfinToolkit"]
 
 
-            elif sys.argv[1] == "BlackfinProjectIRT8I" :
+            elif TargetMode == "BlackfinProjectIRT8I" :
 
                 self.ProductName = BLACKFIN_PRODUCT_NAME
 
                 self.Init(TestName)
 
-                self.DiagEditPath      = self.ViewPath + "\\" + BLACKFIN_PRODUCT_FOLDER + "\\" + BLACKFIN_PROJECT_FOLDER_IRT8I
-		
-                self.MakeFileWithPath = ""
+                self.DiagEditPath      = self.ViewPath + "\\" + TARGET_MODE_EDIT_FOLDERS["BlackfinProjectIRT8I"]
 
-            elif sys.argv[1] == "BlackfinProjectIF8I" :
+            elif TargetMode == "BlackfinProjectIF8I" :
 
                 self.ProductName = BLACKFIN_PRODUCT_NAME
 
@@ -562,77 +1625,28 @@ RM :=cmd /C del /F /Q
 
                 self.Init(TestName)
 
-                self.DiagEditPath      = self.ViewPath + "\\" + BLACKFIN_PRODUCT_FOLDER + "\\" + BLACKFIN_PROJECT_FOLDER_IF8I
-		
-                self.MakeFileWithPath = ""
+                self.DiagEditPath      = self.ViewPath + "\\" + TARGET_MODE_EDIT_FOLDERS["BlackfinProjectIF8I"]
 
-            elif sys.argv[1] == "ApexDiag" :
+            elif TargetMode == "ApexDiag" :
 
                 self.ProductName = APEX_PRODUCT_NAME 
 
                 self.Init(TestName)
 
-                self.DiagEditPath      = self.ViewPath + "\\" + APEX_PRODUCT_FOLDER + "\\" + APEX_DIAG_PATH
+                self.DiagEditPath      = self.ViewPath + "\\" + TARGET_MODE_EDIT_FOLDERS["ApexDiag"]
 
-                self.MakeFileWithPath = self.ViewPath + "\\" + APEX_PRODUCT_FOLDER + "\\"  + APEX_PROJECT_FOLDER + "\\makefile"
-        
-                if clearcase.isCheckedOut(self.MakeFileWithPath):
-                    if clearcase.uncheckout(self.MakeFileWithPath, keep = True) != None:
-                        UnexpectedError = "Error while trying to uncheckout file %s!" % self.MakeFileWithPath
-                        self.PrintToScreenAndFile(UnexpectedError, False)
-                        raise RuntimeError, UnexpectedError
-                    UnexpectedError = "File %s already Checked Out!" % self.MakeFileWithPath
-                    self.PrintToScreenAndFile(UnexpectedError, False)
-                    raise RuntimeError, UnexpectedError
-                self.PrintToScreenAndFile("File %s is not already checked out" % self.MakeFileWithPath, True)
-
-                # Check the file out.
-                self.PrintToScreenAndFile("Checking out file %s" % self.MakeFileWithPath, True)
-                if clearcase.checkout(self.MakeFileWithPath, False, 'Temporary Checkout for Fault Injection Test.') != None:
-                    UnexpectedError = "Error while trying to checkout file %s!" % self.MakeFileWithPath
-                    self.PrintToScreenAndFile(UnexpectedError, False)
-                    raise RuntimeError, UnexpectedError
-                self.PrintToScreenAndFile("File %s has been checked out." % self.MakeFileWithPath, True)
-        
-                # Modify the file.
-                self.ModifyFile(makefileModificationsDictionaryRM, "makefile", self.MakeFileWithPath)
-                self.ModifyFile(makefileModificationsDictionaryDEL, "makefile", self.MakeFileWithPath)
-
-            elif sys.argv[1] == "ApexOS" :
+            elif TargetMode == "ApexOS" :
 
                 self.ProductName = APEX_PRODUCT_NAME
 
                 self.Init(TestName)
 
-                self.DiagEditPath      = self.ViewPath + "\\" + APEX_PRODUCT_FOLDER + "\\" + APEX_OS_PATH
-
-                self.MakeFileWithPath = self.ViewPath + "\\" + APEX_PRODUCT_FOLDER + "\\"  + APEX_PROJECT_FOLDER + "\\makefile"
-
-                if clearcase.isCheckedOut(self.MakeFileWithPath):
-                    if clearcase.uncheckout(self.MakeFileWithPath, keep = True) != None:
-                        UnexpectedError = "Error while trying to uncheckout file %s!" % self.MakeFileWithPath
-                        self.PrintToScreenAndFile(UnexpectedError, False)
-                        raise RuntimeError, UnexpectedError
-                    UnexpectedError = "File %s already Checked Out!" % self.MakeFileWithPath
-                    self.PrintToScreenAndFile(UnexpectedError, False)
-                    raise RuntimeError, UnexpectedError
-                self.PrintToScreenAndFile("File %s is not already checked out" % self.MakeFileWithPath, True)
+                self.DiagEditPath      = self.ViewPath + "\\" + TARGET_MODE_EDIT_FOLDERS["ApexOS"]
 
-                # Check the file out.
-                self.PrintToScreenAndFile("Checking out file %s" % self.MakeFileWithPath, True)
-                if clearcase.checkout(self.MakeFileWithPath, False, 'Temporary Checkout for Fault Injection Test.') != None:
-                    UnexpectedError = "Error while trying to checkout file %s!" % self.MakeFileWithPath
-                    self.PrintToScreenAndFile(UnexpectedError, False)
-                    raise RuntimeError, UnexpectedError
-                self.PrintToScreenAndFile("File %s has been checked out." % self.MakeFileWithPath, True)
-        
-                # Modify the file.
-                self.ModifyFile(makefileModificationsDictionaryRM, "makefile", self.MakeFileWithPath)
-                self.ModifyFile(makefileModificationsDictionaryDEL, "makefile", self.MakeFileWithPath)
             else :
 
                 raise RuntimeError, "Invalid command line arg"
-        self.ModifyFileBuildFaultInjectionTest(fileModificationsDictionary, TestName)
+        return PatchPlan
     
 
 
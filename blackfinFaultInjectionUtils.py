@@ -50,6 +50,19 @@
 #///                      necessary .drch file to be generated before the UCS
 #///                      DKM is built since it is missing from the UCS DKM's
 #///                      drc.makefile (see Lgx00152375 for details).
+#/// agent    18-OCT-2026 ModifyFile() now applies all blocks for a file in
+#///                      one pass through FaultInjectionPatchEngine and
+#///                      rejects ambiguous or overlapping blocks.
+#/// agent    18-OCT-2026 The build commands are run with the job slots of
+#///                      FaultInjectionJobServer.
+#/// agent    18-OCT-2026 The build commands are run through
+#///                      FaultInjectionBuildExecutor.
+#/// agent    18-OCT-2026 The files are checked out and their checkouts undone
+#///                      in batches through the version control backend of
+#///                      FaultInjectionVcs.py, which imports the clearcase
+#///                      module only when it is first used.
+#/// agent    18-OCT-2026 Removed the unused msvcrt import, which is only on
+#///                      Windows.
 #/// @endif
 #///
 #/// @par Copyright (c) 2014 Rockwell Automation Technologies, Inc.  All rights reserved.
@@ -58,13 +71,15 @@
 
 #-----------------------------------------------------------------------------
 #was import clearcase
-import clearcase  # For isCheckedOut, checkout, uncheckout
 import os         # For path
 import datetime   # For date
 import shutil     # For Copy
-import msvcrt     # For getch
 import sys
 import importlib
+import FaultInjectionPatchEngine # For ModifyFile
+import FaultInjectionJobServer   # For FaultInjectionJobServer
+import FaultInjectionBuildExecutor # For FaultInjectionBuildExecutor
+import FaultInjectionVcs         # For GetVcsBackend
 
 
 # FaultInjectionUtils class
@@ -129,7 +144,9 @@ class FaultInjectionUtils:
 
     def __init__(self):
 
-        pass
+        # The version control backend the files are checked out with (the
+        # clearcase module is only imported when a file is checked out).
+        self.Vcs = FaultInjectionVcs.GetVcsBackend("clearcase")
 
 	#-------------------------------------------------------------------------
     # Print a message to both the screen and the specified log file.
@@ -260,34 +277,11 @@ class FaultInjectionUtils:
     # Modify the file as specified in the fault injection script file's dictionary.
     def ModifyFile(self, fileModificationsDictionary, filename, fileNameWithPath):
         self.PrintToScreenAndFile("Modifying file %s" % fileNameWithPath, True)
-        fileToEdit = open(fileNameWithPath)
-        text = fileToEdit.read()
-        fileToEdit.close()
-        for newblock in fileModificationsDictionary[filename]:
-            newblock = newblock.strip()
-            patternStart = newblock.split('\n')[0]
-            patternEnd   = newblock.split('\n')[1]
-            patternEnd   = patternEnd.strip()
-            newblock_woPattern = newblock.replace(patternStart,'')
-            newblock_woPattern = newblock_woPattern.replace(patternEnd,'')
-            newblock_woPattern = newblock_woPattern.strip()
-            try:
-                start = text.index(patternStart)
-            except ValueError:
-                UnexpectedError = "Search pattern '%s' not found in %s" % (patternStart, fileNameWithPath)
-                self.PrintToScreenAndFile(UnexpectedError, False)
-                raise RuntimeError, UnexpectedError
-            try:
-                end = text.index(patternEnd, start) + len(patternEnd)
-            except ValueError:
-                UnexpectedError = "Search pattern '%s' not found in %s" % (patternEnd, fileNameWithPath)
-                self.PrintToScreenAndFile(UnexpectedError, False)
-                raise RuntimeError, UnexpectedError
-            result = text[start:end]
-            text = text.replace(result,newblock_woPattern)
-        fileToEdit = open(fileNameWithPath,'w')
-        fileToEdit.write(text)
-        fileToEdit.close()
+        try:
+            FaultInjectionPatchEngine.FaultInjectionPatchEngine().ModifyFile(fileNameWithPath, fileModificationsDictionary[filename])
+        except RuntimeError as UnexpectedError:
+            self.PrintToScreenAndFile(str(UnexpectedError), False)
+            raise
         self.PrintToScreenAndFile("File %s has been Modified" % fileNameWithPath, True)
 
     #-------------------------------------------------------------------------
@@ -308,24 +302,31 @@ class FaultInjectionUtils:
                 raise RuntimeError, UnexpectedError
             filenameArray[self.FileToEditIndex] = filename
  
-        # Loop through all of the files to edit and process each one.
-        for self.currentFileToEditIndex in range(0, self.FileToEditIndex + 1):
-            # Check if the file is already checked out.
-            self.PrintToScreenAndFile("Checking if file %s is already checked out..." % self.FileToEditWithPath[self.currentFileToEditIndex], True)
-            if clearcase.isCheckedOut(self.FileToEditWithPath[self.currentFileToEditIndex]):
-                UnexpectedError = "File %s already Checked Out!" % self.FileToEditWithPath[self.currentFileToEditIndex]
-                self.PrintToScreenAndFile(UnexpectedError, False)
-                raise RuntimeError, UnexpectedError
-            self.PrintToScreenAndFile("File %s is not already checked out" % self.FileToEditWithPath[self.currentFileToEditIndex], True)
-
-            # Check the file out.
-            self.PrintToScreenAndFile("Checking out file %s" % self.FileToEditWithPath[self.currentFileToEditIndex], True)
-            if clearcase.checkout(self.FileToEditWithPath[self.currentFileToEditIndex], False, 'Temporary Checkout for Fault Injection Test.') != None:
-                UnexpectedError = "Error while trying to checkout file %s!" % self.FileToEditWithPath[self.currentFileToEditIndex]
+        # Check if the files are already checked out.
+        FilesToEditWithPath = self.FileToEditWithPath[0:self.FileToEditIndex + 1]
+        self.PrintToScreenAndFile("Checking if files %s are already checked out..." % ", ".join(FilesToEditWithPath), True)
+        Statuses = self.Vcs.GetStatus(FilesToEditWithPath)
+        for fileNameWithPath in FilesToEditWithPath:
+            if Statuses[fileNameWithPath]:
+                UnexpectedError = "File %s already Checked Out!" % fileNameWithPath
                 self.PrintToScreenAndFile(UnexpectedError, False)
                 raise RuntimeError, UnexpectedError
-            self.PrintToScreenAndFile("File %s has been checked out." % self.FileToEditWithPath[self.currentFileToEditIndex], True)
+        self.PrintToScreenAndFile("Files are not already checked out", True)
+
+        # Check the files out, as one batch.
+        self.PrintToScreenAndFile("Checking out files %s" % ", ".join(FilesToEditWithPath), True)
+        Errors = self.Vcs.CheckOut(FilesToEditWithPath)
+        for fileNameWithPath in FilesToEditWithPath:
+            if fileNameWithPath in Errors:
+                self.PrintToScreenAndFile("Error while trying to checkout file %s: %s" % (fileNameWithPath, Errors[fileNameWithPath]), False)
+            else:
+                self.PrintToScreenAndFile("File %s has been checked out." % fileNameWithPath, True)
+        if len(Errors) != 0:
+            UnexpectedError = "Error while trying to checkout files %s!" % ", ".join(sorted(Errors.keys()))
+            raise RuntimeError, UnexpectedError
 
+        # Loop through all of the files to edit and process each one.
+        for self.currentFileToEditIndex in range(0, self.FileToEditIndex + 1):
             # Modify the file.
             self.ModifyFile(fileModificationsDictionary, filenameArray[self.currentFileToEditIndex], self.FileToEditWithPath[self.currentFileToEditIndex])
 
@@ -341,13 +342,19 @@ class FaultInjectionUtils:
     # Build the modified code.
     def BuildModifiedCode(self):
         #os.chdir(self.PathToBuildImageFrom)
+        jobServer = FaultInjectionJobServer.FaultInjectionJobServer()
+        buildExecutor = FaultInjectionBuildExecutor.FaultInjectionBuildExecutor(self.BuildResultsSubFolderName + "\\" + FaultInjectionBuildExecutor.BUILD_OUTPUT_FILE_NAME)
 
-        if os.system(self.CleanBuildCmd) :
+        result = jobServer.RunBuildCommand(buildExecutor, self.CleanBuildCmd)
+        self.PrintToScreenAndFile("%s: %s" % (self.CleanBuildCmd, result.GetSummary()), True)
+        if not result.IsSuccess() :
             UnexpectedError = "Error while doing a 'clean' build the modified code! "
             self.PrintToScreenAndFile(UnexpectedError, False)
             raise RuntimeError, UnexpectedError
 
-        if os.system(self.BuildExecutableCmd) :
+        result = jobServer.RunBuildCommand(buildExecutor, self.BuildExecutableCmd)
+        self.PrintToScreenAndFile("%s: %s" % (self.BuildExecutableCmd, result.GetSummary()), True)
+        if not result.IsSuccess() :
             UnexpectedError = "Error while doing a build the modified code!"
             self.PrintToScreenAndFile(UnexpectedError, False)
             raise RuntimeError, UnexpectedError
@@ -376,23 +383,26 @@ class FaultInjectionUtils:
         FailureToUncheckAll = False
 
         if self.MakeFileWithPath != "" :
-            if clearcase.isCheckedOut(self.MakeFileWithPath):
+            if self.Vcs.GetStatus([self.MakeFileWithPath])[self.MakeFileWithPath]:
                 self.PrintToScreenAndFile("Undoing makefile checkout", True)
-                if clearcase.uncheckout(self.MakeFileWithPath):
+                if len(self.Vcs.UndoCheckOut([self.MakeFileWithPath], Keep = False)) != 0:
                     UnexpectedError = "Error while trying to uncheckout makefile"
                     self.PrintToScreenAndFile(UnexpectedError,False)
                     FailureToUncheckAll = True
         
         self.PrintToScreenAndFile("Undoing Checkouts...", True)
-        for currentFileToEditIndex in range(0, self.FileToEditIndex + 1):
-            if clearcase.isCheckedOut(self.FileToEditWithPath[currentFileToEditIndex]):
-                self.PrintToScreenAndFile("Undoing checkout of file %s..." % self.FileToEditWithPath[currentFileToEditIndex], True)
-                if clearcase.uncheckout(self.FileToEditWithPath[currentFileToEditIndex], keep = True) != None:
-                    UnexpectedError = "Error while trying to uncheckout file %s!" % self.FileToEditWithPath[currentFileToEditIndex]
-                    self.PrintToScreenAndFile(UnexpectedError, False)
-                    FailureToUncheckAll = True
-                else:
-                    self.PrintToScreenAndFile("File %s has been unchecked out" % self.FileToEditWithPath[currentFileToEditIndex], True)
+        FilesToEditWithPath = self.FileToEditWithPath[0:self.FileToEditIndex + 1]
+        Statuses = self.Vcs.GetStatus(FilesToEditWithPath)
+        CheckedOutFilesWithPath = [fileNameWithPath for fileNameWithPath in FilesToEditWithPath if Statuses[fileNameWithPath]]
+        for fileNameWithPath in CheckedOutFilesWithPath:
+            self.PrintToScreenAndFile("Undoing checkout of file %s..." % fileNameWithPath, True)
+        Errors = self.Vcs.UndoCheckOut(CheckedOutFilesWithPath, Keep = True)
+        for fileNameWithPath in CheckedOutFilesWithPath:
+            if fileNameWithPath in Errors:
+                self.PrintToScreenAndFile("Error while trying to uncheckout file %s: %s" % (fileNameWithPath, Errors[fileNameWithPath]), False)
+                FailureToUncheckAll = True
+            else:
+                self.PrintToScreenAndFile("File %s has been unchecked out" % fileNameWithPath, True)
         if FailureToUncheckAll == True:
             raise RuntimeError, "Unable to Checkout All Files"
     #-------------------------------------------------------------------------
@@ -536,8 +546,8 @@ RM :=cmd /C del /F /Q
 
                 self.MakeFileWithPath = self.ViewPath + "\\" + APEX_PRODUCT_FOLDER + "\\"  + APEX_PROJECT_FOLDER + "\\makefile"
         
-                if clearcase.isCheckedOut(self.MakeFileWithPath):
-                    if clearcase.uncheckout(self.MakeFileWithPath, keep = True) != None:
+                if self.Vcs.GetStatus([self.MakeFileWithPath])[self.MakeFileWithPath]:
+                    if len(self.Vcs.UndoCheckOut([self.MakeFileWithPath], Keep = True)) != 0:
                         UnexpectedError = "Error while trying to uncheckout file %s!" % self.MakeFileWithPath
                         self.PrintToScreenAndFile(UnexpectedError, False)
                         raise RuntimeError, UnexpectedError
@@ -548,7 +558,7 @@ RM :=cmd /C del /F /Q
 
                 # Check the file out.
                 self.PrintToScreenAndFile("Checking out file %s" % self.MakeFileWithPath, True)
-                if clearcase.checkout(self.MakeFileWithPath, False, 'Temporary Checkout for Fault Injection Test.') != None:
+                if len(self.Vcs.CheckOut([self.MakeFileWithPath])) != 0:
                     UnexpectedError = "Error while trying to checkout file %s!" % self.MakeFileWithPath
                     self.PrintToScreenAndFile(UnexpectedError, False)
                     raise RuntimeError, UnexpectedError
@@ -574,8 +584,8 @@ RM :=cmd /C del /F /Q
 
                 self.MakeFileWithPath = self.ViewPath + "\\" + APEX_PRODUCT_FOLDER + "\\"  + APEX_PROJECT_FOLDER + "\\makefile"
         
-                if clearcase.isCheckedOut(self.MakeFileWithPath):
-                    if clearcase.uncheckout(self.MakeFileWithPath, keep = True) != None:
+                if self.Vcs.GetStatus([self.MakeFileWithPath])[self.MakeFileWithPath]:
+                    if len(self.Vcs.UndoCheckOut([self.MakeFileWithPath], Keep = True)) != 0:
                         UnexpectedError = "Error while trying to uncheckout file %s!" % self.MakeFileWithPath
                         self.PrintToScreenAndFile(UnexpectedError, False)
                         raise RuntimeError, UnexpectedError
@@ -586,7 +596,7 @@ RM :=cmd /C del /F /Q
 
                 # Check the file out.
                 self.PrintToScreenAndFile("Checking out file %s" % self.MakeFileWithPath, True)
-                if clearcase.checkout(self.MakeFileWithPath, False, 'Temporary Checkout for Fault Injection Test.') != None:
+                if len(self.Vcs.CheckOut([self.MakeFileWithPath])) != 0:
                     UnexpectedError = "Error while trying to checkout file %s!" % self.MakeFileWithPath
                     self.PrintToScreenAndFile(UnexpectedError, False)
                     raise RuntimeError, UnexpectedError
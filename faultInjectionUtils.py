@@ -65,6 +65,9 @@
 #///                      A new .bat file was implemented for NextGen builds.
 #///                      The command line has a parameter that tells the 
 #///                      FaultInjectionClass for NextGen what build to do.
+#/// agent    18-OCT-2026 Added the validate command line parameter and
+#///                      skipping of the scripts that failed preflight
+#///                      validation (see FaultInjectionValidator.py).
 #/// @endif
 #///
 #/// @par Copyright (c) 2016 Rockwell Automation Technologies, Inc.  All rights reserved.
@@ -88,8 +91,26 @@ class FaultInjectionUtils:
             self.FaultInjectInstance = importlib.import_module('NextGenFaultInjectionUtils').FaultInjectionUtils()
 
     def ModifyAndBuildFaultInjectionFile(self, fileModificationsDictionary, TestName):
-        
-		self.FaultInjectInstance.ModifyAndBuildFaultInjectionFile( fileModificationsDictionary, TestName)
+
+        if len(sys.argv) > 1 :
+
+            validator = importlib.import_module('FaultInjectionValidator')
+
+            # In validate mode only check the script's files and markers against the view.
+            if sys.argv[1] == validator.VALIDATE_MODE :
+
+                if validator.ValidateAndReport([TestName], False) :
+                    sys.exit(1)
+                return
+
+            # Skip the script if it failed the preflight validation of a campaign
+            # that only builds the scripts that passed.
+            if validator.IsTestToBeSkipped(TestName) :
+
+                print "Skipping %s since it failed validation (see %s)" % (TestName, validator.GetReportFileName())
+                return
+
+        self.FaultInjectInstance.ModifyAndBuildFaultInjectionFile( fileModificationsDictionary, TestName)
 
 
 
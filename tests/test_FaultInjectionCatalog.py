@@ -0,0 +1,83 @@
+#/////////////////////////////////////////////////////////////////////////////
+#/// @file test_FaultInjectionCatalog.py
+#///
+#/// This script file contains the unit tests of the fault injection point
+#/// catalog (see FaultInjectionCatalog.py). Run them from the repository
+#/// folder with:
+#///     python -m unittest discover tests
+#///
+#/// @if REVISION_HISTORY_INCLUDED
+#/// @par Edit History
+#/// agent    18-OCT-2026 Created.
+#/// @endif
+#///
+#/// @par Copyright (c) 2026 Rockwell Automation Technologies, Inc.  All rights reserved.
+#///
+#/////////////////////////////////////////////////////////////////////////////
+
+#-----------------------------------------------------------------------------
+import os         # For path
+import sys        # For path
+import shutil     # For rmtree
+import tempfile   # For mkdtemp
+import unittest   # For TestCase
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import FaultInjectionCatalog     # For FaultInjectionCatalog
+import FaultInjectionPatchEngine # For FaultInjectionPatchEngine
+
+# Define constants that should not change.
+# A source file with a non-ASCII byte (the copyright sign in Latin-1) before
+# its fault injection point.
+SOURCE_TEXT                             = "// \xa9 Rockwell Automation\n" \
+                                          "// Start Fault Injection Point 1\n" \
+                                          "x = 0;\n" \
+                                          "// End Fault Injection Point 1\n"
+
+FAULT_INJECTION_BLOCK                   = "// Start Fault Injection Point 1\n" \
+                                          "// End Fault Injection Point 1\n" \
+                                          "x = 1;"
+
+# FaultInjectionCatalogTest class
+# This class tests the catalog and its index file.
+class FaultInjectionCatalogTest(unittest.TestCase):
+
+    def setUp(self):
+        self.ViewPath = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.ViewPath, "Source"))
+        self.SourceFileName = os.path.join(self.ViewPath, "Source", "Diagnostic.c")
+        sourceFile = open(self.SourceFileName, 'wb')
+        sourceFile.write(SOURCE_TEXT)
+        sourceFile.close()
+        self.IndexFileName = os.path.join(self.ViewPath, FaultInjectionCatalog.CATALOG_INDEX_FILE_NAME)
+
+    def tearDown(self):
+        shutil.rmtree(self.ViewPath, True)
+
+    #-------------------------------------------------------------------------
+    # Return the catalog of the test view, loaded from its index file.
+    def LoadCatalog(self):
+        catalog = FaultInjectionCatalog.FaultInjectionCatalog(self.ViewPath, ["Source"], self.IndexFileName)
+        catalog.Load()
+        return catalog
+
+    #-------------------------------------------------------------------------
+    # The markers reloaded from the index file patch a file with non-ASCII
+    # bytes like the markers of a new scan do.
+    def testPatchNonAsciiFileWithReloadedMarkers(self):
+        self.assertEqual(self.LoadCatalog().ScannedFileCount, 1)
+        catalog = self.LoadCatalog()
+        self.assertEqual(catalog.ScannedFileCount, 0)
+
+        markers = catalog.GetMarkers(self.SourceFileName)
+        for kind, point, offset in markers:
+            self.assertTrue(isinstance(kind, str) and isinstance(point, str))
+
+        FaultInjectionPatchEngine.FaultInjectionPatchEngine().ModifyFile(self.SourceFileName, [FAULT_INJECTION_BLOCK], markers)
+        sourceFile = open(self.SourceFileName, 'rb')
+        text = sourceFile.read()
+        sourceFile.close()
+        self.assertEqual(text, "// \xa9 Rockwell Automation\nx = 1;\n")
+
+if __name__ == "__main__":
+    unittest.main()
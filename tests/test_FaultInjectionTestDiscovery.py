@@ -0,0 +1,83 @@
+#/////////////////////////////////////////////////////////////////////////////
+#/// @file test_FaultInjectionTestDiscovery.py
+#///
+#/// This script file contains the unit tests of the discovery of the fault
+#/// injection script files (see FaultInjectionTestDiscovery.py). Run them
+#/// from the repository folder with:
+#///     python -m unittest discover tests
+#///
+#/// @if REVISION_HISTORY_INCLUDED
+#/// @par Edit History
+#/// agent    18-OCT-2026 Created.
+#/// @endif
+#///
+#/// @par Copyright (c) 2026 Rockwell Automation Technologies, Inc.  All rights reserved.
+#///
+#/////////////////////////////////////////////////////////////////////////////
+
+#-----------------------------------------------------------------------------
+import os         # For path
+import sys        # For path
+import shutil     # For rmtree
+import tempfile   # For mkdtemp
+import unittest   # For TestCase
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import FaultInjectionTestDiscovery # For FaultInjectionTestDiscovery
+
+# Define constants that should not change.
+# A fault injection script file that only assigns literals.
+LITERAL_SCRIPT_TEXT                     = "import NextGenFaultInjectionUtils\n" \
+                                          "targetMode = \"ApexDiag\"\n" \
+                                          "testTags = [\"ram\", None, True]\n" \
+                                          "fileModificationsDictionary = {\"Diagnostic.c\": (\"// Start Fault Injection Point 1\\n// End Fault Injection Point 1\\nx = 1;\",)}\n" \
+                                          "if __name__ == \"__main__\":\n" \
+                                          "    NextGenFaultInjectionUtils.Build()\n"
+
+# A fault injection script file that runs a call when it is imported, which
+# would create the file named by %s.
+CALL_SCRIPT_TEXT                        = "targetMode = open(%r, 'w')\n" \
+                                          "fileModificationsDictionary = {}\n"
+
+# FaultInjectionTestDiscoveryTest class
+# This class tests the checks made before a script file is imported.
+class FaultInjectionTestDiscoveryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.TestFolder = tempfile.mkdtemp()
+        self.Discovery = FaultInjectionTestDiscovery.FaultInjectionTestDiscovery(os.path.join(self.TestFolder, "Tests.json"), os.path.join(self.TestFolder, "Plans.json"))
+
+    def tearDown(self):
+        shutil.rmtree(self.TestFolder, True)
+
+    #-------------------------------------------------------------------------
+    # Write a fault injection script file in the test folder and return its
+    # name.
+    def WriteScript(self, fileName, text):
+        testFileName = os.path.join(self.TestFolder, fileName)
+        testFile = open(testFileName, 'wb')
+        testFile.write(text)
+        testFile.close()
+        return testFileName
+
+    #-------------------------------------------------------------------------
+    # A script file that only assigns literals is imported.
+    def testLiteralAssignmentsAreImported(self):
+        spec = self.Discovery.GetSpec(self.WriteScript("LiteralFaultInjectionTest1.py", LITERAL_SCRIPT_TEXT))
+        self.assertEqual(spec.Problems, [])
+        self.assertEqual(spec.TargetMode, "ApexDiag")
+        self.assertEqual(self.Discovery.ImportedFileCount, 1)
+
+    #-------------------------------------------------------------------------
+    # A script file that assigns the result of a call is rejected without
+    # being imported.
+    def testCallAssignmentIsRejected(self):
+        sideEffectFileName = os.path.join(self.TestFolder, "SideEffect.txt")
+        spec = self.Discovery.GetSpec(self.WriteScript("CallFaultInjectionTest1.py", CALL_SCRIPT_TEXT % sideEffectFileName))
+        self.assertEqual(len(spec.Problems), 1)
+        self.assertTrue("runs code at line 1" in spec.Problems[0])
+        self.assertEqual(self.Discovery.ImportedFileCount, 0)
+        self.assertFalse(os.path.exists(sideEffectFileName))
+
+if __name__ == "__main__":
+    unittest.main()